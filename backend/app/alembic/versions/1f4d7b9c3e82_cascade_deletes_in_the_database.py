@@ -0,0 +1,98 @@
+"""cascade deletes in the database
+
+Revision ID: 1f4d7b9c3e82
+Revises: 6b3e9d2a7c41
+Create Date: 2026-10-18 17:12:08.420367
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '1f4d7b9c3e82'
+down_revision = '6b3e9d2a7c41'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table, ON DELETE action) of every foreign key
+# that the database now follows on delete. A template outlives the user who
+# created it, so only its creator is cleared.
+FOREIGN_KEYS = [
+    ('users', 'organization_id', 'organization', 'CASCADE'),
+    ('item', 'owner_id', 'users', 'CASCADE'),
+    ('appointment', 'patient_id', 'users', 'CASCADE'),
+    ('appointment', 'provider_id', 'users', 'CASCADE'),
+    ('surveytemplate', 'organization_id', 'organization', 'CASCADE'),
+    ('surveytemplate', 'created_by', 'users', 'SET NULL'),
+    ('feedbacksession', 'appointment_id', 'appointment', 'CASCADE'),
+    ('feedbacksession', 'survey_template_id', 'surveytemplate', 'CASCADE'),
+]
+
+# Deletes look rows up by these columns
+INDEXES = [
+    ('users', 'organization_id'),
+    ('item', 'owner_id'),
+    ('appointment', 'patient_id'),
+    ('appointment', 'provider_id'),
+    ('surveytemplate', 'created_by'),
+    ('feedbacksession', 'appointment_id'),
+]
+
+
+def _foreign_key_name(table, column):
+    # Recreating feedbacksession as a partitioned table left its keys with
+    # generated names such as feedbacksession_appointment_id_fkey1
+    for foreign_key in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        if foreign_key['constrained_columns'] == [column]:
+            return foreign_key['name']
+    raise LookupError(f'No foreign key on {table}.{column}')
+
+
+def _replace_foreign_keys(upgrade):
+    for table, column, referred, ondelete in FOREIGN_KEYS:
+        op.drop_constraint(_foreign_key_name(table, column), table, type_='foreignkey')
+        name = f'{table}_{column}_fkey'
+        op.create_foreign_key(
+            name, table, referred, [column], ['id'], ondelete=ondelete if upgrade else None
+        )
+
+
+def upgrade():
+    for table, column in INDEXES:
+        op.create_index(op.f(f'ix_{table}_{column}'), table, [column], unique=False)
+    op.alter_column('surveytemplate', 'created_by', existing_type=sa.Uuid(), nullable=True)
+    _replace_foreign_keys(upgrade=True)
+
+    # feedbackresponse.session_id cannot be a foreign key on the partitioned
+    # tables, so a trigger stands in for its ON DELETE CASCADE. Responses are
+    # never older than their session, which prunes the partitions searched.
+    op.execute(
+        """
+        CREATE FUNCTION delete_feedbacksession_responses() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM feedbackresponse
+            WHERE session_id = OLD.id AND created_at >= OLD.created_at;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER feedbacksession_delete_responses
+        AFTER DELETE ON feedbacksession
+        FOR EACH ROW EXECUTE FUNCTION delete_feedbacksession_responses()
+        """
+    )
+
+
+def downgrade():
+    op.execute('DROP TRIGGER feedbacksession_delete_responses ON feedbacksession')
+    op.execute('DROP FUNCTION delete_feedbacksession_responses()')
+    _replace_foreign_keys(upgrade=False)
+    # Templates whose creator was deleted block this until they get one again
+    op.alter_column('surveytemplate', 'created_by', existing_type=sa.Uuid(), nullable=False)
+    for table, column in reversed(INDEXES):
+        op.drop_index(op.f(f'ix_{table}_{column}'), table_name=table)
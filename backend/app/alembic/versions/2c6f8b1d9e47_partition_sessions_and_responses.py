@@ -0,0 +1,212 @@
+"""partition feedbacksession and feedbackresponse by month
+
+Revision ID: 2c6f8b1d9e47
+Revises: e7c2a9f4b610
+Create Date: 2026-10-18 15:02:37.904113
+
+"""
+from datetime import date, datetime
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '2c6f8b1d9e47'
+down_revision = 'e7c2a9f4b610'
+branch_labels = None
+depends_on = None
+
+# Partitions created up front beyond the current month; the app and
+# app/partitions.py keep extending them afterwards
+MONTHS_AHEAD = 3
+
+SESSION_COLUMNS = [
+    'status', 'delivery_method', 'delivery_attempts', 'id', 'appointment_id',
+    'survey_template_id', 'completion_token', 'initiated_at', 'first_response_at',
+    'completed_at', 'expired_at', 'last_delivery_attempt', 'ip_address',
+    'user_agent', 'completion_time_seconds', 'created_at',
+]
+RESPONSE_COLUMNS = [
+    'question_id', 'response_text', 'response_time_seconds', 'id', 'session_id',
+    'response_type_id', 'response_value', 'ai_analysis', 'created_at',
+]
+
+
+def _create_feedbacksession(partitioned):
+    op.create_table('feedbacksession',
+    sa.Column('status', postgresql.ENUM('INITIATED', 'IN_PROGRESS', 'COMPLETED', 'EXPIRED', 'CANCELLED', name='feedbacksessionstatus', create_type=False), nullable=False),
+    sa.Column('delivery_method', postgresql.ENUM('EMAIL', 'SMS', 'PHONE', 'IN_PERSON', name='deliverymethod', create_type=False), nullable=True),
+    sa.Column('delivery_attempts', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('appointment_id', sa.Uuid(), nullable=False),
+    sa.Column('survey_template_id', sa.Uuid(), nullable=False),
+    sa.Column('completion_token', sa.Uuid(), nullable=False),
+    sa.Column('initiated_at', sa.DateTime(), nullable=False),
+    sa.Column('first_response_at', sa.DateTime(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('expired_at', sa.DateTime(), nullable=True),
+    sa.Column('last_delivery_attempt', sa.DateTime(), nullable=True),
+    sa.Column('ip_address', sqlmodel.sql.sqltypes.AutoString(length=45), nullable=True),
+    sa.Column('user_agent', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('completion_time_seconds', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['appointment_id'], ['appointment.id'], ),
+    sa.ForeignKeyConstraint(['survey_template_id'], ['surveytemplate.id'], ),
+    *(
+        [sa.PrimaryKeyConstraint('id', 'created_at')]
+        if partitioned
+        else [sa.PrimaryKeyConstraint('id'), sa.UniqueConstraint('completion_token')]
+    ),
+    **({'postgresql_partition_by': 'RANGE (created_at)'} if partitioned else {})
+    )
+    op.create_index(op.f('ix_feedbacksession_survey_template_id'), 'feedbacksession', ['survey_template_id'], unique=False)
+    if partitioned:
+        op.create_index(op.f('ix_feedbacksession_completion_token'), 'feedbacksession', ['completion_token'], unique=False)
+
+
+def _create_feedbackresponse(partitioned):
+    op.create_table('feedbackresponse',
+    sa.Column('question_id', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('response_text', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('response_time_seconds', sa.Integer(), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('session_id', sa.Uuid(), nullable=False),
+    sa.Column('response_type_id', sa.Uuid(), nullable=False),
+    sa.Column('response_value', sa.JSON(), nullable=True),
+    sa.Column('ai_analysis', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['response_type_id'], ['feedbackresponsetype.id'], ),
+    *(
+        [sa.PrimaryKeyConstraint('id', 'created_at')]
+        if partitioned
+        else [
+            sa.ForeignKeyConstraint(['session_id'], ['feedbacksession.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+        ]
+    ),
+    **({'postgresql_partition_by': 'RANGE (created_at)'} if partitioned else {})
+    )
+    op.create_index(op.f('ix_feedbackresponse_session_id'), 'feedbackresponse', ['session_id'], unique=False)
+    op.create_index('ix_feedbackresponse_question_id_session_id', 'feedbackresponse', ['question_id', 'session_id'], unique=False)
+    op.create_index(
+        'ix_feedbackresponse_created_at_sentiment',
+        'feedbackresponse',
+        ['created_at', 'session_id', sa.text("(ai_analysis ->> 'sentiment')")],
+        unique=False,
+        postgresql_where=sa.text("(ai_analysis ->> 'sentiment') IS NOT NULL"),
+    )
+    op.create_index(
+        'ix_feedbackresponse_pending_analysis',
+        'feedbackresponse',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text(
+            "response_text IS NOT NULL "
+            "AND (ai_analysis IS NULL OR json_typeof(ai_analysis) = 'null')"
+        ),
+    )
+    op.create_index(
+        'ix_feedbackresponse_recent_text',
+        'feedbackresponse',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("response_text IS NOT NULL"),
+    )
+
+
+def _set_aside(table, indexes, constraints):
+    """Rename `table` out of the way, dropping the indexes its replacement reuses."""
+    for index in indexes:
+        op.drop_index(index, table_name=table)
+    for constraint in constraints:
+        op.execute(f'ALTER TABLE {table} RENAME CONSTRAINT {constraint} TO {constraint}_old')
+    op.rename_table(table, f'{table}_old')
+
+
+def _copy(table, columns):
+    names = ', '.join(columns)
+    op.execute(f'INSERT INTO {table} ({names}) SELECT {names} FROM {table}_old')
+    op.drop_table(f'{table}_old')
+
+
+def _month(value):
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month):
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _create_partitions(table):
+    oldest = op.get_bind().execute(sa.text(f'SELECT min(created_at) FROM {table}_old')).scalar()
+    month = _month(oldest or datetime.utcnow())
+    last = _month(datetime.utcnow())
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+        )
+        month = upper
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+
+def upgrade():
+    # A partitioned table's unique constraints must include the partition key,
+    # so feedbackresponse.session_id can no longer reference feedbacksession.id
+    op.drop_constraint('feedbackresponse_session_id_fkey', 'feedbackresponse', type_='foreignkey')
+    _set_aside(
+        'feedbackresponse',
+        [
+            'ix_feedbackresponse_session_id',
+            'ix_feedbackresponse_question_id_session_id',
+            'ix_feedbackresponse_created_at_sentiment',
+            'ix_feedbackresponse_pending_analysis',
+            'ix_feedbackresponse_recent_text',
+        ],
+        ['feedbackresponse_pkey'],
+    )
+    _set_aside(
+        'feedbacksession',
+        ['ix_feedbacksession_survey_template_id'],
+        ['feedbacksession_pkey', 'feedbacksession_completion_token_key'],
+    )
+
+    _create_feedbacksession(partitioned=True)
+    _create_feedbackresponse(partitioned=True)
+    _create_partitions('feedbacksession')
+    _create_partitions('feedbackresponse')
+    _copy('feedbacksession', SESSION_COLUMNS)
+    _copy('feedbackresponse', RESPONSE_COLUMNS)
+    op.execute('ANALYZE feedbacksession')
+    op.execute('ANALYZE feedbackresponse')
+
+
+def downgrade():
+    # Dropping the parents' indexes drops the per-partition copies too
+    _set_aside(
+        'feedbackresponse',
+        [
+            'ix_feedbackresponse_session_id',
+            'ix_feedbackresponse_question_id_session_id',
+            'ix_feedbackresponse_created_at_sentiment',
+            'ix_feedbackresponse_pending_analysis',
+            'ix_feedbackresponse_recent_text',
+        ],
+        ['feedbackresponse_pkey'],
+    )
+    _set_aside(
+        'feedbacksession',
+        ['ix_feedbacksession_survey_template_id', 'ix_feedbacksession_completion_token'],
+        ['feedbacksession_pkey'],
+    )
+
+    _create_feedbacksession(partitioned=False)
+    _copy('feedbacksession', SESSION_COLUMNS)
+    _create_feedbackresponse(partitioned=False)
+    _copy('feedbackresponse', RESPONSE_COLUMNS)
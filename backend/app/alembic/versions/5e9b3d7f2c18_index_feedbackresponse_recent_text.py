@@ -0,0 +1,31 @@
+"""index feedbackresponse recent text
+
+Revision ID: 5e9b3d7f2c18
+Revises: c4a8e2f61b57
+Create Date: 2026-10-18 11:20:08.664731
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9b3d7f2c18'
+down_revision = 'c4a8e2f61b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_feedbackresponse_recent_text',
+        'feedbackresponse',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text("response_text IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_feedbackresponse_recent_text', table_name='feedbackresponse')
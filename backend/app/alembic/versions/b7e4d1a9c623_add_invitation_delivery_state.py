@@ -0,0 +1,39 @@
+"""add invitation delivery state
+
+Revision ID: b7e4d1a9c623
+Revises: d8b2f6a4c915
+Create Date: 2026-10-18 19:36:52.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4d1a9c623'
+down_revision = 'd8b2f6a4c915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('phone_number', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=True))
+    # Existing sessions are left without a next_delivery_at, so deploying
+    # the scheduler does not send invitations for old visits
+    op.add_column('feedbacksession', sa.Column('next_delivery_at', sa.DateTime(), nullable=True))
+    op.add_column('feedbacksession', sa.Column('delivered_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_feedbacksession_next_delivery_at',
+        'feedbacksession',
+        ['next_delivery_at'],
+        unique=False,
+        postgresql_where=sa.text('next_delivery_at IS NOT NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_feedbacksession_next_delivery_at', table_name='feedbacksession')
+    op.drop_column('feedbacksession', 'delivered_at')
+    op.drop_column('feedbacksession', 'next_delivery_at')
+    op.drop_column('users', 'phone_number')
@@ -0,0 +1,42 @@
+"""index feedbackresponse ai_analysis
+
+Revision ID: c4a8e2f61b57
+Revises: 8d2f4a6c1e93
+Create Date: 2026-10-18 10:41:53.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a8e2f61b57'
+down_revision = '8d2f4a6c1e93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_feedbackresponse_created_at_sentiment',
+        'feedbackresponse',
+        ['created_at', 'session_id', sa.text("(ai_analysis ->> 'sentiment')")],
+        unique=False,
+        postgresql_where=sa.text("(ai_analysis ->> 'sentiment') IS NOT NULL"),
+    )
+    op.create_index(
+        'ix_feedbackresponse_pending_analysis',
+        'feedbackresponse',
+        ['created_at'],
+        unique=False,
+        postgresql_where=sa.text(
+            "response_text IS NOT NULL "
+            "AND (ai_analysis IS NULL OR json_typeof(ai_analysis) = 'null')"
+        ),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_feedbackresponse_pending_analysis', table_name='feedbackresponse')
+    op.drop_index('ix_feedbackresponse_created_at_sentiment', table_name='feedbackresponse')
@@ -0,0 +1,28 @@
+"""add feedbacksession reminders_sent
+
+Revision ID: c4a8f2e6d193
+Revises: b7e4d1a9c623
+Create Date: 2026-10-18 21:04:37.520913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a8f2e6d193'
+down_revision = 'b7e4d1a9c623'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Reminders are scheduled through the existing next_delivery_at index
+    op.add_column(
+        'feedbacksession',
+        sa.Column('reminders_sent', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_column('feedbacksession', 'reminders_sent')
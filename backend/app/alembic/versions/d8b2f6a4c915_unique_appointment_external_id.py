@@ -0,0 +1,53 @@
+"""unique appointment external_appointment_id per organization
+
+Revision ID: d8b2f6a4c915
+Revises: a3c5e7f9b214
+Create Date: 2026-10-18 18:48:13.702519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8b2f6a4c915'
+down_revision = 'a3c5e7f9b214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # External ids are only unique within the EHR of one organization, which
+    # is the organization of the appointment's provider
+    op.add_column('appointment', sa.Column('organization_id', sa.Uuid(), nullable=True))
+    op.create_foreign_key(
+        'appointment_organization_id_fkey',
+        'appointment',
+        'organization',
+        ['organization_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
+    op.execute(
+        """
+        UPDATE appointment a SET organization_id = u.organization_id
+        FROM users u
+        WHERE u.id = a.provider_id
+        """
+    )
+    op.create_index(
+        'ix_appointment_organization_id_external_appointment_id',
+        'appointment',
+        ['organization_id', 'external_appointment_id'],
+        unique=True,
+        postgresql_where=sa.text('external_appointment_id IS NOT NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index(
+        'ix_appointment_organization_id_external_appointment_id', table_name='appointment'
+    )
+    op.drop_constraint('appointment_organization_id_fkey', 'appointment', type_='foreignkey')
+    op.drop_column('appointment', 'organization_id')
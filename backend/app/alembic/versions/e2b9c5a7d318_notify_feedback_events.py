@@ -0,0 +1,100 @@
+"""notify feedback events
+
+Revision ID: e2b9c5a7d318
+Revises: c4a8f2e6d193
+Create Date: 2026-10-18 22:41:15.208734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b9c5a7d318'
+down_revision = 'c4a8f2e6d193'
+branch_labels = None
+depends_on = None
+
+# Must match app.core.events.CHANNEL
+CHANNEL = 'feedback_events'
+
+
+def upgrade():
+    # One notification per organization and statement, not per row, so a
+    # batch insert or a COPY of responses stays a single cheap NOTIFY.
+    # Responses are never older than their session, which prunes the
+    # feedbacksession partitions searched. Rows restored from the archive,
+    # moved between partitions or bulk loaded are not new feedback, and
+    # app.core.events.SKIP_EVENTS silences both triggers for a transaction.
+    op.execute(
+        f"""
+        CREATE FUNCTION notify_feedbackresponse_insert() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('app.skip_feedback_events', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            PERFORM pg_notify('{CHANNEL}', json_build_object(
+                'event', 'responses',
+                'organization_id', t.organization_id,
+                'count', count(*),
+                -- Always six fractional digits, for datetime.fromisoformat
+                'since', to_char(min(r.created_at), 'YYYY-MM-DD"T"HH24:MI:SS.US')
+            )::text)
+            FROM new_responses r
+            JOIN feedbacksession s
+                ON s.id = r.session_id AND s.created_at <= r.created_at
+            JOIN surveytemplate t ON t.id = s.survey_template_id
+            GROUP BY t.organization_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER feedbackresponse_notify_insert
+        AFTER INSERT ON feedbackresponse
+        REFERENCING NEW TABLE AS new_responses
+        FOR EACH STATEMENT EXECUTE FUNCTION notify_feedbackresponse_insert()
+        """
+    )
+
+    # Only fires for the update that completes a session
+    op.execute(
+        f"""
+        CREATE FUNCTION notify_feedbacksession_completed() RETURNS trigger AS $$
+        BEGIN
+            IF current_setting('app.skip_feedback_events', true) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            PERFORM pg_notify('{CHANNEL}', json_build_object(
+                'event', 'session_completed',
+                'organization_id', t.organization_id,
+                'session_id', NEW.id,
+                'survey_template_id', NEW.survey_template_id,
+                'completed_at', NEW.completed_at,
+                'completion_time_seconds', NEW.completion_time_seconds
+            )::text)
+            FROM surveytemplate t
+            WHERE t.id = NEW.survey_template_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER feedbacksession_notify_completed
+        AFTER UPDATE OF status ON feedbacksession
+        FOR EACH ROW
+        WHEN (NEW.status = 'COMPLETED' AND OLD.status IS DISTINCT FROM NEW.status)
+        EXECUTE FUNCTION notify_feedbacksession_completed()
+        """
+    )
+
+
+def downgrade():
+    op.execute('DROP TRIGGER feedbacksession_notify_completed ON feedbacksession')
+    op.execute('DROP FUNCTION notify_feedbacksession_completed()')
+    op.execute('DROP TRIGGER feedbackresponse_notify_insert ON feedbackresponse')
+    op.execute('DROP FUNCTION notify_feedbackresponse_insert()')
@@ -0,0 +1,28 @@
+"""add feedbackresponse analysis_claimed_at
+
+Revision ID: f3a7c1d9b582
+Revises: e2b9c5a7d318
+Create Date: 2026-10-19 09:26:14.803527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7c1d9b582'
+down_revision = 'e2b9c5a7d318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Claims are looked up through ix_feedbackresponse_pending_analysis, which
+    # already narrows the scan to the few unanalyzed responses
+    op.add_column(
+        'feedbackresponse', sa.Column('analysis_claimed_at', sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column('feedbackresponse', 'analysis_claimed_at')
@@ -1,12 +1,30 @@
-from typing import Any, Dict, List
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, text
-from sqlmodel import select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Float, String, case, cast, func, literal_column
+from sqlalchemy import select as sql_select
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select
 import uuid
 from datetime import datetime, timedelta
 
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
-from app.models import FeedbackResponse, FeedbackSession, SurveyTemplate, User, Organization
+from app.core.cache import cache, org_feedback_tag
+from app.core.config import settings
+from app.core.db import engine
+from app.core.events import FeedbackEventBroker
+from app.core.feedback_values import numeric_response_value
+from app.models import (
+    FeedbackResponse,
+    FeedbackRollup,
+    FeedbackSession,
+    FeedbackSessionStatus,
+    SurveyTemplate,
+    User,
+    Organization,
+)
 from app.api.routes.analyze import analyze_with_llm
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
@@ -119,37 +137,97 @@ def get_sentiment_analysis(
 ) -> Dict[str, Any]:
     """
     Get sentiment analysis of feedback responses.
+
+    Aggregates the ai_analysis already stored on each response; text is never
+    re-analyzed here. New responses are analyzed incrementally by
+    `app/refresh_analysis.py`.
     """
     org_id = current_user.organization_id
+    start_date = datetime.utcnow() - timedelta(days=days)
     
-    # For now, return mock sentiment data
-    # In a real implementation, you would:
-    # 1. Query feedback responses for the organization
-    # 2. Run sentiment analysis using the analyze.py module
-    # 3. Aggregate the results
+    sentiment = _analysis_field("sentiment")
+    # A plain SQLAlchemy select: after with_only_columns, sqlmodel's
+    # single-column select would still return only the first column
+    org_responses = (
+        sql_select(FeedbackResponse.id)
+        .join(FeedbackSession, FeedbackSession.id == FeedbackResponse.session_id)
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+        .where(
+            SurveyTemplate.organization_id == org_id,
+            FeedbackResponse.created_at >= start_date,
+        )
+    )
     
-    mock_sentiments = {
-        "positive": 65,
-        "neutral": 25,
-        "negative": 10
-    }
+    # Sentiment distribution
+    sentiment_rows = session.exec(
+        org_responses.with_only_columns(sentiment, func.count())
+        .where(sentiment.is_not(None))
+        .group_by(sentiment)
+    ).all()
+    sentiment_distribution = {"positive": 0, "neutral": 0, "negative": 0}
+    for label, count in sentiment_rows:
+        if label in sentiment_distribution:
+            sentiment_distribution[label] += count
     
-    mock_topics = [
-        {"topic": "Nursing Care", "count": 45, "avg_sentiment": "positive"},
-        {"topic": "Wait Times", "count": 32, "avg_sentiment": "negative"},
-        {"topic": "Communication", "count": 28, "avg_sentiment": "positive"},
-        {"topic": "Cleanliness", "count": 22, "avg_sentiment": "neutral"},
-        {"topic": "Billing", "count": 18, "avg_sentiment": "negative"},
+    # Topics are stored as a comma separated list; unnest them in the database
+    # and score each mention positive=1, neutral=0, negative=-1.
+    topic_mentions = (
+        org_responses.with_only_columns(
+            func.btrim(
+                func.unnest(
+                    func.string_to_array(
+                        _analysis_field("topics"), ","
+                    )
+                )
+            ).label("topic"),
+            case((sentiment == "positive", 1), (sentiment == "negative", -1), else_=0).label("score"),
+        )
+        .where(sentiment.is_not(None))
+        .subquery()
+    )
+    topic_count = func.count().label("mentions")
+    topic_rows = session.exec(
+        select(topic_mentions.c.topic, topic_count, func.avg(topic_mentions.c.score))
+        .where(topic_mentions.c.topic != "")
+        .group_by(topic_mentions.c.topic)
+        .order_by(topic_count.desc(), topic_mentions.c.topic)
+        .limit(10)
+    ).all()
+    top_topics = [
+        {
+            "topic": topic,
+            "count": count,
+            "avg_sentiment": _sentiment_label(float(score)),
+        }
+        for topic, count, score in topic_rows
     ]
     
     return {
-        "sentiment_distribution": mock_sentiments,
-        "top_topics": mock_topics,
-        "total_analyzed": sum(mock_sentiments.values()),
+        "sentiment_distribution": sentiment_distribution,
+        "top_topics": top_topics,
+        "total_analyzed": sum(sentiment_distribution.values()),
         "analysis_period": f"Last {days} days"
     }
 
 
+def _analysis_field(key: str) -> Any:
+    """
+    `ai_analysis ->> 'key'` with the key inlined, so the expression matches the
+    expression index on feedbackresponse instead of a bound parameter.
+    """
+    return FeedbackResponse.ai_analysis.op("->>", return_type=String)(
+        literal_column(f"'{key}'")
+    )
+
+
+def _sentiment_label(score: float) -> str:
+    if score > 0.2:
+        return "positive"
+    if score < -0.2:
+        return "negative"
+    return "neutral"
+
+
 @router.get("/survey-performance")
 def get_survey_performance(
     session: SessionDep,
@@ -160,36 +238,123 @@ def get_survey_performance(
     """
     org_id = current_user.organization_id
     
-    # Get survey templates for the organization
-    templates_stmt = select(SurveyTemplate).where(
-        SurveyTemplate.organization_id == org_id
+    # Session-level metrics per template, aggregated in a single GROUP BY
+    session_stats = (
+        select(
+            FeedbackSession.survey_template_id.label("template_id"),
+            func.count().label("surveys_sent"),
+            func.count(
+                func.coalesce(FeedbackSession.first_response_at, FeedbackSession.completed_at)
+            ).label("responses_received"),
+            func.count().filter(
+                FeedbackSession.status == FeedbackSessionStatus.COMPLETED
+            ).label("completed"),
+            func.sum(FeedbackSession.completion_time_seconds).label("completion_seconds_sum"),
+            func.count(FeedbackSession.completion_time_seconds).label("completion_seconds_count"),
+        )
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+        .where(SurveyTemplate.organization_id == org_id)
+        .group_by(FeedbackSession.survey_template_id)
+        .subquery()
     )
-    templates = session.exec(templates_stmt).all()
     
-    # Mock performance data for each template
-    performance_data = []
-    for template in templates:
-        # In a real implementation, calculate actual metrics
-        mock_data = {
-            "template_id": str(template.id),
-            "template_name": template.name,
-            "surveys_sent": 45 + (len(template.name) % 20),
-            "responses_received": 32 + (len(template.name) % 15),
-            "avg_completion_time": 2.5 + (len(template.name) % 10) * 0.3,
-            "avg_rating": 4.2 + (len(template.name) % 5) * 0.1,
-            "completion_rate": 85.5 + (len(template.name) % 10),
-        }
-        mock_data["response_rate"] = round(
-            (mock_data["responses_received"] / mock_data["surveys_sent"] * 100), 1
+    # Numeric rating totals per template across all of its responses
+    rating = numeric_response_value()
+    rating_stats = (
+        select(
+            FeedbackSession.survey_template_id.label("template_id"),
+            func.sum(rating).label("rating_sum"),
+            func.count(rating).label("rating_count"),
+        )
+        .join(FeedbackSession, FeedbackSession.id == FeedbackResponse.session_id)
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+        .where(SurveyTemplate.organization_id == org_id)
+        .group_by(FeedbackSession.survey_template_id)
+        .subquery()
+    )
+
+    # Totals of sessions moved to the archive by app/archive.py
+    archived_stats = (
+        select(
+            FeedbackRollup.survey_template_id.label("template_id"),
+            *(
+                func.sum(getattr(FeedbackRollup, name)).label(name)
+                for name in (
+                    "surveys_sent",
+                    "responses_received",
+                    "completed",
+                    "completion_seconds_sum",
+                    "completion_seconds_count",
+                    "rating_sum",
+                    "rating_count",
+                )
+            ),
+        )
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackRollup.survey_template_id)
+        .where(SurveyTemplate.organization_id == org_id)
+        .group_by(FeedbackRollup.survey_template_id)
+        .subquery()
+    )
+
+    def total(hot: Any, archived: Any) -> Any:
+        return func.coalesce(hot, 0) + func.coalesce(archived, 0)
+
+    def mean(total_sum: Any, total_count: Any) -> Any:
+        return cast(total_sum, Float) / func.nullif(total_count, 0)
+
+    statement = (
+        select(
+            SurveyTemplate.id,
+            SurveyTemplate.name,
+            total(session_stats.c.surveys_sent, archived_stats.c.surveys_sent),
+            total(session_stats.c.responses_received, archived_stats.c.responses_received),
+            total(session_stats.c.completed, archived_stats.c.completed),
+            mean(
+                total(session_stats.c.completion_seconds_sum, archived_stats.c.completion_seconds_sum),
+                total(session_stats.c.completion_seconds_count, archived_stats.c.completion_seconds_count),
+            ),
+            mean(
+                total(rating_stats.c.rating_sum, archived_stats.c.rating_sum),
+                total(rating_stats.c.rating_count, archived_stats.c.rating_count),
+            ),
         )
-        performance_data.append(mock_data)
+        .outerjoin(session_stats, session_stats.c.template_id == SurveyTemplate.id)
+        .outerjoin(rating_stats, rating_stats.c.template_id == SurveyTemplate.id)
+        .outerjoin(archived_stats, archived_stats.c.template_id == SurveyTemplate.id)
+        .where(SurveyTemplate.organization_id == org_id)
+        .order_by(SurveyTemplate.name)
+    )
+    rows = session.exec(statement).all()
+
+    performance_data = []
+    for template_id, name, sent, responded, completed, avg_seconds, avg_rating in rows:
+        performance_data.append({
+            "template_id": str(template_id),
+            "template_name": name,
+            "surveys_sent": sent,
+            "responses_received": responded,
+            # Minutes, to match the dashboard's completion time display
+            "avg_completion_time": round(float(avg_seconds) / 60, 1) if avg_seconds is not None else None,
+            "avg_rating": round(float(avg_rating), 2) if avg_rating is not None else None,
+            "completion_rate": round(completed / sent * 100, 1) if sent > 0 else 0,
+            "response_rate": round(responded / sent * 100, 1) if sent > 0 else 0,
+        })
     
     return {
         "survey_performance": performance_data,
-        "total_templates": len(templates)
+        "total_templates": len(performance_data)
     }
 
 
+# Recent feedback is cached per organization under its feedback tag, so new
+# responses drop it on commit; the TTL only bounds staleness across processes
+# when the in-process cache backend is used.
+RECENT_FEEDBACK_TTL_SECONDS = 5.0
+
+# How far back recent feedback is first looked for across all organizations
+RECENT_FEEDBACK_WINDOW = timedelta(days=1)
+
+
 @router.get("/recent-feedback")
 def get_recent_feedback(
     session: SessionDep,
@@ -200,63 +365,179 @@ def get_recent_feedback(
     Get recent feedback responses with analysis.
     """
     org_id = current_user.organization_id
+    limit = max(1, min(limit, 100))
     
-    # Mock recent feedback data
-    # In a real implementation, query actual feedback responses
-    mock_feedback = [
-        {
-            "id": str(uuid.uuid4()),
-            "survey_name": "Post-Appointment Survey",
-            "submitted_at": (datetime.utcnow() - timedelta(hours=2)).isoformat(),
-            "sentiment": "positive",
-            "summary": "Great experience with Dr. Smith, very helpful and kind staff.",
-            "rating": 5,
-            "topics": ["nursing", "communication"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "survey_name": "Emergency Department Survey",
-            "submitted_at": (datetime.utcnow() - timedelta(hours=5)).isoformat(),
-            "sentiment": "negative",
-            "summary": "Long wait time, billing issues, but good medical care.",
-            "rating": 2,
-            "topics": ["wait", "billing"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "survey_name": "Post-Appointment Survey",
-            "submitted_at": (datetime.utcnow() - timedelta(hours=8)).isoformat(),
-            "sentiment": "positive",
-            "summary": "Clean facilities, professional staff, excellent service.",
-            "rating": 4,
-            "topics": ["cleanliness", "communication"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "survey_name": "Discharge Survey",
-            "submitted_at": (datetime.utcnow() - timedelta(days=1)).isoformat(),
-            "sentiment": "neutral",
-            "summary": "Average experience, room for improvement in communication.",
-            "rating": 3,
-            "topics": ["communication"]
-        },
-        {
-            "id": str(uuid.uuid4()),
-            "survey_name": "Post-Appointment Survey",
-            "submitted_at": (datetime.utcnow() - timedelta(days=1, hours=3)).isoformat(),
-            "sentiment": "positive",
-            "summary": "Amazing nursing team, very caring and attentive.",
-            "rating": 5,
-            "topics": ["nursing", "communication"]
-        }
-    ]
-    
+    return cache.get_or_set(
+        f"analytics:recent-feedback:{org_id}:{limit}",
+        lambda: _load_recent_feedback(session, org_id, limit),
+        ttl=RECENT_FEEDBACK_TTL_SECONDS,
+        tags=[org_feedback_tag(org_id)],
+    )
+
+
+def _load_recent_feedback(
+    session: Session,
+    org_id: Optional[uuid.UUID],
+    limit: int,
+    since: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    # Average numeric rating of the session each response belongs to
+    session_response = aliased(FeedbackResponse)
+    session_rating = (
+        select(func.avg(numeric_response_value(session_response)))
+        .where(session_response.session_id == FeedbackResponse.session_id)
+        .correlate(FeedbackResponse)
+        .scalar_subquery()
+    )
+
+    columns = (
+        FeedbackResponse.id,
+        FeedbackResponse.created_at,
+        FeedbackResponse.response_text,
+        FeedbackResponse.ai_analysis,
+    )
+    window_start = datetime.utcnow() - RECENT_FEEDBACK_WINDOW
+
+    # Busy organizations: walk ix_feedbackresponse_recent_text newest-first
+    # over the last RECENT_FEEDBACK_WINDOW only. The index covers every
+    # organization, so this stops early only for those with recent feedback.
+    recent = (
+        select(*columns, SurveyTemplate.name, session_rating)
+        .join(FeedbackSession, FeedbackSession.id == FeedbackResponse.session_id)
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+        .where(
+            SurveyTemplate.organization_id == org_id,
+            FeedbackResponse.response_text.is_not(None),
+            FeedbackResponse.created_at >= max(since or window_start, window_start),
+        )
+        .order_by(FeedbackResponse.created_at.desc())
+        .limit(limit)
+    )
+    rows = list(session.exec(recent).all())
+
+    # The rest comes from the organization's own sessions, so a quiet one
+    # doesn't walk everyone else's older responses: its text responses are
+    # looked up by session and only those are sorted.
+    if len(rows) < limit and (since is None or since < window_start):
+        org_responses = (
+            select(FeedbackResponse.id, FeedbackResponse.created_at)
+            .join(FeedbackSession, FeedbackSession.id == FeedbackResponse.session_id)
+            .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+            .where(
+                SurveyTemplate.organization_id == org_id,
+                # A response is never older than its session, which spares
+                # looking in partitions from before each session
+                FeedbackSession.created_at < window_start,
+                FeedbackResponse.created_at >= FeedbackSession.created_at,
+                FeedbackResponse.response_text.is_not(None),
+                FeedbackResponse.created_at < window_start,
+            )
+        )
+        if since is not None:
+            org_responses = org_responses.where(FeedbackResponse.created_at >= since)
+        # Materialized, or the planner walks the newest-first index again
+        org_responses = org_responses.cte("org_responses").prefix_with("MATERIALIZED")
+        newest = (
+            select(org_responses.c.id, org_responses.c.created_at)
+            .order_by(org_responses.c.created_at.desc())
+            .limit(limit - len(rows))
+            .subquery()
+        )
+        older = (
+            select(*columns, SurveyTemplate.name, session_rating)
+            .join(
+                newest,
+                (newest.c.id == FeedbackResponse.id)
+                & (newest.c.created_at == FeedbackResponse.created_at),
+            )
+            .join(FeedbackSession, FeedbackSession.id == FeedbackResponse.session_id)
+            .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+            .order_by(FeedbackResponse.created_at.desc())
+        )
+        rows += session.exec(older).all()
+
+    recent_feedback = []
+    for response_id, created_at, response_text, analysis, survey_name, rating in rows:
+        analysis = analysis or {}
+        topics = analysis.get("topics") or []
+        if isinstance(topics, str):
+            topics = [t.strip() for t in topics.split(",") if t.strip()]
+        recent_feedback.append({
+            "id": str(response_id),
+            "survey_name": survey_name,
+            "submitted_at": created_at.isoformat(),
+            "sentiment": analysis.get("sentiment"),
+            "summary": analysis.get("summary") or response_text,
+            "rating": round(float(rating)) if rating is not None else None,
+            "topics": topics,
+        })
+
     return {
-        "recent_feedback": mock_feedback[:limit],
-        "total_count": len(mock_feedback)
+        "recent_feedback": recent_feedback,
+        "total_count": len(recent_feedback)
     }
 
 
+# Most feedback sent with one "responses" event of the live stream
+LIVE_FEEDBACK_LIMIT = 100
+
+
+def _load_new_feedback(org_id: uuid.UUID, since: datetime) -> Dict[str, Any]:
+    with Session(engine) as session:
+        return _load_recent_feedback(session, org_id, LIVE_FEEDBACK_LIMIT, since=since)
+
+
+feedback_events = FeedbackEventBroker(load_feedback=_load_new_feedback)
+
+
+@router.get("/live", response_class=StreamingResponse)
+async def stream_live_feedback(
+    session: SessionDep, current_user: CurrentUser
+) -> StreamingResponse:
+    """
+    Server-sent events of the organization's new feedback, for dashboards to
+    apply to what they loaded from /analytics/recent-feedback and
+    /feedback-sessions/stats/organization instead of polling them:
+
+    - `responses`: `count` responses arrived, with the new `recent_feedback`
+    - `session_completed`: a session was completed
+    - `resync`: events were missed; reload the dashboard
+
+    Feedback may be repeated across events, so clients keep it by id.
+    """
+    if not current_user.is_superuser and current_user.role not in ["admin", "provider"]:
+        raise HTTPException(
+            status_code=403, detail="Only admins and providers can view live feedback"
+        )
+    org_id = current_user.organization_id
+    if org_id is None:
+        raise HTTPException(status_code=400, detail="User has no organization")
+    # The stream may stay open for hours; don't hold a pooled connection
+    session.close()
+
+    async def generate() -> AsyncIterator[str]:
+        async with feedback_events.subscribe(org_id) as queue:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), settings.LIVE_EVENTS_KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    # A comment keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return
+                yield event.encode()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/analyze-text")
 def analyze_feedback_text(
     text_data: Dict[str, str],
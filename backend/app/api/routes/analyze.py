@@ -1,15 +1,19 @@
 import os
 import re
-from typing import Dict
+from functools import cache
+from typing import Any, Dict
 
 
 # Soft dependency: OpenAI. We fall back to heuristic if unavailable or no key.
-USE_OPENAI = False
-try:
-    from openai import OpenAI
-    USE_OPENAI = True
-except Exception:
-    USE_OPENAI = False
+# It is imported on first use, so processes that never analyze text don't
+# pay for loading it.
+@cache
+def _openai_client(api_key: str) -> Any:
+    try:
+        from openai import OpenAI
+    except Exception:
+        return None
+    return OpenAI(api_key=api_key)
 
 
 DEFAULT_MODEL = os.getenv("MODEL_NAME", "gpt-4o-mini")
@@ -57,11 +61,10 @@ def _heuristic_analysis(text: str) -> Dict:
 
 def analyze_with_llm(text: str) -> Dict:
     api_key = os.getenv("OPENAI_API_KEY")
-    if not (USE_OPENAI and api_key):
+    client = _openai_client(api_key) if api_key else None
+    if client is None:
         return _heuristic_analysis(text)
 
-
-    client = OpenAI(api_key=api_key)
     system = (
     "You are a clinical feedback analyst. Extract a concise summary (<=40 words), "
     "sentiment {positive|neutral|negative}, up to 3 topical tags, and whether PII is present. "
@@ -1,10 +1,19 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlmodel import Session, func, select
 
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.api.responses import (
+    ORJSONResponse,
+    dump_rows,
+    list_response,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from app.core.cache import RESPONSE_TYPES_TAG, cache
 from app.models import (
     FeedbackResponseType,
     FeedbackResponseTypeCreate,
@@ -18,27 +27,60 @@ from app.models import (
 router = APIRouter(prefix="/feedback-response-types", tags=["feedback-response-types"])
 
 
+def cached_active_response_types(
+    session: Session, skip: int, limit: int, ttl: float | None = None
+) -> Any:
+    """One page of active response types, through the shared cache."""
+    def load() -> dict[str, Any]:
+        count_statement = select(func.count()).select_from(FeedbackResponseType).where(
+            FeedbackResponseType.active == True
+        )
+        count = session.exec(count_statement).one()
+
+        statement = (
+            select(FeedbackResponseType)
+            .where(FeedbackResponseType.active == True)
+            .offset(skip)
+            .limit(limit)
+        )
+        response_types = session.exec(statement).all()
+        return {
+            "data": dump_rows(FeedbackResponseTypePublic, response_types),
+            "count": count,
+        }
+
+    return cache.get_or_set(
+        f"feedback-response-types:active:{skip}:{limit}",
+        load,
+        ttl=ttl,
+        tags=[RESPONSE_TYPES_TAG],
+    )
+
+
 @router.get("/", response_model=FeedbackResponseTypesPublic)
 def read_feedback_response_types(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    request: Request,
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
 ) -> Any:
     """
     Retrieve feedback response types. All users can view available response types.
     """
-    count_statement = select(func.count()).select_from(FeedbackResponseType).where(
-        FeedbackResponseType.active == True
-    )
-    count = session.exec(count_statement).one()
-
-    statement = (
-        select(FeedbackResponseType)
-        .where(FeedbackResponseType.active == True)
-        .offset(skip)
-        .limit(limit)
+    payload = cached_active_response_types(session, skip, limit)
+    etag = make_etag(
+        skip,
+        limit,
+        payload["count"],
+        *(f"{row['id']}@{row['updated_at']}" for row in payload["data"]),
     )
-    response_types = session.exec(statement).all()
+    if unchanged := not_modified(request, etag):
+        return unchanged
 
-    return FeedbackResponseTypesPublic(data=response_types, count=count)
+    response = ORJSONResponse(payload)
+    set_cache_headers(response, etag)
+    return response
 
 
 @router.get("/all", response_model=FeedbackResponseTypesPublic)
@@ -68,7 +110,7 @@ def read_all_feedback_response_types(
     count = session.exec(count_query).one()
     response_types = session.exec(base_query.offset(skip).limit(limit)).all()
 
-    return FeedbackResponseTypesPublic(data=response_types, count=count)
+    return list_response(FeedbackResponseTypePublic, response_types, count)
 
 
 @router.post(
@@ -171,7 +213,7 @@ def read_feedback_response_types_by_category(
     )
     response_types = session.exec(statement).all()
 
-    return FeedbackResponseTypesPublic(data=response_types, count=count)
+    return list_response(FeedbackResponseTypePublic, response_types, count)
 
 
 @router.patch(
@@ -1,14 +1,28 @@
+import csv
+import io
+import json
 import uuid
-from typing import Any, List
+from collections.abc import Iterator
+from typing import Any, List, Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import func, select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import JSON, Text, cast
+from sqlalchemy import select as sql_select
+from sqlmodel import Session, func, select
 
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.api.responses import ORJSONResponse, dump_rows, list_response
+from app.core.db import engine
+from app.core.feedback_values import (
+    categorical_response_value,
+    numeric_response_value,
+)
 from app.models import (
     FeedbackResponse,
     FeedbackResponseCreate,
     FeedbackResponsePublic,
+    FeedbackResponsesPivot,
     FeedbackResponsesPublic,
     FeedbackResponseUpdate,
     FeedbackSession,
@@ -50,7 +64,7 @@ def read_feedback_responses(
     count = session.exec(count_query).one()
     responses = session.exec(base_query.offset(skip).limit(limit)).all()
     
-    return FeedbackResponsesPublic(data=responses, count=count)
+    return list_response(FeedbackResponsePublic, responses, count)
 
 
 @router.post("/", response_model=FeedbackResponsePublic)
@@ -81,6 +95,7 @@ def create_feedback_response(
     session.add(response)
     session.commit()
     session.refresh(response)
+
     return response
 
 
@@ -144,7 +159,7 @@ def create_feedback_responses_batch(
     for response in created_responses:
         session.refresh(response)
     
-    return created_responses
+    return ORJSONResponse(dump_rows(FeedbackResponsePublic, created_responses))
 
 
 @router.get("/session/{session_id}", response_model=FeedbackResponsesPublic)
@@ -186,7 +201,193 @@ def read_responses_by_session(
     )
     responses = session.exec(statement).all()
     
-    return FeedbackResponsesPublic(data=responses, count=count)
+    return list_response(FeedbackResponsePublic, responses, count)
+
+
+def _pivot_statement(
+    organization_id: uuid.UUID | None, survey_template_id: uuid.UUID | None
+) -> Any:
+    """
+    One row per feedback session with all of its answers folded into a single
+    JSON object keyed by question_id. The pivot is done by Postgres in one
+    GROUP BY pass, so no per-response rows are sent to the application.
+    """
+    answer = func.coalesce(
+        func.to_json(FeedbackResponse.response_text), FeedbackResponse.response_value
+    )
+    statement = (
+        select(
+            FeedbackSession.id,
+            FeedbackSession.survey_template_id,
+            FeedbackSession.status,
+            FeedbackSession.completed_at,
+            func.json_object_agg(FeedbackResponse.question_id, answer, type_=JSON),
+        )
+        .join(FeedbackResponse, FeedbackResponse.session_id == FeedbackSession.id)
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+        .where(SurveyTemplate.organization_id == organization_id)
+        # The whole primary key, so the other session columns can be selected
+        .group_by(FeedbackSession.id, FeedbackSession.created_at)
+        .order_by(FeedbackSession.created_at, FeedbackSession.id)
+    )
+    if survey_template_id:
+        statement = statement.where(
+            FeedbackSession.survey_template_id == survey_template_id
+        )
+    return statement
+
+
+def _pivot_question_ids(
+    session: Session,
+    organization_id: uuid.UUID | None,
+    survey_template_id: uuid.UUID | None,
+) -> list[str]:
+    statement = (
+        select(FeedbackResponse.question_id)
+        .distinct()
+        .join(FeedbackSession, FeedbackResponse.session_id == FeedbackSession.id)
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+        .where(SurveyTemplate.organization_id == organization_id)
+        .order_by(FeedbackResponse.question_id)
+    )
+    if survey_template_id:
+        statement = statement.where(
+            FeedbackSession.survey_template_id == survey_template_id
+        )
+    return list(session.exec(statement).all())
+
+
+def _pivot_cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"))
+
+
+@router.get("/pivot", response_model=FeedbackResponsesPivot)
+def read_feedback_responses_pivot(
+    session: SessionDep,
+    current_user: CurrentUser,
+    survey_template_id: Optional[uuid.UUID] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> Any:
+    """
+    Get responses as a wide table: one row per feedback session and one answer
+    column per question_id. Admins and providers can view responses.
+    """
+    if not current_user.is_superuser and current_user.role not in ["admin", "provider"]:
+        raise HTTPException(
+            status_code=403, detail="Only admins and providers can view feedback responses"
+        )
+    org_id = current_user.organization_id
+
+    count_query = (
+        select(func.count(func.distinct(FeedbackResponse.session_id)))
+        .join(FeedbackSession, FeedbackResponse.session_id == FeedbackSession.id)
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+        .where(SurveyTemplate.organization_id == org_id)
+    )
+    if survey_template_id:
+        count_query = count_query.where(
+            FeedbackSession.survey_template_id == survey_template_id
+        )
+    count = session.exec(count_query).one()
+
+    rows = session.exec(
+        _pivot_statement(org_id, survey_template_id).offset(skip).limit(limit)
+    ).all()
+    data = [
+        {
+            "session_id": session_id,
+            "survey_template_id": template_id,
+            "status": status,
+            "completed_at": completed_at,
+            "answers": answers or {},
+        }
+        for session_id, template_id, status, completed_at, answers in rows
+    ]
+
+    return ORJSONResponse(
+        {
+            "question_ids": _pivot_question_ids(session, org_id, survey_template_id),
+            "data": data,
+            "count": count,
+        }
+    )
+
+
+@router.get("/pivot/export")
+def export_feedback_responses_pivot(
+    session: SessionDep,
+    current_user: CurrentUser,
+    survey_template_id: Optional[uuid.UUID] = None,
+    format: Literal["csv", "ndjson"] = "csv",
+) -> StreamingResponse:
+    """
+    Stream the wide response table for the whole organization as CSV or NDJSON.
+    Rows are fetched from the database in batches while the response is written.
+    Admins and providers can export responses.
+    """
+    if not current_user.is_superuser and current_user.role not in ["admin", "provider"]:
+        raise HTTPException(
+            status_code=403, detail="Only admins and providers can view feedback responses"
+        )
+    org_id = current_user.organization_id
+    question_ids = _pivot_question_ids(session, org_id, survey_template_id)
+    statement = _pivot_statement(org_id, survey_template_id).execution_options(
+        yield_per=1000
+    )
+
+    def generate() -> Iterator[str]:
+        # The request-scoped session may be closed before the body is streamed,
+        # so the export reads through its own session.
+        with Session(engine) as export_session:
+            rows = export_session.exec(statement)
+            if format == "ndjson":
+                for session_id, template_id, status, completed_at, answers in rows:
+                    yield json.dumps(
+                        {
+                            "session_id": str(session_id),
+                            "survey_template_id": str(template_id),
+                            "status": status.value,
+                            "completed_at": completed_at.isoformat() if completed_at else None,
+                            "answers": answers or {},
+                        }
+                    ) + "\n"
+                return
+
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(
+                ["session_id", "survey_template_id", "status", "completed_at", *question_ids]
+            )
+            for session_id, template_id, status, completed_at, answers in rows:
+                answers = answers or {}
+                writer.writerow(
+                    [
+                        session_id,
+                        template_id,
+                        status.value,
+                        completed_at.isoformat() if completed_at else "",
+                        *(_pivot_cell(answers.get(q)) for q in question_ids),
+                    ]
+                )
+                if buffer.tell() > 64 * 1024:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv"
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="feedback_responses_pivot.{format}"'
+        },
+    )
 
 
 @router.get("/{response_id}", response_model=FeedbackResponsePublic)
@@ -284,45 +485,209 @@ def get_question_analytics(
     question_id: str,
     session: SessionDep,
     current_user: CurrentUser,
+    bins: int = 10,
 ) -> Any:
     """
     Get analytics for a specific question across all responses in the organization.
     Admins and providers can view analytics.
+
+    All statistics are computed by database aggregates, so the cost does not
+    grow with the number of rows loaded into Python.
     """
     # Only allow admins and providers to view analytics
     if not current_user.is_superuser and current_user.role not in ["admin", "provider"]:
         raise HTTPException(
             status_code=403, detail="Only admins and providers can view response analytics"
         )
-    # Get all responses for this question in the organization
-    responses = session.exec(
-        select(FeedbackResponse)
-        .join(FeedbackResponse.session)
-        .join(FeedbackSession.survey_template)
+    bins = max(1, min(bins, 50))
+    # A plain SQLAlchemy select: after with_only_columns, sqlmodel's
+    # single-column select would still return only the first column
+    question_responses = (
+        sql_select(FeedbackResponse.id)
+        .join(FeedbackSession, FeedbackSession.id == FeedbackResponse.session_id)
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
         .where(
             FeedbackResponse.question_id == question_id,
             SurveyTemplate.organization_id == current_user.organization_id
         )
-    ).all()
-    
-    if not responses:
+    )
+    numeric = numeric_response_value()
+    response_time = FeedbackResponse.response_time_seconds
+
+    summary = session.exec(
+        question_responses.with_only_columns(
+            func.count(),
+            func.count().filter(
+                cast(FeedbackResponse.response_value, Text).not_in(["{}", "null"])
+            ),
+            func.count().filter(func.coalesce(FeedbackResponse.response_text, "") != ""),
+            func.count(response_time),
+            func.avg(response_time),
+            func.percentile_cont(0.5).within_group(response_time),
+            func.percentile_cont(0.9).within_group(response_time),
+            func.percentile_cont(0.95).within_group(response_time),
+            func.count(numeric),
+            func.avg(numeric),
+            func.min(numeric),
+            func.max(numeric),
+            func.percentile_cont(0.5).within_group(numeric),
+            func.count().filter(numeric >= 9),
+            func.count().filter(numeric <= 6),
+            func.count().filter(numeric >= 4),
+        )
+    ).one()
+    (
+        total, value_count, text_count,
+        rt_count, rt_avg, rt_p50, rt_p90, rt_p95,
+        num_count, num_avg, num_min, num_max, num_p50,
+        nps_promoters, nps_detractors, csat_satisfied,
+    ) = summary
+
+    if not total:
         return {
             "question_id": question_id,
             "total_responses": 0,
             "response_summary": {}
         }
     
-    # Analyze responses
-    response_values = [r.response_value for r in responses if r.response_value]
-    response_texts = [r.response_text for r in responses if r.response_text]
+    numeric_stats: dict[str, Any] | None = None
+    if num_count:
+        numeric_stats = {
+            "count": num_count,
+            "mean": round(num_avg, 2),
+            "min": num_min,
+            "max": num_max,
+            "median": num_p50,
+            "histogram": _numeric_histogram(
+                session,
+                question_responses,
+                numeric,
+                num_min,
+                num_max,
+                num_count,
+                bins,
+            ),
+        }
+        # NPS for 0-10 scales, CSAT (share of 4s and 5s) for 1-5 scales, as
+        # the templates define the question; the answers alone can't tell
+        # a 0-10 question answered only by detractors from a 1-5 one
+        scale = _question_scale(session, current_user.organization_id, question_id)
+        if scale == "nps":
+            numeric_stats["nps"] = round(
+                (nps_promoters - nps_detractors) / num_count * 100, 1
+            )
+        elif scale == "csat":
+            numeric_stats["csat"] = round(csat_satisfied / num_count * 100, 1)
+
+    categorical = categorical_response_value()
+    category_count = func.count().label("category_count")
+    categories = session.exec(
+        question_responses.with_only_columns(categorical, category_count)
+        .where(categorical.is_not(None))
+        .group_by(categorical)
+        .order_by(category_count.desc())
+        .limit(50)
+    ).all()
+
+    sample_responses = session.exec(
+        question_responses.with_only_columns(FeedbackResponse.response_text)
+        .where(func.coalesce(FeedbackResponse.response_text, "") != "")
+        .order_by(FeedbackResponse.created_at.desc())
+        .limit(5)
+    ).all()
     
     return {
         "question_id": question_id,
-        "total_responses": len(responses),
+        "total_responses": total,
         "response_summary": {
-            "value_responses": len(response_values),
-            "text_responses": len(response_texts),
-            "average_response_time": sum(r.response_time_seconds for r in responses if r.response_time_seconds) / len([r for r in responses if r.response_time_seconds]) if any(r.response_time_seconds for r in responses) else None,
+            "value_responses": value_count,
+            "text_responses": text_count,
+            "average_response_time": float(rt_avg) if rt_avg is not None else None,
         },
-        "sample_responses": response_texts[:5] if response_texts else [],
+        "response_time": {
+            "count": rt_count,
+            "mean": float(rt_avg) if rt_avg is not None else None,
+            "p50": rt_p50,
+            "p90": rt_p90,
+            "p95": rt_p95,
+        },
+        "numeric": numeric_stats,
+        "categorical_distribution": dict(categories),
+        "sample_responses": list(sample_responses),
     }
+
+
+# Question types scored as NPS (0-10) and as CSAT (1-5)
+NPS_QUESTION_TYPES = {"nps"}
+CSAT_QUESTION_TYPES = {"rating", "csat"}
+
+
+def _question_scale(
+    session: Session, organization_id: uuid.UUID | None, question_id: str
+) -> str | None:
+    """
+    "nps" or "csat" when every template of the organization that asks
+    `question_id` defines it that way, None otherwise. Ratings without a
+    `scale` are taken to be 1-5.
+    """
+    definition = SurveyTemplate.questions[question_id]
+    rows = session.exec(
+        select(definition["type"].as_string(), definition["scale"].as_float())
+        .where(
+            SurveyTemplate.organization_id == organization_id,
+            definition.is_not(None),
+        )
+        .distinct()
+    ).all()
+    types = {question_type for question_type, _ in rows}
+    if not types:
+        return None
+    if types <= NPS_QUESTION_TYPES:
+        return "nps"
+    if types <= CSAT_QUESTION_TYPES and all(scale in (None, 5) for _, scale in rows):
+        return "csat"
+    return None
+
+
+def _numeric_histogram(
+    session: Session,
+    question_responses: Any,
+    numeric: Any,
+    minimum: float,
+    maximum: float,
+    count: int,
+    bins: int,
+) -> list[dict[str, Any]]:
+    """
+    Histogram of numeric answers. Small integer scales (e.g. 1-5, 0-10) are
+    counted per value; anything wider is bucketed with width_bucket().
+    """
+    if minimum == maximum and not float(minimum).is_integer():
+        # width_bucket() needs distinct bounds
+        return [{"range": [minimum, maximum], "count": count}]
+    if maximum - minimum <= bins and float(minimum).is_integer() and float(maximum).is_integer():
+        bucket = func.round(numeric)
+        rows = session.exec(
+            question_responses.with_only_columns(bucket, func.count())
+            .where(numeric.is_not(None))
+            .group_by(bucket)
+            .order_by(bucket)
+        ).all()
+        return [{"value": value, "count": count} for value, count in rows]
+
+    width = (maximum - minimum) / bins
+    # The upper edge is exclusive in width_bucket, so nudge it past the maximum
+    bucket = func.width_bucket(numeric, minimum, maximum + width * 1e-9, bins)
+    rows = session.exec(
+        question_responses.with_only_columns(bucket, func.count())
+        .where(numeric.is_not(None))
+        .group_by(bucket)
+        .order_by(bucket)
+    ).all()
+    return [
+        {
+            "range": [minimum + (index - 1) * width, minimum + index * width],
+            "count": count,
+        }
+        for index, count in rows
+    ]
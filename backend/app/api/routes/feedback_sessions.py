@@ -2,10 +2,17 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlmodel import func, select
 
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.api.responses import (
+    list_response,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from app.core.triggers import run_triggers
 from app.models import (
     FeedbackSession,
     FeedbackSessionCreate,
@@ -15,9 +22,13 @@ from app.models import (
     FeedbackSessionStatus,
     Message,
     SurveyTemplate,
+    SurveyTemplateRespondentPublic,
     UserType,
 )
 
+# Respondents may reuse the template briefly, then must revalidate it
+PUBLIC_TEMPLATE_CACHE_CONTROL = "public, max-age=60, must-revalidate"
+
 router = APIRouter(prefix="/feedback-sessions", tags=["feedback-sessions"])
 
 
@@ -49,7 +60,7 @@ def read_feedback_sessions(
     count = session.exec(count_query).one()
     feedback_sessions = session.exec(base_query.offset(skip).limit(limit)).all()
     
-    return FeedbackSessionsPublic(data=feedback_sessions, count=count)
+    return list_response(FeedbackSessionPublic, feedback_sessions, count)
 
 
 @router.post(
@@ -75,6 +86,9 @@ def create_feedback_session(
     session_data = feedback_session_in.model_dump()
     if not session_data.get("expired_at"):
         session_data["expired_at"] = datetime.utcnow() + timedelta(days=7)
+    # Picked up by the delivery scheduler
+    if session_data.get("delivery_method"):
+        session_data["next_delivery_at"] = datetime.utcnow()
     
     feedback_session = FeedbackSession.model_validate(session_data)
     session.add(feedback_session)
@@ -83,6 +97,29 @@ def create_feedback_session(
     return feedback_session
 
 
+@router.post(
+    "/trigger",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=dict,
+)
+def trigger_feedback_sessions(
+    session: SessionDep, current_user: CurrentUser, hours: float = 24
+) -> Any:
+    """
+    Create feedback sessions for the organization's appointments updated in
+    the last `hours` hours that match an active survey template's triggers.
+    Admin access only for MVP.
+    """
+    if current_user.organization_id is None:
+        raise HTTPException(status_code=400, detail="User has no organization")
+    scanned, created = run_triggers(
+        session,
+        since=datetime.utcnow() - timedelta(hours=hours),
+        organization_id=current_user.organization_id,
+    )
+    return {"appointments_scanned": scanned, "sessions_created": created}
+
+
 @router.get("/by-token/{completion_token}", response_model=FeedbackSessionPublic)
 def read_feedback_session_by_token(
     completion_token: uuid.UUID, session: SessionDep
@@ -108,6 +145,43 @@ def read_feedback_session_by_token(
     return feedback_session
 
 
+@router.get(
+    "/by-token/{completion_token}/survey-template",
+    response_model=SurveyTemplateRespondentPublic,
+)
+def read_survey_template_by_token(
+    completion_token: uuid.UUID,
+    request: Request,
+    response: Response,
+    session: SessionDep,
+) -> Any:
+    """
+    Get the survey template for a feedback session by completion token. Public like
+    the session lookup; the survey page fetches it on every step, so it is served
+    with an ETag and a short shared cache lifetime.
+    """
+    row = session.exec(
+        select(FeedbackSession.expired_at, SurveyTemplate)
+        .join(SurveyTemplate, SurveyTemplate.id == FeedbackSession.survey_template_id)
+        .where(FeedbackSession.completion_token == completion_token)
+    ).first()
+
+    if not row:
+        raise HTTPException(status_code=404, detail="Feedback session not found")
+
+    expired_at, survey_template = row
+    if expired_at and expired_at < datetime.utcnow():
+        raise HTTPException(status_code=410, detail="Feedback session has expired")
+
+    etag = make_etag(
+        survey_template.id, survey_template.version, survey_template.updated_at
+    )
+    if unchanged := not_modified(request, etag, PUBLIC_TEMPLATE_CACHE_CONTROL):
+        return unchanged
+    set_cache_headers(response, etag, PUBLIC_TEMPLATE_CACHE_CONTROL)
+    return survey_template
+
+
 @router.get("/{feedback_session_id}", response_model=FeedbackSessionPublic)
 def read_feedback_session(
     feedback_session_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
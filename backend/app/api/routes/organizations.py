@@ -1,10 +1,17 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlmodel import func, select
 
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.api.responses import (
+    list_response,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from app.core.cache import cache, org_tag
 from app.models import (
     Message,
     Organization,
@@ -34,7 +41,7 @@ def read_organizations(
     statement = select(Organization).offset(skip).limit(limit)
     organizations = session.exec(statement).all()
 
-    return OrganizationsPublic(data=organizations, count=count)
+    return list_response(OrganizationPublic, organizations, count)
 
 
 @router.post(
@@ -56,13 +63,24 @@ def create_organization(
 
 
 @router.get("/me", response_model=OrganizationPublic)
-def read_my_organization(session: SessionDep, current_user: CurrentUser) -> Any:
+def read_my_organization(
+    request: Request, response: Response, session: SessionDep, current_user: CurrentUser
+) -> Any:
     """
     Get current user's organization.
     """
-    organization = session.get(Organization, current_user.organization_id)
+    organization_id = current_user.organization_id
+    organization = cache.get_or_set(
+        f"organization:{organization_id}",
+        lambda: session.get(Organization, organization_id),
+        tags=[org_tag(organization_id)],
+    )
     if not organization:
         raise HTTPException(status_code=404, detail="Organization not found")
+    etag = make_etag(organization["id"], organization["updated_at"])
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    set_cache_headers(response, etag)
     return organization
 
 
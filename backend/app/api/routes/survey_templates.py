@@ -1,10 +1,18 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import Session, func, select
 
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.api.responses import (
+    collection_etag,
+    list_response,
+    make_etag,
+    not_modified,
+    set_cache_headers,
+)
+from app.core.cache import cache, template_tag
 from app.models import (
     Message,
     SurveyTemplate,
@@ -17,6 +25,21 @@ from app.models import (
 router = APIRouter(prefix="/survey-templates", tags=["survey-templates"])
 
 
+def cached_survey_template(
+    session: Session, survey_template_id: uuid.UUID, ttl: float | None = None
+) -> Any:
+    """
+    A survey template through the shared cache. It is cached as JSON data, so
+    ids and timestamps come back as strings.
+    """
+    return cache.get_or_set(
+        f"survey-template:{survey_template_id}",
+        lambda: session.get(SurveyTemplate, survey_template_id),
+        ttl=ttl,
+        tags=[template_tag(survey_template_id)],
+    )
+
+
 @router.get("/", response_model=SurveyTemplatesPublic)
 def read_survey_templates(
     session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
@@ -43,7 +66,7 @@ def read_survey_templates(
     )
     survey_templates = session.exec(statement).all()
 
-    return SurveyTemplatesPublic(data=survey_templates, count=count)
+    return list_response(SurveyTemplatePublic, survey_templates, count)
 
 
 @router.post(
@@ -73,7 +96,11 @@ def create_survey_template(
 
 @router.get("/active", response_model=SurveyTemplatesPublic)
 def read_active_survey_templates(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    request: Request,
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
 ) -> Any:
     """
     Retrieve only active survey templates for the current user's organization.
@@ -84,6 +111,17 @@ def read_active_survey_templates(
         raise HTTPException(
             status_code=403, detail="Only admins and providers can view survey templates"
         )
+    # Answer revalidations from the (id, updated_at) fingerprint before loading rows
+    etag = collection_etag(
+        session,
+        SurveyTemplate,
+        SurveyTemplate.organization_id == current_user.organization_id,
+        SurveyTemplate.active == True,
+        extra=(skip, limit),
+    )
+    if unchanged := not_modified(request, etag):
+        return unchanged
+
     count_statement = select(func.count()).select_from(SurveyTemplate).where(
         SurveyTemplate.organization_id == current_user.organization_id,
         SurveyTemplate.active == True
@@ -101,12 +139,18 @@ def read_active_survey_templates(
     )
     survey_templates = session.exec(statement).all()
 
-    return SurveyTemplatesPublic(data=survey_templates, count=count)
+    response = list_response(SurveyTemplatePublic, survey_templates, count)
+    set_cache_headers(response, etag)
+    return response
 
 
 @router.get("/{survey_template_id}", response_model=SurveyTemplatePublic)
 def read_survey_template(
-    survey_template_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+    survey_template_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    session: SessionDep,
+    current_user: CurrentUser,
 ) -> Any:
     """
     Get survey template by ID. Admins and providers can view templates.
@@ -116,13 +160,19 @@ def read_survey_template(
         raise HTTPException(
             status_code=403, detail="Only admins and providers can view survey templates"
         )
-    survey_template = session.get(SurveyTemplate, survey_template_id)
+    survey_template = cached_survey_template(session, survey_template_id)
     if not survey_template:
         raise HTTPException(status_code=404, detail="Survey template not found")
     
-    if survey_template.organization_id != current_user.organization_id:
+    if survey_template["organization_id"] != str(current_user.organization_id):
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
+    etag = make_etag(
+        survey_template["id"], survey_template["version"], survey_template["updated_at"]
+    )
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    set_cache_headers(response, etag)
     return survey_template
 
 
@@ -172,6 +222,7 @@ def delete_survey_template(
 ) -> Message:
     """
     Delete a survey template. Admin access only for MVP.
+    Its feedback sessions, responses and archived data are deleted with it.
     """
     survey_template = session.get(SurveyTemplate, survey_template_id)
     if not survey_template:
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
+from app.core.metrics import registry
 from app.models import Message
 from app.utils import generate_test_email, send_email
 
@@ -29,3 +31,19 @@ def test_email(email_to: EmailStr) -> Message:
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
+
+
+@router.get(
+    "/metrics",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=PlainTextResponse,
+)
+def metrics() -> PlainTextResponse:
+    """
+    Per-route request, SQL statement and serialization totals for this worker,
+    in the Prometheus text format. Superusers only, as route timings and
+    statement counts reveal how the API is used.
+    """
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,342 @@
+import argparse
+import logging
+import uuid
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import delete, or_, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+
+from app.core.cache import cache, org_feedback_tag
+from app.core.config import settings
+from app.core.db import engine
+from app.core.events import SKIP_EVENTS
+from app.core.feedback_values import numeric_response_value
+from app.core.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_partition,
+    drop_empty_partitions,
+    month_start,
+)
+from app.models import (
+    FeedbackArchive,
+    FeedbackResponse,
+    FeedbackRollup,
+    FeedbackSession,
+    FeedbackSessionStatus,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+batch_size = 1000
+
+ROLLUP_FIELDS = [
+    "surveys_sent",
+    "responses_received",
+    "completed",
+    "completion_seconds_sum",
+    "completion_seconds_count",
+    "responses",
+    "rating_sum",
+    "rating_count",
+]
+
+# One archive row per session: the session row and its responses as JSONB
+ARCHIVE_SESSIONS = text(
+    """
+    INSERT INTO feedbackarchive (
+        session_id, organization_id, survey_template_id, created_at,
+        archived_at, session, responses
+    )
+    SELECT s.id, t.organization_id, s.survey_template_id, s.created_at, :now,
+        to_jsonb(s),
+        coalesce(
+            (
+                SELECT jsonb_agg(to_jsonb(r) ORDER BY r.created_at)
+                FROM feedbackresponse r
+                WHERE r.session_id = s.id AND r.created_at >= :oldest
+            ),
+            '[]'::jsonb
+        )
+    FROM feedbacksession s
+    JOIN surveytemplate t ON t.id = s.survey_template_id
+    WHERE s.id = ANY(:ids) AND s.created_at >= :oldest
+    RETURNING organization_id
+    """
+)
+
+# jsonb_populate_record fills columns by name and leaves those missing from
+# the JSON NULL, not at their default. Sessions archived before a NOT NULL
+# column was added get its default merged in first.
+REHYDRATE_SESSIONS = text(
+    """
+    INSERT INTO feedbacksession
+    SELECT (jsonb_populate_record(
+        NULL::feedbacksession, '{"reminders_sent": 0}'::jsonb || a.session
+    )).*
+    FROM feedbackarchive a
+    WHERE a.session_id = ANY(:ids)
+    """
+)
+REHYDRATE_RESPONSES = text(
+    """
+    INSERT INTO feedbackresponse
+    SELECT r.*
+    FROM feedbackarchive a,
+        jsonb_populate_recordset(NULL::feedbackresponse, a.responses) r
+    WHERE a.session_id = ANY(:ids)
+    """
+)
+
+
+def archivable_clause(now: datetime) -> Any:
+    """Sessions that can no longer change: completed, expired or lapsed."""
+    return or_(
+        FeedbackSession.status.in_(
+            [FeedbackSessionStatus.COMPLETED, FeedbackSessionStatus.EXPIRED]
+        ),
+        FeedbackSession.expired_at < now,
+    )
+
+
+def archive_cutoff(months: int, today: date | None = None) -> datetime:
+    """Start of the month `months` months back; older sessions get archived."""
+    month = add_months(month_start(today or datetime.utcnow().date()), -months)
+    return datetime(month.year, month.month, 1)
+
+
+def _rollup(
+    session: Session, ids: Sequence[uuid.UUID], oldest: datetime
+) -> dict[tuple[uuid.UUID, datetime], dict[str, Any]]:
+    """Per template and month totals of the given sessions and their responses."""
+    month = func.date_trunc("month", FeedbackSession.created_at)
+    rating = numeric_response_value()
+    session_totals = session.exec(
+        select(
+            FeedbackSession.survey_template_id,
+            month,
+            func.count(),
+            func.count(
+                func.coalesce(FeedbackSession.first_response_at, FeedbackSession.completed_at)
+            ),
+            func.count().filter(
+                FeedbackSession.status == FeedbackSessionStatus.COMPLETED
+            ),
+            func.coalesce(func.sum(FeedbackSession.completion_time_seconds), 0),
+            func.count(FeedbackSession.completion_time_seconds),
+        )
+        .where(FeedbackSession.id.in_(ids), FeedbackSession.created_at >= oldest)
+        .group_by(FeedbackSession.survey_template_id, month)
+    ).all()
+    response_totals = session.exec(
+        select(
+            FeedbackSession.survey_template_id,
+            month,
+            func.count(FeedbackResponse.id),
+            func.coalesce(func.sum(rating), 0.0),
+            func.count(rating),
+        )
+        .join(FeedbackSession, FeedbackSession.id == FeedbackResponse.session_id)
+        .where(
+            FeedbackSession.id.in_(ids),
+            FeedbackSession.created_at >= oldest,
+            FeedbackResponse.created_at >= oldest,
+        )
+        .group_by(FeedbackSession.survey_template_id, month)
+    ).all()
+
+    totals: dict[tuple[uuid.UUID, datetime], dict[str, Any]] = {}
+    for template_id, period, *values in session_totals:
+        row = totals.setdefault((template_id, period), dict.fromkeys(ROLLUP_FIELDS, 0))
+        row.update(zip(ROLLUP_FIELDS[:5], values, strict=True))
+    for template_id, period, *values in response_totals:
+        row = totals.setdefault((template_id, period), dict.fromkeys(ROLLUP_FIELDS, 0))
+        row.update(zip(ROLLUP_FIELDS[5:], values, strict=True))
+    return totals
+
+
+def _apply_rollup(
+    session: Session,
+    totals: dict[tuple[uuid.UUID, datetime], dict[str, Any]],
+    sign: int,
+) -> None:
+    """Add (sign=1) or subtract (sign=-1) totals to feedbackrollup."""
+    if not totals:
+        return
+    table = FeedbackRollup.__table__
+    statement = insert(table).values([
+        {
+            "survey_template_id": template_id,
+            "month": period,
+            **{name: sign * value for name, value in row.items()},
+        }
+        for (template_id, period), row in totals.items()
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.survey_template_id, table.c.month],
+        set_={name: table.c[name] + statement.excluded[name] for name in ROLLUP_FIELDS},
+    )
+    session.execute(statement)
+    if sign < 0:
+        session.execute(
+            delete(table).where(
+                table.c.survey_template_id.in_({key[0] for key in totals}),
+                table.c.surveys_sent <= 0,
+                table.c.responses <= 0,
+            )
+        )
+
+
+def archive_batch(session: Session, cutoff: datetime, limit: int = batch_size) -> int:
+    """
+    Move one batch of finished sessions created before `cutoff`, with their
+    responses, into feedbackarchive and fold their totals into feedbackrollup.
+    Sessions are claimed with SKIP LOCKED, so archive runs can overlap.
+    """
+    now = datetime.utcnow()
+    rows = session.exec(
+        select(FeedbackSession.id, FeedbackSession.created_at)
+        .where(FeedbackSession.created_at < cutoff, archivable_clause(now))
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not rows:
+        return 0
+    ids = [session_id for session_id, _ in rows]
+    # Responses are never older than their session
+    oldest = min(created_at for _, created_at in rows)
+
+    _apply_rollup(session, _rollup(session, ids, oldest), sign=1)
+    organization_ids = set(
+        session.execute(
+            ARCHIVE_SESSIONS, {"ids": ids, "oldest": oldest, "now": now}
+        ).scalars()
+    )
+    session.execute(
+        delete(FeedbackResponse).where(
+            FeedbackResponse.session_id.in_(ids), FeedbackResponse.created_at >= oldest
+        )
+    )
+    session.execute(
+        delete(FeedbackSession).where(
+            FeedbackSession.id.in_(ids), FeedbackSession.created_at < cutoff
+        )
+    )
+    session.commit()
+    cache.invalidate(*(org_feedback_tag(org_id) for org_id in organization_ids))
+    return len(ids)
+
+
+def rehydrate_batch(
+    session: Session,
+    *,
+    organization_id: uuid.UUID | None = None,
+    session_ids: Sequence[uuid.UUID] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int = batch_size,
+) -> int:
+    """
+    Move one batch of archived sessions matching the filters back into the hot
+    tables, taking their totals out of feedbackrollup again.
+    """
+    statement = select(
+        FeedbackArchive.session_id,
+        FeedbackArchive.created_at,
+        FeedbackArchive.organization_id,
+    )
+    if organization_id is not None:
+        statement = statement.where(FeedbackArchive.organization_id == organization_id)
+    if session_ids is not None:
+        statement = statement.where(FeedbackArchive.session_id.in_(session_ids))
+    if since is not None:
+        statement = statement.where(FeedbackArchive.created_at >= since)
+    if until is not None:
+        statement = statement.where(FeedbackArchive.created_at < until)
+    rows = session.exec(statement.limit(limit).with_for_update(skip_locked=True)).all()
+    if not rows:
+        return 0
+    ids = [session_id for session_id, _, _ in rows]
+    oldest = min(created_at for _, created_at, _ in rows)
+
+    # Partitions of archived months may have been dropped; responses usually
+    # arrive within days, so the following month is recreated too
+    connection = session.connection()
+    for created_at in {month_start(created_at) for _, created_at, _ in rows}:
+        for month in (created_at, add_months(created_at, 1)):
+            for table in PARTITIONED_TABLES:
+                create_partition(connection, table, month)
+
+    # Restored feedback is not news to the live dashboards
+    session.execute(text(SKIP_EVENTS))
+    session.execute(REHYDRATE_SESSIONS, {"ids": ids})
+    session.execute(REHYDRATE_RESPONSES, {"ids": ids})
+    session.execute(delete(FeedbackArchive).where(FeedbackArchive.session_id.in_(ids)))
+    _apply_rollup(session, _rollup(session, ids, oldest), sign=-1)
+    session.commit()
+    cache.invalidate(*{org_feedback_tag(org_id) for _, _, org_id in rows})
+    return len(ids)
+
+
+def init(months: int) -> int:
+    cutoff = archive_cutoff(months)
+    total = 0
+    with Session(engine) as session:
+        while archived := archive_batch(session, cutoff):
+            total += archived
+            logger.info(f"Archived {total} sessions created before {cutoff:%Y-%m-%d}")
+    with engine.begin() as connection:
+        for table in PARTITIONED_TABLES:
+            for name in drop_empty_partitions(connection, table, cutoff.date()):
+                logger.info(f"Dropped empty partition {name}")
+    return total
+
+
+def rehydrate(**filters: Any) -> int:
+    total = 0
+    with Session(engine) as session:
+        while restored := rehydrate_batch(session, **filters):
+            total += restored
+            logger.info(f"Rehydrated {total} sessions")
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Archive finished feedback sessions, or bring them back."
+    )
+    parser.add_argument(
+        "--months", type=int, default=settings.ARCHIVE_AFTER_MONTHS,
+        help="archive finished sessions created more than this many months ago",
+    )
+    parser.add_argument(
+        "--rehydrate", action="store_true",
+        help="move archived sessions matching the filters below back instead",
+    )
+    parser.add_argument("--organization-id", type=uuid.UUID)
+    parser.add_argument("--session-id", type=uuid.UUID, action="append")
+    parser.add_argument("--since", type=date.fromisoformat, help="YYYY-MM-DD")
+    parser.add_argument("--until", type=date.fromisoformat, help="YYYY-MM-DD, exclusive")
+    args = parser.parse_args()
+
+    if not args.rehydrate:
+        logger.info(f"Archiving sessions older than {args.months} months")
+        logger.info(f"Archived {init(args.months)} sessions")
+        return
+    if not (args.organization_id or args.session_id or args.since or args.until):
+        parser.error("--rehydrate needs at least one filter")
+    restored = rehydrate(
+        organization_id=args.organization_id,
+        session_ids=args.session_id,
+        since=datetime.combine(args.since, datetime.min.time()) if args.since else None,
+        until=datetime.combine(args.until, datetime.min.time()) if args.until else None,
+    )
+    logger.info(f"Rehydrated {restored} sessions")
+
+
+if __name__ == "__main__":
+    main()
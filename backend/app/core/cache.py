@@ -0,0 +1,495 @@
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any
+
+import orjson
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Invalidations are broadcast to the other processes on this NOTIFY channel
+CHANNEL = "cache_invalidations"
+
+# NOTIFY payloads must stay under 8000 bytes; longer lists are sent in parts
+MAX_PAYLOAD_BYTES = 7000
+
+
+def org_tag(organization_id: Any) -> str:
+    return f"org:{organization_id}"
+
+
+def template_tag(template_id: Any) -> str:
+    return f"template:{template_id}"
+
+
+def org_feedback_tag(organization_id: Any) -> str:
+    """Results derived from an organization's feedback responses."""
+    return f"org:{organization_id}:feedback"
+
+
+RESPONSE_TYPES_TAG = "response-types"
+
+
+class CacheBackend(ABC):
+    """
+    Storage for serialized cache entries. Values arrive already encoded so
+    every backend behaves the same regardless of where the bytes live.
+    """
+
+    # Whether every process reads and invalidates the same entries
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float, tags: tuple[str, ...]) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class LRUCacheBackend(CacheBackend):
+    """
+    In-process backend with a size-bounded LRU. Each worker has its own copy;
+    with several workers, have the `Cache` broadcast its invalidations.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = (
+            OrderedDict()
+        )
+        self._tags: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float, tags: tuple[str, ...]) -> None:
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, set()):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class PostgresCacheBackend(CacheBackend):
+    """
+    Backend shared by every worker, stored in the UNLOGGED `cacheentry` table.
+    Entries are lost on a database crash, which is fine for a cache, and tag
+    invalidation is a single indexed `tags && ARRAY[...]` delete.
+    """
+
+    shared = True
+
+    # Expired rows are swept on roughly one write in this many
+    purge_every = 100
+
+    def __init__(self, engine: Engine) -> None:
+        from app.models import CacheEntry
+
+        self.engine = engine
+        self.table = CacheEntry.__table__
+
+    def get(self, key: str) -> bytes | None:
+        statement = select(self.table.c.value).where(
+            self.table.c.key == key, self.table.c.expires_at > func.now()
+        )
+        with self.engine.connect() as connection:
+            return connection.execute(statement).scalar()
+
+    def set(self, key: str, value: bytes, ttl: float, tags: tuple[str, ...]) -> None:
+        expires_at = func.now() + timedelta(seconds=ttl)
+        statement = insert(self.table).values(
+            key=key, value=value, tags=list(tags), expires_at=expires_at
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[self.table.c.key],
+            set_={
+                "value": statement.excluded.value,
+                "tags": statement.excluded.tags,
+                "expires_at": statement.excluded.expires_at,
+            },
+        )
+        with self.engine.begin() as connection:
+            connection.execute(statement)
+            if random.randrange(self.purge_every) == 0:
+                connection.execute(
+                    delete(self.table).where(self.table.c.expires_at <= func.now())
+                )
+
+    def delete(self, key: str) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(delete(self.table).where(self.table.c.key == key))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        tags = list(tags)
+        if not tags:
+            return
+        with self.engine.begin() as connection:
+            connection.execute(
+                delete(self.table).where(self.table.c.tags.overlap(tags))
+            )
+
+    def clear(self) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(delete(self.table))
+
+
+def _default(value: Any) -> Any:
+    # SQLModel / pydantic models are cached as their JSON-mode dump
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _build_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "postgres":
+        from app.core.db import engine
+
+        return PostgresCacheBackend(engine)
+    return LRUCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+def _chunks(values: list[str]) -> Iterator[list[str]]:
+    """Split `values` into lists that encode within MAX_PAYLOAD_BYTES."""
+    chunk: list[str] = []
+    size = 0
+    for value in values:
+        # The quotes and comma around each value, plus any escaping
+        length = len(orjson.dumps(value)) + 1
+        if chunk and size + length > MAX_PAYLOAD_BYTES:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(value)
+        size += length
+    if chunk:
+        yield chunk
+
+
+class _Load:
+    """A `get_or_set` load in progress, stale once its key or tags change."""
+
+    __slots__ = ("key", "tags", "stale")
+
+    def __init__(self, key: str, tags: tuple[str, ...]) -> None:
+        self.key = key
+        self.tags = tags
+        self.stale = False
+
+
+class Cache:
+    """
+    Front end over a `CacheBackend`.
+
+    Values are stored as JSON, so a hit always returns plain JSON data (UUIDs
+    and datetimes come back as strings) whichever backend is configured.
+    `get_or_set` collapses concurrent misses for the same key in this process
+    into a single load, and `invalidate` drops every entry carrying a tag.
+
+    With `broadcast`, invalidations of a per-process backend are also sent
+    to every other process with NOTIFY, and each process applies those of
+    the others from a LISTEN thread, started by `listen` or the first read.
+    While that connection is down nothing is heard, so the process drops
+    its entries when it reconnects.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        default_ttl: float | None = None,
+        broadcast: bool = False,
+    ) -> None:
+        self._backend = backend
+        self.default_ttl = default_ttl
+        self.broadcast = broadcast
+        self._lock = threading.Lock()
+        self._inflight: dict[str, list[Any]] = {}
+        # Loads in progress, marked stale by whatever invalidates their entry
+        self._loads: set[_Load] = set()
+        # Held while applying a broadcast, so a fork never copies a half-done one
+        self._applying = threading.Lock()
+        # The process that started the LISTEN thread, and its id in payloads
+        self._listener_pid: int | None = None
+        self._origin = ""
+        self.listening = threading.Event()
+
+    @property
+    def backend(self) -> CacheBackend:
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = _build_backend()
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: CacheBackend) -> None:
+        self._backend = backend
+
+    @property
+    def broadcasting(self) -> bool:
+        return self.broadcast and not self.backend.shared
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._ensure_listening()
+        value = self.backend.get(key)
+        if value is None:
+            return default
+        return orjson.loads(value)
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> bytes:
+        payload = orjson.dumps(value, default=_default)
+        self.backend.set(key, payload, self._ttl(ttl), tuple(tags))
+        return payload
+
+    def delete(self, key: str) -> None:
+        self._delete(key)
+        self._publish("keys", [key])
+
+    def invalidate(self, *tags: str) -> None:
+        if not tags:
+            return
+        self._invalidate(tags)
+        self._publish("tags", list(tags))
+
+    def clear(self) -> None:
+        self._clear()
+        self._publish("clear", [])
+
+    def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        *,
+        ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Return the cached value for `key`, calling `loader` on a miss. A loader
+        result of None is returned but not cached.
+        """
+        self._ensure_listening()
+        payload = self.backend.get(key)
+        if payload is not None:
+            return orjson.loads(payload)
+        tags = tuple(tags)
+        with self._single_flight(key):
+            payload = self.backend.get(key)
+            if payload is not None:
+                return orjson.loads(payload)
+            load = _Load(key, tags)
+            with self._lock:
+                self._loads.add(load)
+            try:
+                value = loader()
+                if value is None:
+                    return None
+                payload = orjson.dumps(value, default=_default)
+                if not load.stale:
+                    self.backend.set(key, payload, self._ttl(ttl), tags)
+                    # An invalidation marks loads before it deletes entries,
+                    # so one that raced the set above is caught here
+                    if load.stale:
+                        self.backend.delete(key)
+            finally:
+                with self._lock:
+                    self._loads.discard(load)
+            return orjson.loads(payload)
+
+    def listen(self) -> None:
+        """Start applying the invalidations broadcast by other processes."""
+        if not self.broadcasting:
+            return
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+            if self._listener_pid is None:
+                # Registered once; it carries over into forked children
+                os.register_at_fork(
+                    before=self._applying.acquire,
+                    after_in_parent=self._applying.release,
+                    after_in_child=self._applying.release,
+                )
+            self._listener_pid = os.getpid()
+            self._origin = uuid.uuid4().hex
+            self.listening = threading.Event()
+        threading.Thread(
+            target=self._listen,
+            args=(self._origin, self.listening),
+            name="cache-invalidations",
+            daemon=True,
+        ).start()
+
+    def _ensure_listening(self) -> None:
+        if self.broadcast and self._listener_pid != os.getpid():
+            self.listen()
+
+    def _listen(self, origin: str, listening: threading.Event) -> None:
+        import psycopg
+
+        from app.core.db import psycopg_conninfo
+
+        reconnecting = False
+        while origin == self._origin:
+            try:
+                with psycopg.connect(psycopg_conninfo(), autocommit=True) as connection:
+                    connection.execute(f"LISTEN {CHANNEL}")
+                    if reconnecting:
+                        # Whatever was sent while nobody listened is lost
+                        with self._applying:
+                            self._clear()
+                    listening.set()
+                    for notify in connection.notifies():
+                        if origin != self._origin:
+                            return
+                        try:
+                            with self._applying:
+                                self._apply(notify.payload, origin)
+                        except Exception:
+                            logger.exception(f"Failed to apply {notify.payload!r}")
+            except psycopg.OperationalError:
+                logger.warning("Lost the cache invalidations connection", exc_info=True)
+            listening.clear()
+            reconnecting = True
+            time.sleep(settings.CACHE_BROADCAST_RECONNECT_SECONDS)
+
+    def _apply(self, payload: str, origin: str) -> None:
+        message = orjson.loads(payload)
+        if message["origin"] == origin:
+            return
+        if message["kind"] == "clear":
+            self._clear()
+        elif message["kind"] == "tags":
+            self._invalidate(message["values"])
+        elif message["kind"] == "keys":
+            for key in message["values"]:
+                self._delete(key)
+
+    def _publish(self, kind: str, values: list[str]) -> None:
+        if not self.broadcasting:
+            return
+        from app.core.db import engine
+
+        # Scripts that only invalidate never listen, and publish without an origin
+        chunks = list(_chunks(values)) if values else [[]]
+        try:
+            with engine.begin() as connection:
+                for chunk in chunks:
+                    message = {"origin": self._origin, "kind": kind, "values": chunk}
+                    connection.execute(
+                        select(func.pg_notify(CHANNEL, orjson.dumps(message).decode()))
+                    )
+        except Exception:
+            # The data is committed by now; other workers catch up on the TTL
+            logger.exception(f"Failed to broadcast cache invalidation of {values!r}")
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            for load in self._loads:
+                if load.key == key:
+                    load.stale = True
+        self.backend.delete(key)
+
+    def _invalidate(self, tags: Iterable[str]) -> None:
+        tags = set(tags)
+        with self._lock:
+            for load in self._loads:
+                if not tags.isdisjoint(load.tags):
+                    load.stale = True
+        self.backend.invalidate_tags(tags)
+
+    def _clear(self) -> None:
+        with self._lock:
+            for load in self._loads:
+                load.stale = True
+        self.backend.clear()
+
+    def _ttl(self, ttl: float | None) -> float:
+        if ttl is not None:
+            return ttl
+        if self.default_ttl is not None:
+            return self.default_ttl
+        return settings.CACHE_DEFAULT_TTL_SECONDS
+
+    @contextmanager
+    def _single_flight(self, key: str) -> Iterator[None]:
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is None:
+                entry = self._inflight[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._inflight[key]
+
+
+cache = Cache(broadcast=settings.CACHE_BROADCAST_INVALIDATIONS)
@@ -86,11 +86,80 @@ class Settings(BaseSettings):
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
 
+    # Emails are queued and sent by this many background workers, each
+    # keeping its SMTP connection open until it has been idle this long
+    SMTP_POOL_SIZE: int = 4
+    SMTP_IDLE_TIMEOUT_SECONDS: float = 30.0
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def emails_enabled(self) -> bool:
         return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
 
+    # "memory" keeps an LRU per process; "postgres" shares entries between workers
+    CACHE_BACKEND: Literal["memory", "postgres"] = "memory"
+    CACHE_MAX_ENTRIES: int = 10_000
+    CACHE_DEFAULT_TTL_SECONDS: float = 300.0
+    # With "memory", send invalidations to the other workers and processes
+    # over LISTEN/NOTIFY, so they don't serve stale entries until the TTL
+    CACHE_BROADCAST_INVALIDATIONS: bool = True
+    CACHE_BROADCAST_RECONNECT_SECONDS: float = 5.0
+    # TTL of the entries app.main.warm_up loads in the gunicorn master, which
+    # workers forked at any time inherit; only used while broadcasting
+    CACHE_WARM_TTL_SECONDS: float = 24 * 60 * 60
+
+    # Monthly partitions of feedbacksession/feedbackresponse are created this
+    # many months ahead, re-checked by each API process on this interval
+    # (0 disables the in-process check; run app/partitions.py instead)
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 6 * 60 * 60
+
+    # Finished sessions older than this are moved to feedbackarchive by
+    # app/archive.py
+    ARCHIVE_AFTER_MONTHS: int = 24
+
+    # Survey invitations are sent by app/deliver.py. "fake" records them in
+    # memory instead, for tests and local development
+    DELIVERY_BACKEND: Literal["live", "fake"] = "live"
+    DELIVERY_BATCH_SIZE: int = 500
+    DELIVERY_CONCURRENCY: int = 32
+    DELIVERY_POLL_INTERVAL_SECONDS: float = 5.0
+    # Failed sends are retried after 1, 2, 4, ... times the base delay
+    DELIVERY_MAX_ATTEMPTS: int = 5
+    DELIVERY_RETRY_BASE_SECONDS: float = 60.0
+    DELIVERY_RETRY_MAX_SECONDS: float = 6 * 60 * 60
+    # Sends per second, per channel and per organization
+    DELIVERY_CHANNEL_RATE_LIMITS: dict[str, float] = {"email": 50.0, "sms": 10.0}
+    DELIVERY_ORGANIZATION_RATE_LIMIT: float = 20.0
+
+    # HTTP gateway for SMS invitations; the SMS channel is off without it
+    SMS_GATEWAY_URL: HttpUrl | None = None
+    SMS_GATEWAY_TOKEN: str | None = None
+    SMS_FROM: str | None = None
+
+    # Production server (app/gunicorn_conf.py). With SERVER_PRELOAD the master
+    # imports the app and warms caches once, then forks the workers, which
+    # share that memory copy-on-write. 0 workers means one per CPU.
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0
+    SERVER_PRELOAD: bool = True
+    # Workers are replaced after this many requests (plus up to the jitter,
+    # so they don't all restart at once); 0 never recycles them
+    SERVER_MAX_REQUESTS: int = 10_000
+    SERVER_MAX_REQUESTS_JITTER: int = 1_000
+    # How long a worker may finish in-flight requests on reload or shutdown
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_TIMEOUT_SECONDS: int = 60
+    SERVER_KEEPALIVE_SECONDS: int = 5
+
+    # Live dashboard streams (/analytics/live). Each API worker holds one
+    # LISTEN connection for all of its streams; idle streams get a comment
+    # on this interval so proxies keep them open
+    LIVE_EVENTS_KEEPALIVE_SECONDS: float = 15.0
+    # Events buffered per stream before a slow client is told to resync
+    LIVE_EVENTS_QUEUE_SIZE: int = 100
+    LIVE_EVENTS_RECONNECT_SECONDS: float = 5.0
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
@@ -3,9 +3,16 @@ from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 from app.models import User, UserCreate, Organization
 
 engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+instrument_engine(engine)
+
+
+def psycopg_conninfo() -> str:
+    """The engine's database, for connections opened outside its pool (LISTEN)."""
+    return engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -0,0 +1,502 @@
+"""
+Delivery of survey invitations and their reminders.
+
+Sessions with a `next_delivery_at` in the past are claimed in batches with
+SKIP LOCKED and leased by pushing `next_delivery_at` forward, so the claim
+commits at once and overlapping workers never send the same invitation.
+The batch is then sent concurrently through the channel adapter of each
+session's `delivery_method`, within per-channel and per-organization rate
+limits, and the outcome of every send is written back in one executemany.
+Messages are rendered in batches from app.core.invitations before sending.
+
+Reminders reuse the same column: a delivered session's `next_delivery_at`
+is moved to its template's next reminder, so the scheduler still only ever
+reads due rows through the partial index.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+import httpx
+from jinja2 import TemplateError
+from sqlalchemy import and_, bindparam, or_, tuple_, update
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.invitations import (
+    InvitationTemplate,
+    load_invitation_templates,
+    recipient,
+)
+from app.core.mail import mailer
+from app.models import (
+    Appointment,
+    DeliveryMethod,
+    FeedbackSession,
+    FeedbackSessionStatus,
+    SurveyTemplate,
+    User,
+)
+from app.utils import send_email
+
+logger = logging.getLogger(__name__)
+
+# Claimed sessions come due again after this long if a worker dies mid-batch
+LEASE = timedelta(minutes=10)
+
+
+class DeliveryError(Exception):
+    """A failed send. `retry` is False when trying again cannot help."""
+
+    def __init__(self, message: str, retry: bool = True) -> None:
+        super().__init__(message)
+        self.retry = retry
+
+
+@dataclass(slots=True)
+class Invitation:
+    session_id: uuid.UUID
+    created_at: datetime
+    organization_id: uuid.UUID
+    survey_template_id: uuid.UUID
+    method: DeliveryMethod
+    completion_token: uuid.UUID
+    attempts: int
+    email: str | None
+    phone_number: str | None
+    patient_name: str | None
+    expired_at: datetime | None
+    # Set once the invitation itself went out; later sends are reminders
+    delivered_at: datetime | None
+    reminders_sent: int
+    # Rendered from the survey template's invitation before sending
+    subject: str = ""
+    body: str = ""
+    # When the following reminder is due if this send succeeds
+    next_reminder_at: datetime | None = None
+
+    @property
+    def reminder(self) -> bool:
+        return self.delivered_at is not None
+
+    @property
+    def failures(self) -> int:
+        """Failed attempts so far, across the invitation and its reminders."""
+        return self.attempts - self.reminders_sent - (1 if self.reminder else 0)
+
+    @property
+    def link(self) -> str:
+        return f"{settings.FRONTEND_HOST}/feedback/{self.completion_token}"
+
+
+class Channel(ABC):
+    """Sends invitations over one delivery method."""
+
+    method: DeliveryMethod
+
+    @abstractmethod
+    async def send(self, invitation: Invitation) -> None:
+        """Send one invitation, raising DeliveryError on failure."""
+
+    async def close(self) -> None:  # noqa: B027
+        """Release the channel's connections; most channels hold none."""
+
+
+class EmailChannel(Channel):
+    method = DeliveryMethod.EMAIL
+
+    async def send(self, invitation: Invitation) -> None:
+        if not invitation.email:
+            raise DeliveryError("patient has no email address", retry=False)
+        # Queued on the shared mailer, whose workers reuse their connections
+        sent = send_email(
+            email_to=invitation.email,
+            subject=invitation.subject,
+            html_content=invitation.body,
+        )
+        try:
+            response = await asyncio.wrap_future(sent)
+        except Exception as e:
+            raise DeliveryError(f"SMTP send failed: {e}") from e
+        if not getattr(response, "success", False):
+            raise DeliveryError(f"SMTP send failed: {response}")
+
+    async def close(self) -> None:
+        await asyncio.to_thread(mailer.close)
+
+
+class SmsChannel(Channel):
+    """Posts messages to an HTTP SMS gateway, reusing pooled connections."""
+
+    method = DeliveryMethod.SMS
+
+    def __init__(self, url: str, token: str | None, sender: str | None) -> None:
+        self.url = url
+        self.sender = sender
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.client = httpx.AsyncClient(headers=headers, timeout=10.0)
+
+    async def send(self, invitation: Invitation) -> None:
+        if not invitation.phone_number:
+            raise DeliveryError("patient has no phone number", retry=False)
+        try:
+            response = await self.client.post(
+                self.url,
+                json={
+                    "to": invitation.phone_number,
+                    "from": self.sender,
+                    "body": invitation.body,
+                },
+            )
+        except httpx.HTTPError as e:
+            raise DeliveryError(f"SMS gateway unreachable: {e}") from e
+        if response.status_code >= 400:
+            retry = response.status_code == 429 or response.status_code >= 500
+            raise DeliveryError(
+                f"SMS gateway returned {response.status_code}", retry=retry
+            )
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class FakeChannel(Channel):
+    """Keeps sent invitations in memory instead of sending them."""
+
+    def __init__(self, method: DeliveryMethod) -> None:
+        self.method = method
+        self.sent: list[Invitation] = []
+
+    async def send(self, invitation: Invitation) -> None:
+        self.sent.append(invitation)
+        logger.info(f"Fake {self.method.value} invitation for {invitation.session_id}")
+
+
+def build_channels() -> dict[DeliveryMethod, Channel]:
+    """The channels configured in settings; methods without one are not claimed."""
+    if settings.DELIVERY_BACKEND == "fake":
+        return {
+            method: FakeChannel(method)
+            for method in (DeliveryMethod.EMAIL, DeliveryMethod.SMS)
+        }
+    channels: dict[DeliveryMethod, Channel] = {}
+    if settings.emails_enabled:
+        channels[DeliveryMethod.EMAIL] = EmailChannel()
+    if settings.SMS_GATEWAY_URL:
+        channels[DeliveryMethod.SMS] = SmsChannel(
+            str(settings.SMS_GATEWAY_URL), settings.SMS_GATEWAY_TOKEN, settings.SMS_FROM
+        )
+    return channels
+
+
+class TokenBucket:
+    """
+    `rate` acquisitions per second on average, in bursts of up to `burst`.
+    Callers reserve a token and sleep until it is theirs, so waiters are
+    served in order without polling.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+
+class RateLimiter:
+    """One token bucket per channel and one per organization."""
+
+    def __init__(
+        self, channel_rates: dict[str, float], organization_rate: float
+    ) -> None:
+        self.channels = {
+            name: TokenBucket(rate) for name, rate in channel_rates.items()
+        }
+        self.organization_rate = organization_rate
+        self.organizations: dict[uuid.UUID, TokenBucket] = {}
+
+    async def acquire(self, method: DeliveryMethod, organization_id: uuid.UUID) -> None:
+        buckets = [
+            self.organizations.setdefault(
+                organization_id, TokenBucket(self.organization_rate)
+            )
+        ]
+        if method.value in self.channels:
+            buckets.append(self.channels[method.value])
+        wait = max(bucket.reserve() for bucket in buckets)
+        if wait:
+            await asyncio.sleep(wait)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the `attempts`-th failed attempt."""
+    seconds = settings.DELIVERY_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1)
+    return timedelta(seconds=min(seconds, settings.DELIVERY_RETRY_MAX_SECONDS))
+
+
+def _deliverable(now: datetime) -> Any:
+    return and_(
+        FeedbackSession.status.in_(
+            [FeedbackSessionStatus.INITIATED, FeedbackSessionStatus.IN_PROGRESS]
+        ),
+        or_(FeedbackSession.expired_at.is_(None), FeedbackSession.expired_at > now),
+    )
+
+
+def claim_due(
+    session: Session,
+    methods: Iterable[DeliveryMethod],
+    limit: int,
+    now: datetime | None = None,
+) -> list[Invitation]:
+    """Lease up to `limit` due sessions to this worker and commit."""
+    now = now or datetime.utcnow()
+    # Sessions that were answered or expired while waiting are not sent
+    session.execute(
+        update(FeedbackSession)
+        .where(
+            FeedbackSession.next_delivery_at <= now,
+            ~_deliverable(now),
+        )
+        .values(next_delivery_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    due = (
+        select(FeedbackSession.id, FeedbackSession.created_at)
+        .where(
+            FeedbackSession.next_delivery_at <= now,
+            FeedbackSession.delivery_method.in_(list(methods)),
+            _deliverable(now),
+        )
+        .order_by(FeedbackSession.next_delivery_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = session.execute(
+        update(FeedbackSession)
+        .where(tuple_(FeedbackSession.id, FeedbackSession.created_at).in_(due))
+        .values(next_delivery_at=now + LEASE)
+        .returning(
+            FeedbackSession.id,
+            FeedbackSession.created_at,
+            FeedbackSession.appointment_id,
+            FeedbackSession.survey_template_id,
+            FeedbackSession.delivery_method,
+            FeedbackSession.completion_token,
+            FeedbackSession.delivery_attempts,
+            FeedbackSession.expired_at,
+            FeedbackSession.delivered_at,
+            FeedbackSession.reminders_sent,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not claimed:
+        session.commit()
+        return []
+
+    contacts = {
+        appointment_id: (email, phone_number, full_name)
+        for appointment_id, email, phone_number, full_name in session.execute(
+            select(Appointment.id, User.email, User.phone_number, User.full_name)
+            .join(User, User.id == Appointment.patient_id)
+            .where(Appointment.id.in_({row.appointment_id for row in claimed}))
+        )
+    }
+    organizations = dict(
+        session.execute(
+            select(SurveyTemplate.id, SurveyTemplate.organization_id).where(
+                SurveyTemplate.id.in_({row.survey_template_id for row in claimed})
+            )
+        ).all()
+    )
+    templates = load_invitation_templates(session, organizations)
+    session.commit()
+    invitations = [
+        Invitation(
+            session_id=row.id,
+            created_at=row.created_at,
+            organization_id=organizations[row.survey_template_id],
+            survey_template_id=row.survey_template_id,
+            method=row.delivery_method,
+            completion_token=row.completion_token,
+            attempts=row.delivery_attempts,
+            email=contact[0],
+            phone_number=contact[1],
+            patient_name=contact[2],
+            expired_at=row.expired_at,
+            delivered_at=row.delivered_at,
+            reminders_sent=row.reminders_sent,
+        )
+        for row in claimed
+        for contact in [contacts.get(row.appointment_id, (None, None, None))]
+    ]
+    render_messages(invitations, templates, now)
+    return invitations
+
+
+def render_messages(
+    invitations: list[Invitation],
+    templates: dict[uuid.UUID, InvitationTemplate],
+    now: datetime,
+) -> None:
+    """
+    Render each invitation's message, one batch per template and channel,
+    and work out when its next reminder is due.
+    """
+    groups: dict[tuple[uuid.UUID, DeliveryMethod], list[Invitation]] = defaultdict(list)
+    for invitation in invitations:
+        groups[invitation.survey_template_id, invitation.method].append(invitation)
+    for (template_id, method), group in groups.items():
+        template = templates.get(template_id)
+        if template is None:
+            continue
+        recipients = []
+        for invitation in group:
+            invitation.next_reminder_at = template.reminders.next_at(
+                invitation.delivered_at or now, invitation.expired_at, now
+            )
+            recipients.append(
+                recipient(
+                    invitation.link,
+                    invitation.patient_name,
+                    invitation.expired_at,
+                    reminder=invitation.reminder,
+                    final=(
+                        invitation.reminder
+                        and template.reminders.is_final(invitation.expired_at, now)
+                    ),
+                )
+            )
+        try:
+            if method == DeliveryMethod.EMAIL:
+                rendered = template.render_emails(recipients)
+                for invitation, (subject, html) in zip(group, rendered, strict=True):
+                    invitation.subject, invitation.body = subject, html
+            else:
+                for invitation, text in zip(
+                    group, template.render_sms(recipients), strict=True
+                ):
+                    invitation.body = text
+        except TemplateError:
+            # Left without a body, the group fails and is not retried
+            logger.exception(f"Cannot render the invitation of template {template_id}")
+
+
+def record_results(
+    session: Session,
+    results: list[tuple[Invitation, DeliveryError | None]],
+    now: datetime | None = None,
+) -> None:
+    """
+    Write every send's outcome back in a single executemany. A delivered
+    message schedules the next reminder, if any; a failed one is retried
+    until it has failed DELIVERY_MAX_ATTEMPTS times.
+    """
+    if not results:
+        return
+    now = now or datetime.utcnow()
+    rows = []
+    for invitation, error in results:
+        delivered_at = invitation.delivered_at
+        reminders_sent = invitation.reminders_sent
+        if error is None:
+            next_delivery_at = invitation.next_reminder_at
+            if invitation.reminder:
+                reminders_sent += 1
+            else:
+                delivered_at = now
+        elif error.retry and invitation.failures + 1 < settings.DELIVERY_MAX_ATTEMPTS:
+            next_delivery_at = now + retry_delay(invitation.failures + 1)
+        else:
+            next_delivery_at = None
+        rows.append({
+            "b_id": invitation.session_id,
+            "b_created_at": invitation.created_at,
+            "delivery_attempts": invitation.attempts + 1,
+            "last_delivery_attempt": now,
+            "next_delivery_at": next_delivery_at,
+            "delivered_at": delivered_at,
+            "reminders_sent": reminders_sent,
+        })
+    table = FeedbackSession.__table__
+    session.execute(
+        update(table)
+        .where(
+            table.c.id == bindparam("b_id"),
+            table.c.created_at == bindparam("b_created_at"),
+        )
+        .values(
+            delivery_attempts=bindparam("delivery_attempts"),
+            last_delivery_attempt=bindparam("last_delivery_attempt"),
+            next_delivery_at=bindparam("next_delivery_at"),
+            delivered_at=bindparam("delivered_at"),
+            reminders_sent=bindparam("reminders_sent"),
+        ),
+        rows,
+    )
+    session.commit()
+
+
+class DeliveryScheduler:
+    def __init__(
+        self,
+        channels: dict[DeliveryMethod, Channel],
+        limiter: RateLimiter | None = None,
+        batch_size: int = settings.DELIVERY_BATCH_SIZE,
+        concurrency: int = settings.DELIVERY_CONCURRENCY,
+    ) -> None:
+        self.channels = channels
+        self.limiter = limiter or RateLimiter(
+            settings.DELIVERY_CHANNEL_RATE_LIMITS,
+            settings.DELIVERY_ORGANIZATION_RATE_LIMIT,
+        )
+        self.batch_size = batch_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def _send(self, invitation: Invitation) -> DeliveryError | None:
+        if not invitation.body:
+            return DeliveryError("invitation could not be rendered", retry=False)
+        async with self.semaphore:
+            await self.limiter.acquire(invitation.method, invitation.organization_id)
+            try:
+                await self.channels[invitation.method].send(invitation)
+            except DeliveryError as e:
+                logger.warning(f"Invitation for {invitation.session_id} failed: {e}")
+                return e
+            except Exception as e:
+                logger.exception(f"Invitation for {invitation.session_id} failed")
+                return DeliveryError(str(e))
+        return None
+
+    async def run_once(self, session: Session) -> int:
+        """Claim, send and record one batch; returns how many were claimed."""
+        invitations = claim_due(session, self.channels, self.batch_size)
+        errors = await asyncio.gather(*(self._send(i) for i in invitations))
+        record_results(session, list(zip(invitations, errors, strict=True)))
+        return len(invitations)
+
+    async def run(self, session: Session, poll_interval: float) -> None:
+        """Deliver until cancelled, sleeping only when nothing is due."""
+        while True:
+            if await self.run_once(session) < self.batch_size:
+                await asyncio.sleep(poll_interval)
+
+    async def close(self) -> None:
+        for channel in self.channels.values():
+            await channel.close()
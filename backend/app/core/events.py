@@ -0,0 +1,166 @@
+"""
+Live feedback events for dashboards.
+
+Triggers on feedbackresponse and feedbacksession NOTIFY `CHANNEL` when
+responses are inserted and when a session is completed, once per
+organization and statement:
+
+    {"event": "responses", "organization_id": "...", "count": 3, "since": "..."}
+    {"event": "session_completed", "organization_id": "...", "session_id": "...",
+     "survey_template_id": "...", "completed_at": "...", "completion_time_seconds": 95}
+
+Each API process holds a single LISTEN connection and fans notifications out
+to the streams of their organization. The new feedback behind a "responses"
+notification is loaded once, however many dashboards are watching, and
+nothing is loaded for organizations nobody is watching.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import psycopg
+
+from app.core.config import settings
+from app.core.db import psycopg_conninfo
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "feedback_events"
+
+# Silences the triggers for the rest of the transaction, for inserts that are
+# not new feedback: archive rehydration, partition row moves and the seeder
+SKIP_EVENTS = "SET LOCAL app.skip_feedback_events = on"
+
+# Loads an organization's feedback received since the given time
+FeedbackLoader = Callable[[uuid.UUID, datetime], dict[str, Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class FeedbackEvent:
+    event: str
+    data: dict[str, Any]
+
+    def encode(self) -> str:
+        """The event as a server-sent events message."""
+        return f"event: {self.event}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+# Tells a client that it missed events and should reload its dashboard
+RESYNC = FeedbackEvent("resync", {})
+
+# A stream's queue yields events, then None once the broker closes
+EventQueue = asyncio.Queue[FeedbackEvent | None]
+
+
+def _offer(queue: EventQueue, item: FeedbackEvent | None) -> None:
+    try:
+        queue.put_nowait(item)
+    except asyncio.QueueFull:
+        # The client is not keeping up: drop its backlog and have it reload
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC if item is not None else None)
+
+
+class FeedbackEventBroker:
+    """
+    Per-organization subscriptions to the feedback events of this process.
+    The LISTEN connection is opened by the first subscriber and reopened
+    after it drops, upon which every stream is told to resync.
+    """
+
+    def __init__(
+        self,
+        load_feedback: FeedbackLoader | None = None,
+        conninfo: str | None = None,
+        queue_size: int = settings.LIVE_EVENTS_QUEUE_SIZE,
+    ) -> None:
+        self.load_feedback = load_feedback
+        self.conninfo = conninfo
+        self.queue_size = queue_size
+        self.subscribers: dict[uuid.UUID, set[EventQueue]] = {}
+        self.task: asyncio.Task[None] | None = None
+        # Set while the LISTEN connection is up
+        self.listening: asyncio.Event | None = None
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, organization_id: uuid.UUID) -> AsyncIterator[EventQueue]:
+        self._start()
+        queue: EventQueue = asyncio.Queue(self.queue_size)
+        queues = self.subscribers.setdefault(organization_id, set())
+        queues.add(queue)
+        try:
+            yield queue
+        finally:
+            queues.discard(queue)
+            if not queues:
+                self.subscribers.pop(organization_id, None)
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.task is None or self.task.done() or self.task.get_loop() is not loop:
+            self.listening = asyncio.Event()
+            self.task = loop.create_task(self._listen(self.listening))
+
+    async def _listen(self, listening: asyncio.Event) -> None:
+        conninfo = self.conninfo or psycopg_conninfo()
+        reconnecting = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    conninfo, autocommit=True
+                ) as connection:
+                    await connection.execute(f"LISTEN {CHANNEL}")
+                    listening.set()
+                    if reconnecting:
+                        # Whatever was sent while nobody listened is lost
+                        self.publish_all(RESYNC)
+                    async for notify in connection.notifies():
+                        try:
+                            await self.dispatch(notify.payload)
+                        except Exception:
+                            logger.exception(f"Failed to dispatch {notify.payload!r}")
+            except psycopg.OperationalError:
+                logger.warning("Lost the feedback events connection", exc_info=True)
+            listening.clear()
+            reconnecting = True
+            await asyncio.sleep(settings.LIVE_EVENTS_RECONNECT_SECONDS)
+
+    async def dispatch(self, payload: str) -> None:
+        """Publish one notification to the streams of its organization."""
+        data = json.loads(payload)
+        organization_id = uuid.UUID(data.pop("organization_id"))
+        if not self.subscribers.get(organization_id):
+            return
+        event = data.pop("event")
+        if event == "responses" and self.load_feedback is not None:
+            since = datetime.fromisoformat(data["since"])
+            data.update(
+                await asyncio.to_thread(self.load_feedback, organization_id, since)
+            )
+        self.publish(organization_id, FeedbackEvent(event, data))
+
+    def publish(self, organization_id: uuid.UUID, event: FeedbackEvent) -> None:
+        for queue in self.subscribers.get(organization_id, ()):
+            _offer(queue, event)
+
+    def publish_all(self, event: FeedbackEvent | None) -> None:
+        for queues in self.subscribers.values():
+            for queue in queues:
+                _offer(queue, event)
+
+    async def close(self) -> None:
+        """Stop listening and end every stream."""
+        self.publish_all(None)
+        task, self.task = self.task, None
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
@@ -0,0 +1,53 @@
+"""
+SQL expressions for the answers stored in FeedbackResponse.response_value.
+
+Responses keep their answer as JSON under one of a few keys depending on the
+question type; these expressions pull out the numeric or categorical answer
+so analytics, exports and the archive rollups read them the same way.
+"""
+
+from typing import Any
+
+from sqlalchemy import case, func
+
+from app.models import FeedbackResponse
+
+# Keys inside FeedbackResponse.response_value that may carry a numeric answer
+# (rating scales, NPS scores, sliders), checked in this order.
+NUMERIC_VALUE_KEYS = ("rating", "score", "value")
+
+# Keys that may carry a categorical answer (multiple choice, yes/no).
+CATEGORICAL_VALUE_KEYS = ("choice", "answer", "value")
+
+
+def numeric_response_value(response: Any = FeedbackResponse) -> Any:
+    """
+    SQL expression for the numeric answer stored in a response's JSON value,
+    or NULL when the response has no numeric answer.
+    """
+    value = response.response_value
+    return func.coalesce(
+        *(
+            case((func.json_typeof(value[key]) == "number", value[key].as_float()))
+            for key in NUMERIC_VALUE_KEYS
+        )
+    )
+
+
+def categorical_response_value(response: Any = FeedbackResponse) -> Any:
+    """
+    SQL expression for the categorical (string or boolean) answer stored in a
+    response's JSON value, or NULL when there is none.
+    """
+    value = response.response_value
+    return func.coalesce(
+        *(
+            case(
+                (
+                    func.json_typeof(value[key]).in_(["string", "boolean"]),
+                    value[key].as_string(),
+                )
+            )
+            for key in CATEGORICAL_VALUE_KEYS
+        )
+    )
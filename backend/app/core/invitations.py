@@ -0,0 +1,318 @@
+"""
+Survey invitation and reminder messages.
+
+The email and SMS text come from `email-templates/build/survey_invitation.*`,
+branded per organization from `Organization.settings["branding"]`:
+
+    {
+        "display_name": "Riverside Clinic",  # defaults to the organization name
+        "logo_url": "https://...",
+        "primary_color": "#0b5394",
+        "signature": "The Riverside team",
+    }
+
+and worded per survey template from `SurveyTemplate.delivery_settings`:
+
+    {
+        "email_subject": "How was your visit, {{ patient_name }}?",
+        "email_message": "...",
+        "sms_message": "...",
+        "button_text": "Start the survey",
+        "reminder_subject": "...",
+        "reminder_message": "...",
+        "reminder_sms_message": "...",
+        # Hours after the invitation, and a final notice before expired_at
+        "reminders": {"after_hours": [24, 72], "final_hours_before_expiry": 24},
+    }
+
+The overrides are Jinja templates themselves, rendered with the recipient's
+`patient_name`, `organization_name` and `expires`, and `final` for the last
+reminder. Templates without `reminders` send none. Compiled messages are
+cached per (organization, template, version), so a batch of invitations
+only looks them up, never re-parses them.
+"""
+
+import logging
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import cache
+from typing import Any
+
+from jinja2 import Template, TemplateError
+from jinja2.sandbox import SandboxedEnvironment
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models import Organization, SurveyTemplate
+from app.utils import get_email_templates
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUBJECT = "{{ organization_name }} - Tell us about your visit"
+DEFAULT_MESSAGE = (
+    "Thank you for visiting {{ organization_name }}. "
+    "Please take a few minutes to tell us how it went."
+)
+DEFAULT_SMS_MESSAGE = "{{ organization_name }}: how was your visit? Tell us here:"
+DEFAULT_REMINDER_SUBJECT = (
+    "{% if final %}Last chance{% else %}Reminder{% endif %}: "
+    "tell us about your visit to {{ organization_name }}"
+)
+DEFAULT_REMINDER_MESSAGE = (
+    "We would still love to hear about your visit to {{ organization_name }}."
+    "{% if final and expires %} The survey closes on {{ expires }}.{% endif %}"
+)
+DEFAULT_REMINDER_SMS_MESSAGE = (
+    "{{ organization_name }}: {% if final %}last chance to{% else %}a reminder to{% endif %}"
+    " tell us about your visit:"
+)
+DEFAULT_BUTTON_TEXT = "Start the survey"
+DEFAULT_COLOR = "#009688"
+
+COLOR = re.compile(r"#[0-9a-fA-F]{3}([0-9a-fA-F]{3})?")
+
+# (organization id, template id, version) of one compiled invitation
+CacheKey = tuple[uuid.UUID, uuid.UUID, tuple[Any, ...]]
+
+
+@dataclass(frozen=True, slots=True)
+class ReminderCadence:
+    after: tuple[timedelta, ...] = ()
+    final_before_expiry: timedelta | None = None
+
+    @classmethod
+    def from_settings(cls, reminders: dict[str, Any] | None) -> "ReminderCadence":
+        """Parse `delivery_settings["reminders"]`. Raises ValueError if malformed."""
+        if not reminders:
+            return cls()
+        try:
+            final = reminders.get("final_hours_before_expiry")
+            return cls(
+                after=tuple(
+                    sorted(
+                        timedelta(hours=float(hours))
+                        for hours in reminders.get("after_hours", ())
+                    )
+                ),
+                final_before_expiry=timedelta(hours=float(final)) if final else None,
+            )
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid reminders {reminders!r}: {e}") from e
+
+    def final_at(self, expired_at: datetime | None) -> datetime | None:
+        if self.final_before_expiry is None or expired_at is None:
+            return None
+        return expired_at - self.final_before_expiry
+
+    def next_at(
+        self, delivered_at: datetime, expired_at: datetime | None, now: datetime
+    ) -> datetime | None:
+        """
+        When the next reminder is due after `now`, None if there is none left.
+        Reminders missed while nothing was sending are skipped, and regular
+        reminders that would land after the final notice are dropped.
+        """
+        final = self.final_at(expired_at)
+        times = [delivered_at + after for after in self.after]
+        if final is not None:
+            times = [time for time in times if time < final] + [final]
+        if expired_at is not None:
+            times = [time for time in times if time < expired_at]
+        return min((time for time in times if time > now), default=None)
+
+    def is_final(self, expired_at: datetime | None, now: datetime) -> bool:
+        final = self.final_at(expired_at)
+        return final is not None and now >= final
+
+
+@dataclass(frozen=True, slots=True)
+class InvitationTemplate:
+    subject: Template
+    message: Template
+    sms_message: Template
+    reminder_subject: Template
+    reminder_message: Template
+    reminder_sms_message: Template
+    reminders: ReminderCadence
+    # Branding shared by every recipient
+    context: dict[str, Any]
+
+    def _contexts(self, recipients: Iterable[dict[str, Any]]) -> Iterable[dict[str, Any]]:
+        for recipient in recipients:
+            yield {**self.context, **recipient}
+
+    def render_emails(self, recipients: Iterable[dict[str, Any]]) -> list[tuple[str, str]]:
+        """(subject, html) for each recipient, an invitation or a reminder."""
+        html = get_email_templates().get_template("survey_invitation.html")
+        rendered = []
+        for context in self._contexts(recipients):
+            if context["reminder"]:
+                subject, message = self.reminder_subject, self.reminder_message
+            else:
+                subject, message = self.subject, self.message
+            body = html.render(context, message=message.render(context))
+            rendered.append((subject.render(context), body))
+        return rendered
+
+    def render_sms(self, recipients: Iterable[dict[str, Any]]) -> list[str]:
+        text = get_email_templates().get_template("survey_invitation.txt")
+        return [
+            text.render(
+                context,
+                message=(
+                    self.reminder_sms_message if context["reminder"] else self.sms_message
+                ).render(context),
+            )
+            for context in self._contexts(recipients)
+        ]
+
+
+@cache
+def get_override_templates() -> SandboxedEnvironment:
+    """
+    Environment for the overrides. Organization admins write them, so they
+    are compiled in Jinja's sandbox, where attributes such as `__class__`
+    are off limits.
+    """
+    return SandboxedEnvironment(auto_reload=False)
+
+
+def _override(overrides: dict[str, Any], name: str, default: str) -> Template:
+    source = overrides.get(name)
+    if source:
+        try:
+            return get_override_templates().from_string(str(source))
+        except TemplateError:
+            logger.warning(f"Ignoring invalid {name} template", exc_info=True)
+    return get_email_templates().from_string(default)
+
+
+def compile_invitation(
+    organization_name: str,
+    branding: dict[str, Any] | None,
+    delivery_settings: dict[str, Any] | None,
+) -> InvitationTemplate:
+    branding = branding or {}
+    overrides = delivery_settings or {}
+    color = str(branding.get("primary_color") or "")
+    logo_url = str(branding.get("logo_url") or "")
+    display_name = branding.get("display_name") or organization_name
+    try:
+        reminders = ReminderCadence.from_settings(overrides.get("reminders"))
+    except ValueError:
+        logger.warning("Ignoring invalid reminders", exc_info=True)
+        reminders = ReminderCadence()
+    return InvitationTemplate(
+        subject=_override(overrides, "email_subject", DEFAULT_SUBJECT),
+        message=_override(overrides, "email_message", DEFAULT_MESSAGE),
+        sms_message=_override(overrides, "sms_message", DEFAULT_SMS_MESSAGE),
+        reminder_subject=_override(
+            overrides, "reminder_subject", DEFAULT_REMINDER_SUBJECT
+        ),
+        reminder_message=_override(
+            overrides, "reminder_message", DEFAULT_REMINDER_MESSAGE
+        ),
+        reminder_sms_message=_override(
+            overrides, "reminder_sms_message", DEFAULT_REMINDER_SMS_MESSAGE
+        ),
+        reminders=reminders,
+        context={
+            "organization_name": display_name,
+            "logo_url": logo_url if logo_url.startswith("https://") else None,
+            "primary_color": color if COLOR.fullmatch(color) else DEFAULT_COLOR,
+            "button_text": overrides.get("button_text") or DEFAULT_BUTTON_TEXT,
+            "signature": branding.get("signature") or settings.PROJECT_NAME,
+        },
+    )
+
+
+class InvitationTemplateCache:
+    """
+    Size-bounded LRU of compiled invitations. A template's version is its
+    `version` plus the `updated_at` of the template and its organization, so
+    editing the branding or the overrides compiles a fresh entry.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self.entries: OrderedDict[CacheKey, InvitationTemplate] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(
+        self,
+        key: CacheKey,
+        organization_name: str,
+        branding: dict[str, Any] | None,
+        delivery_settings: dict[str, Any] | None,
+    ) -> InvitationTemplate:
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+        compiled = compile_invitation(organization_name, branding, delivery_settings)
+        with self.lock:
+            self.entries[key] = compiled
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+invitation_templates = InvitationTemplateCache()
+
+
+def load_invitation_templates(
+    session: Session, survey_template_ids: Iterable[uuid.UUID]
+) -> dict[uuid.UUID, InvitationTemplate]:
+    """The compiled invitation of each survey template, in one query."""
+    rows = session.exec(
+        select(
+            SurveyTemplate.id,
+            SurveyTemplate.version,
+            SurveyTemplate.updated_at,
+            SurveyTemplate.delivery_settings,
+            Organization.id,
+            Organization.name,
+            Organization.updated_at,
+            Organization.settings,
+        )
+        .join(Organization, Organization.id == SurveyTemplate.organization_id)
+        .where(SurveyTemplate.id.in_(set(survey_template_ids)))
+    )
+    return {
+        template_id: invitation_templates.get(
+            (org_id, template_id, (version, template_updated_at, org_updated_at)),
+            org_name,
+            (org_settings or {}).get("branding"),
+            delivery_settings,
+        )
+        for (
+            template_id, version, template_updated_at, delivery_settings,
+            org_id, org_name, org_updated_at, org_settings,
+        ) in rows
+    }
+
+
+def recipient(
+    link: str,
+    patient_name: str | None,
+    expired_at: datetime | None,
+    reminder: bool = False,
+    final: bool = False,
+) -> dict[str, Any]:
+    """The per-recipient part of an invitation's context."""
+    return {
+        "link": link,
+        "patient_name": patient_name,
+        "expires": f"{expired_at:%B %d, %Y}" if expired_at else None,
+        "reminder": reminder,
+        "final": final,
+    }
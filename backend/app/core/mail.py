@@ -0,0 +1,119 @@
+"""
+Outbound email queue.
+
+Messages are queued and sent by a small pool of worker threads, each holding
+one persistent SMTP connection. Callers get a Future for the SMTP response,
+so request handlers return at once and bulk senders can wait for results
+while every worker sends one message after another over the same session
+instead of reconnecting, re-negotiating TLS and logging in per message.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Queued in place of a message to stop one worker
+_STOP = None
+
+
+def smtp_options() -> dict[str, Any]:
+    options: dict[str, Any] = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
+    if settings.SMTP_TLS:
+        options["tls"] = True
+    elif settings.SMTP_SSL:
+        options["ssl"] = True
+    if settings.SMTP_USER:
+        options["user"] = settings.SMTP_USER
+    if settings.SMTP_PASSWORD:
+        options["password"] = settings.SMTP_PASSWORD
+    return options
+
+
+class Mailer:
+    """
+    A queue of outbound messages drained by `workers` threads. Workers start
+    on the first submit and close their connection after `idle_timeout`
+    seconds without mail, before the server drops it.
+    """
+
+    def __init__(
+        self,
+        options: dict[str, Any] | None = None,
+        workers: int = settings.SMTP_POOL_SIZE,
+        idle_timeout: float = settings.SMTP_IDLE_TIMEOUT_SECONDS,
+    ) -> None:
+        self.options = options
+        self.workers = workers
+        self.idle_timeout = idle_timeout
+        self.queue: queue.Queue[tuple[Any, str, Future[Any]] | None] = queue.Queue()
+        self.threads: list[threading.Thread] = []
+        self.lock = threading.Lock()
+
+    def submit(self, message: Any, email_to: str) -> Future[Any]:
+        """Queue an `emails.Message`; the Future resolves to the SMTP response."""
+        future: Future[Any] = Future()
+        self._start()
+        self.queue.put((message, email_to, future))
+        return future
+
+    def _start(self) -> None:
+        with self.lock:
+            if self.threads:
+                return
+            from emails.backend.smtp import SMTPBackend  # type: ignore
+
+            options = self.options or smtp_options()
+            for number in range(self.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(SMTPBackend(**options),),
+                    name=f"mailer-{number}",
+                    daemon=True,
+                )
+                thread.start()
+                self.threads.append(thread)
+
+    def _work(self, backend: Any) -> None:
+        try:
+            while True:
+                try:
+                    item = self.queue.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    backend.close()
+                    continue
+                if item is _STOP:
+                    return
+                message, email_to, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    response = message.send(to=email_to, smtp=backend)
+                except Exception as e:
+                    # Logged here too, as most callers don't wait for the result
+                    logger.exception(f"Failed to send email to {email_to}")
+                    # A broken connection is reopened for the next message
+                    backend.close()
+                    future.set_exception(e)
+                    continue
+                logger.info(f"send email result: {response}")
+                future.set_result(response)
+        finally:
+            backend.close()
+
+    def close(self) -> None:
+        """Send everything still queued, then stop the workers."""
+        with self.lock:
+            for _ in self.threads:
+                self.queue.put(_STOP)
+            for thread in self.threads:
+                thread.join()
+            self.threads = []
+
+
+mailer = Mailer()
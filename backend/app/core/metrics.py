@@ -0,0 +1,255 @@
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Longest statement text shown in the Server-Timing header
+SLOWEST_STATEMENT_PREVIEW = 120
+
+
+@dataclass
+class RequestMetrics:
+    """Database and serialization cost of the request being handled."""
+
+    statements: int = 0
+    db_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+    serialization_time: float = 0.0
+
+    def record_statement(self, statement: str, duration: float) -> None:
+        self.statements += 1
+        self.db_time += duration
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+    def server_timing(self, total: float, statement_preview: bool = False) -> str:
+        entries = [
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} statements"',
+            f"serialize;dur={self.serialization_time * 1000:.2f}",
+            f"total;dur={total * 1000:.2f}",
+        ]
+        if self.slowest_statement is not None:
+            slowest = f"db-slowest;dur={self.slowest_time * 1000:.2f}"
+            if statement_preview:
+                preview = " ".join(self.slowest_statement.split())
+                preview = preview[:SLOWEST_STATEMENT_PREVIEW]
+                preview = preview.replace("\\", "").replace('"', "'")
+                slowest += f';desc="{preview}"'
+            entries.insert(1, slowest)
+        return ", ".join(entries)
+
+
+_request_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+def current_request_metrics() -> RequestMetrics | None:
+    return _request_metrics.get()
+
+
+@contextmanager
+def measure_serialization() -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics = _request_metrics.get()
+        if metrics is not None:
+            metrics.serialization_time += time.perf_counter() - start
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement executed on `engine` and attribute it to the current
+    request. Statements run outside a request (scripts, startup) are ignored.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn: Any, *_args: Any) -> None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: Any, _cursor: Any, statement: str, *_args: Any
+    ) -> None:
+        duration = time.perf_counter() - conn.info["query_start_time"].pop()
+        metrics = _request_metrics.get()
+        if metrics is not None:
+            metrics.record_statement(statement, duration)
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    errors: int = 0
+    duration: float = 0.0
+    statements: int = 0
+    db_time: float = 0.0
+    serialization_time: float = 0.0
+    slowest_statement_time: float = 0.0
+
+
+class MetricsRegistry:
+    """
+    Per-route totals since process start, rendered in the Prometheus text
+    exposition format. Each worker process keeps its own registry.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], RouteStats] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        status: int,
+        duration: float,
+        metrics: RequestMetrics,
+    ) -> None:
+        with self._lock:
+            stats = self._routes.setdefault((method, route), RouteStats())
+            stats.requests += 1
+            if status >= 500:
+                stats.errors += 1
+            stats.duration += duration
+            stats.statements += metrics.statements
+            stats.db_time += metrics.db_time
+            stats.serialization_time += metrics.serialization_time
+            stats.slowest_statement_time = max(
+                stats.slowest_statement_time, metrics.slowest_time
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        families = [
+            ("http_requests_total", "counter", "Requests handled.", "requests"),
+            (
+                "http_request_errors_total",
+                "counter",
+                "Requests answered with a 5xx status.",
+                "errors",
+            ),
+            (
+                "http_request_duration_seconds_total",
+                "counter",
+                "Time spent handling requests.",
+                "duration",
+            ),
+            (
+                "db_statements_total",
+                "counter",
+                "SQL statements executed.",
+                "statements",
+            ),
+            (
+                "db_statement_duration_seconds_total",
+                "counter",
+                "Time spent executing SQL statements.",
+                "db_time",
+            ),
+            (
+                "response_serialization_seconds_total",
+                "counter",
+                "Time spent rendering response bodies.",
+                "serialization_time",
+            ),
+            (
+                "db_slowest_statement_seconds",
+                "gauge",
+                "Slowest single SQL statement seen.",
+                "slowest_statement_time",
+            ),
+        ]
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = []
+            for name, kind, help_text, attribute in families:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for (method, route), stats in routes:
+                    labels = f'method="{method}",route="{_escape_label(route)}"'
+                    lines.append(f"{name}{{{labels}}} {getattr(stats, attribute)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+def _route_label(scope: Scope) -> str:
+    # Use the route template, not the raw path, to keep label cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class QueryMetricsMiddleware:
+    """
+    Collect per-request statement counts and timings, record them per route in
+    `registry` and, when `server_timing` is set, report them to the client in a
+    `Server-Timing` header. The text of the slowest statement is only included
+    with `statement_preview`, as it exposes the schema.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        server_timing: bool = False,
+        statement_preview: bool = False,
+    ) -> None:
+        self.app = app
+        self.server_timing = server_timing
+        self.statement_preview = statement_preview
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _request_metrics.set(metrics)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        metrics.server_timing(
+                            time.perf_counter() - start, self.statement_preview
+                        ),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_metrics.reset(token)
+            registry.observe(
+                scope["method"],
+                _route_label(scope),
+                status,
+                time.perf_counter() - start,
+                metrics,
+            )
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.events import SKIP_EVENTS
+
+logger = logging.getLogger(__name__)
+
+# Tables range-partitioned by month on created_at
+PARTITIONED_TABLES = ("feedbacksession", "feedbackresponse")
+
+# Serializes partition maintenance across workers and processes
+ADVISORY_LOCK_KEY = 0x70617274  # "part"
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def _exists(connection: Connection, name: str) -> bool:
+    return connection.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}
+    ).scalar_one()
+
+
+def list_partitions(connection: Connection, table: str) -> list[str]:
+    statement = text(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = CAST(:table AS regclass)
+        ORDER BY child.relname
+        """
+    )
+    return list(connection.execute(statement, {"table": table}).scalars())
+
+
+def create_partition(connection: Connection, table: str, month: date) -> bool:
+    """
+    Create the partition of `table` holding `month`. Returns False if it
+    already exists.
+
+    Rows that landed in the default partition because their month had no
+    partition yet are moved into the new one; Postgres refuses to create a
+    partition whose range overlaps rows in the default partition. Detaching
+    the default partition also drops the triggers it inherited, so moving
+    sessions does not delete their responses. Moved responses are not new
+    feedback, so feedback events stay off for the rest of the transaction.
+    """
+    name = partition_name(table, month)
+    if _exists(connection, name):
+        return False
+    bounds = {"lower": month, "upper": add_months(month, 1)}
+    default = default_partition_name(table)
+    stray = _exists(connection, default) and connection.execute(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {default} "
+            "WHERE created_at >= :lower AND created_at < :upper)"
+        ),
+        bounds,
+    ).scalar_one()
+    if stray:
+        connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    connection.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{bounds['lower']}') TO ('{bounds['upper']}')"
+        )
+    )
+    if stray:
+        connection.execute(text(SKIP_EVENTS))
+        connection.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {default} "
+                "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+                f"INSERT INTO {table} SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        connection.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+        logger.warning(f"Moved rows from {default} into new partition {name}")
+    return True
+
+
+def ensure_partitions(
+    connection: Connection, months_ahead: int, today: date | None = None
+) -> list[str]:
+    """
+    Make sure every partitioned table has a partition for the current month
+    and the next `months_ahead` months, plus a default partition so inserts
+    never fail. Returns the names of the partitions created.
+
+    Runs under a transaction-scoped advisory lock, so concurrent callers wait
+    for each other instead of racing on the same DDL.
+    """
+    connection.execute(
+        text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY}
+    )
+    first = month_start(today or datetime.utcnow().date())
+    created = []
+    for table in PARTITIONED_TABLES:
+        for offset in range(months_ahead + 1):
+            month = add_months(first, offset)
+            if create_partition(connection, table, month):
+                created.append(partition_name(table, month))
+        default = default_partition_name(table)
+        if not _exists(connection, default):
+            connection.execute(text(f"CREATE TABLE {default} PARTITION OF {table} DEFAULT"))
+            created.append(default)
+    return created
+
+
+def detach_partition(connection: Connection, table: str, month: date) -> str:
+    """
+    Detach the partition of `table` holding `month` and return its name. The
+    rows stay in a standalone table, ready to be archived or dropped, without
+    a DELETE over the parent.
+    """
+    name = partition_name(table, month)
+    connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    return name
+
+
+def partition_month(table: str, name: str) -> date | None:
+    """The month held by partition `name` of `table`, None for the default one."""
+    suffix = name.removeprefix(f"{table}_")
+    try:
+        return datetime.strptime(suffix, "%Y_%m").date()
+    except ValueError:
+        return None
+
+
+def drop_empty_partitions(connection: Connection, table: str, before: date) -> list[str]:
+    """
+    Drop the partitions of `table` for months before `before` that hold no
+    rows, e.g. once their sessions have been archived. Dropping a partition
+    returns its space at once, where deleting rows leaves it to VACUUM.
+    """
+    dropped = []
+    for name in list_partitions(connection, table):
+        month = partition_month(table, name)
+        if month is None or add_months(month, 1) > before:
+            continue
+        if connection.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar_one():
+            continue
+        detach_partition(connection, table, month)
+        connection.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+async def maintain_partitions(engine: Engine, months_ahead: int, interval: float) -> None:
+    """Call `ensure_partitions` now and then every `interval` seconds."""
+    while True:
+        try:
+            created = await asyncio.to_thread(_ensure, engine, months_ahead)
+            if created:
+                logger.info(f"Created partitions {', '.join(created)}")
+        except Exception:
+            logger.exception("Partition maintenance failed")
+        await asyncio.sleep(interval)
+
+
+def _ensure(engine: Engine, months_ahead: int) -> list[str]:
+    with engine.begin() as connection:
+        return ensure_partitions(connection, months_ahead)
@@ -0,0 +1,308 @@
+"""
+Turning appointments into feedback sessions from survey template triggers.
+
+A template's `triggers` holds its rule; every key is optional and a rule
+matches when all the keys it has match:
+
+    {
+        "appointment_types": ["Annual physical"],  # any of these types
+        "diagnosis_codes": ["E11", "I10"],  # any code starting with these
+        "provider_ids": ["<uuid>"],  # any of these providers
+        "statuses": ["completed"],  # appointment statuses, default completed
+        "expires_in_days": 7,
+        "priority": 0,  # the highest priority wins when several match
+    }
+
+Templates with empty triggers are only used for sessions created by hand.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import exists, func, insert, text
+from sqlmodel import Session, select
+
+from app.core.cache import cache, org_feedback_tag
+from app.models import (
+    Appointment,
+    DeliveryMethod,
+    FeedbackSession,
+    FeedbackSessionStatus,
+    SurveyTemplate,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+# First key of the advisory locks taken per organization by trigger_batch
+ADVISORY_LOCK_CLASS = 0x74726967  # "trig"
+
+DEFAULT_STATUSES = frozenset({"completed"})
+DEFAULT_EXPIRES_IN_DAYS = 7
+
+
+@dataclass(frozen=True, slots=True)
+class TriggerRule:
+    template_id: uuid.UUID
+    organization_id: uuid.UUID
+    appointment_types: frozenset[str] | None
+    diagnosis_prefixes: tuple[str, ...] | None
+    provider_ids: frozenset[uuid.UUID] | None
+    statuses: frozenset[str]
+    expires_in_days: int
+    priority: int
+    delivery_method: DeliveryMethod | None
+
+    @property
+    def rank(self) -> tuple[int, int]:
+        """Higher priority first, then the rule with more conditions."""
+        conditions = sum(
+            condition is not None
+            for condition in (
+                self.appointment_types, self.diagnosis_prefixes, self.provider_ids
+            )
+        )
+        return self.priority, conditions
+
+    @classmethod
+    def from_template(
+        cls,
+        template_id: uuid.UUID,
+        organization_id: uuid.UUID,
+        triggers: dict[str, Any] | None,
+        delivery_settings: dict[str, Any] | None = None,
+    ) -> "TriggerRule | None":
+        """The template's rule, None if it has none. Raises ValueError if malformed."""
+        if not triggers:
+            return None
+        try:
+            provider_ids = triggers.get("provider_ids")
+            method = (delivery_settings or {}).get("method")
+            return cls(
+                template_id=template_id,
+                organization_id=organization_id,
+                appointment_types=_lowered(triggers.get("appointment_types")),
+                diagnosis_prefixes=(
+                    tuple(code.upper() for code in triggers["diagnosis_codes"])
+                    if triggers.get("diagnosis_codes")
+                    else None
+                ),
+                provider_ids=(
+                    frozenset(uuid.UUID(str(value)) for value in provider_ids)
+                    if provider_ids
+                    else None
+                ),
+                statuses=_lowered(triggers.get("statuses")) or DEFAULT_STATUSES,
+                expires_in_days=int(
+                    triggers.get("expires_in_days", DEFAULT_EXPIRES_IN_DAYS)
+                ),
+                priority=int(triggers.get("priority", 0)),
+                delivery_method=DeliveryMethod(method.lower()) if method else None,
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid triggers for template {template_id}: {e}") from e
+
+    def matches(
+        self,
+        diagnosis_codes: Sequence[str] | None,
+        provider_id: uuid.UUID,
+        status: str,
+    ) -> bool:
+        """Whether the rule matches; the appointment type is checked by the index."""
+        if status not in self.statuses:
+            return False
+        if self.provider_ids is not None and provider_id not in self.provider_ids:
+            return False
+        if self.diagnosis_prefixes is not None:
+            return any(
+                code.upper().startswith(self.diagnosis_prefixes)
+                for code in diagnosis_codes or ()
+            )
+        return True
+
+
+def _lowered(values: Iterable[str] | None) -> frozenset[str] | None:
+    return frozenset(value.lower() for value in values) if values else None
+
+
+class TriggerIndex:
+    """
+    One organization's rules, bucketed by appointment type and sorted by rank,
+    so matching an appointment only walks the rules that could apply.
+    """
+
+    def __init__(self, rules: Iterable[TriggerRule]) -> None:
+        buckets: dict[str | None, list[TriggerRule]] = defaultdict(list)
+        for rule in rules:
+            for appointment_type in rule.appointment_types or (None,):
+                buckets[appointment_type].append(rule)
+        for bucket in buckets.values():
+            bucket.sort(key=lambda rule: rule.rank, reverse=True)
+        self.buckets = dict(buckets)
+        self.statuses = frozenset().union(
+            *(rule.statuses for bucket in self.buckets.values() for rule in bucket)
+        )
+
+    def match(
+        self,
+        appointment_type: str | None,
+        diagnosis_codes: Sequence[str] | None,
+        provider_id: uuid.UUID,
+        status: str | None,
+    ) -> TriggerRule | None:
+        """The best ranked rule matching the appointment, if any."""
+        status = (status or "").lower()
+        best = None
+        candidates = [self.buckets.get(None, [])]
+        if appointment_type:
+            candidates.append(self.buckets.get(appointment_type.lower(), []))
+        for bucket in candidates:
+            for rule in bucket:
+                if best is not None and rule.rank <= best.rank:
+                    break
+                if rule.matches(diagnosis_codes, provider_id, status):
+                    best = rule
+                    break
+        return best
+
+
+def load_trigger_indexes(
+    session: Session, organization_id: uuid.UUID | None = None
+) -> dict[uuid.UUID, TriggerIndex]:
+    """Index the rules of every active template, one index per organization."""
+    statement = select(
+        SurveyTemplate.id,
+        SurveyTemplate.organization_id,
+        SurveyTemplate.triggers,
+        SurveyTemplate.delivery_settings,
+    ).where(SurveyTemplate.active)
+    if organization_id is not None:
+        statement = statement.where(SurveyTemplate.organization_id == organization_id)
+    rules: dict[uuid.UUID, list[TriggerRule]] = defaultdict(list)
+    for template_id, org_id, triggers, delivery_settings in session.exec(statement):
+        try:
+            rule = TriggerRule.from_template(
+                template_id, org_id, triggers, delivery_settings
+            )
+        except ValueError:
+            logger.warning("Skipping survey template with invalid triggers", exc_info=True)
+            continue
+        if rule is not None:
+            rules[org_id].append(rule)
+    return {org_id: TriggerIndex(org_rules) for org_id, org_rules in rules.items()}
+
+
+def trigger_batch(
+    session: Session,
+    indexes: dict[uuid.UUID, TriggerIndex],
+    since: datetime,
+    after: uuid.UUID | None = None,
+    limit: int = 5000,
+) -> tuple[int, int, uuid.UUID | None]:
+    """
+    Match one batch of appointments updated since `since` that have no
+    session yet, ordered by id after `after`, and insert a session for each
+    match in one statement. Returns (appointments scanned, sessions created,
+    last appointment id); the id is None once there is nothing left.
+
+    Runs can overlap: each batch holds an advisory lock per organization
+    until it commits, so a run waits for the sessions of another before
+    looking for appointments without one.
+    """
+    if not indexes:
+        return 0, 0, None
+    lock_organizations(session, indexes)
+    statuses = frozenset().union(*(index.statuses for index in indexes.values()))
+    statement = (
+        select(
+            Appointment.id,
+            Appointment.appointment_type,
+            Appointment.diagnosis_codes,
+            Appointment.provider_id,
+            Appointment.status,
+            User.organization_id,
+        )
+        .join(User, User.id == Appointment.provider_id)
+        .where(
+            User.organization_id.in_(list(indexes)),
+            Appointment.updated_at >= since,
+            func.lower(Appointment.status).in_(statuses),
+            ~exists().where(FeedbackSession.appointment_id == Appointment.id),
+        )
+        .order_by(Appointment.id)
+        .limit(limit)
+        .with_for_update(of=Appointment, skip_locked=True)
+    )
+    if after is not None:
+        statement = statement.where(Appointment.id > after)
+    appointments = session.exec(statement).all()
+    if not appointments:
+        session.rollback()
+        return 0, 0, None
+
+    now = datetime.utcnow()
+    rows = []
+    organization_ids = set()
+    for appointment_id, appointment_type, codes, provider_id, status, org_id in appointments:
+        rule = indexes[org_id].match(appointment_type, codes, provider_id, status)
+        if rule is None:
+            continue
+        organization_ids.add(org_id)
+        rows.append({
+            "id": uuid.uuid4(),
+            "appointment_id": appointment_id,
+            "survey_template_id": rule.template_id,
+            "completion_token": uuid.uuid4(),
+            "status": FeedbackSessionStatus.INITIATED,
+            "delivery_method": rule.delivery_method,
+            "delivery_attempts": 0,
+            "next_delivery_at": now if rule.delivery_method else None,
+            "reminders_sent": 0,
+            "initiated_at": now,
+            "expired_at": now + timedelta(days=rule.expires_in_days),
+            "created_at": now,
+        })
+    if rows:
+        session.execute(insert(FeedbackSession.__table__), rows)
+    session.commit()
+    cache.invalidate(*(org_feedback_tag(org_id) for org_id in organization_ids))
+    return len(appointments), len(rows), appointments[-1][0]
+
+
+def lock_organizations(session: Session, organization_ids: Iterable[uuid.UUID]) -> None:
+    """
+    Take trigger_batch's advisory lock on each organization until the
+    transaction ends. Row locks alone would let a run that started before
+    another committed miss that run's sessions and insert duplicates.
+    """
+    # Always in the same order, so runs over several organizations can't deadlock
+    for organization_id in sorted(organization_ids):
+        session.execute(
+            text("SELECT pg_advisory_xact_lock(:class, hashtext(:id))"),
+            {"class": ADVISORY_LOCK_CLASS, "id": str(organization_id)},
+        )
+
+
+def run_triggers(
+    session: Session,
+    since: datetime,
+    organization_id: uuid.UUID | None = None,
+    batch_size: int = 5000,
+) -> tuple[int, int]:
+    """Run every batch; returns (appointments scanned, sessions created)."""
+    indexes = load_trigger_indexes(session, organization_id)
+    scanned = created = 0
+    after = None
+    while True:
+        batch_scanned, batch_created, after = trigger_batch(
+            session, indexes, since, after, batch_size
+        )
+        if after is None:
+            return scanned, created
+        scanned += batch_scanned
+        created += batch_created
@@ -1,8 +1,17 @@
 import uuid
+from datetime import datetime
 from typing import Any
 
+from sqlalchemy import event
 from sqlmodel import Session, select
 
+from app.core.cache import (
+    RESPONSE_TYPES_TAG,
+    cache,
+    org_feedback_tag,
+    org_tag,
+    template_tag,
+)
 from app.core.security import get_password_hash, verify_password
 from app.models import (
     # Existing models
@@ -120,6 +129,9 @@ def get_survey_templates_by_organization(*, session: Session, organization_id: u
 # Feedback Session CRUD operations
 def create_feedback_session(*, session: Session, feedback_session_create: FeedbackSessionCreate) -> FeedbackSession:
     db_obj = FeedbackSession.model_validate(feedback_session_create)
+    # Picked up by the delivery scheduler
+    if db_obj.delivery_method and db_obj.next_delivery_at is None:
+        db_obj.next_delivery_at = datetime.utcnow()
     session.add(db_obj)
     session.commit()
     session.refresh(db_obj)
@@ -215,3 +227,73 @@ def get_all_feedback_response_types(*, session: Session, active_only: bool = Tru
     if active_only:
         statement = statement.where(FeedbackResponseType.active == True)
     return list(session.exec(statement).all())
+
+
+# Cache invalidation
+#
+# Every flush records the cache tags of the rows it wrote; the tags are
+# invalidated once the transaction commits and discarded on rollback. Hooking
+# the session covers both the functions above and routes that write directly.
+def cache_tags_for(session: Session, objects: list[Any]) -> set[str]:
+    tags: set[str] = set()
+    feedback_session_ids = set()
+    survey_template_ids = set()
+    for obj in objects:
+        # Deletes cascade to feedback in the database, so the ORM never sees
+        # the sessions and responses that went with them
+        deleted = obj in session.deleted
+        if isinstance(obj, Organization):
+            tags.add(org_tag(obj.id))
+            if deleted:
+                tags.add(org_feedback_tag(obj.id))
+        elif isinstance(obj, SurveyTemplate):
+            tags.update((template_tag(obj.id), org_tag(obj.organization_id)))
+            if deleted:
+                tags.add(org_feedback_tag(obj.organization_id))
+        elif isinstance(obj, User) and deleted and obj.organization_id:
+            tags.add(org_feedback_tag(obj.organization_id))
+        elif isinstance(obj, FeedbackSession) and deleted:
+            survey_template_ids.add(obj.survey_template_id)
+        elif isinstance(obj, FeedbackResponseType):
+            tags.add(RESPONSE_TYPES_TAG)
+        elif isinstance(obj, FeedbackResponse):
+            feedback_session_ids.add(obj.session_id)
+    if survey_template_ids:
+        statement = (
+            select(SurveyTemplate.organization_id)
+            .where(SurveyTemplate.id.in_(survey_template_ids))
+            .distinct()
+        )
+        for organization_id in session.connection().execute(statement).scalars():
+            tags.add(org_feedback_tag(organization_id))
+    if feedback_session_ids:
+        statement = (
+            select(SurveyTemplate.organization_id)
+            .join(FeedbackSession, FeedbackSession.survey_template_id == SurveyTemplate.id)
+            .where(FeedbackSession.id.in_(feedback_session_ids))
+            .distinct()
+        )
+        for organization_id in session.connection().execute(statement).scalars():
+            tags.add(org_feedback_tag(organization_id))
+    return tags
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_cache_tags(session: Session, _flush_context: Any) -> None:
+    objects = [*session.new, *session.dirty, *session.deleted]
+    if objects:
+        session.info.setdefault("cache_tags", set()).update(
+            cache_tags_for(session, objects)
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cache_tags(session: Session) -> None:
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        cache.invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_cache_tags(session: Session) -> None:
+    session.info.pop("cache_tags", None)
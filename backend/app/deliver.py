@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+import logging
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.delivery import DeliveryScheduler, build_channels
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def init(once: bool = False) -> int:
+    channels = build_channels()
+    if not channels:
+        logger.warning("No delivery channel is configured, nothing to send")
+        return 0
+    scheduler = DeliveryScheduler(channels)
+    try:
+        with Session(engine) as session:
+            if once:
+                return await scheduler.run_once(session)
+            await scheduler.run(session, settings.DELIVERY_POLL_INTERVAL_SECONDS)
+            return 0
+    finally:
+        await scheduler.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Send due survey invitations by email and SMS."
+    )
+    parser.add_argument(
+        "--once", action="store_true",
+        help="send one batch and exit instead of polling",
+    )
+    args = parser.parse_args()
+
+    logger.info(f"Delivering invitations with the {settings.DELIVERY_BACKEND} backend")
+    sent = asyncio.run(init(args.once))
+    if args.once:
+        logger.info(f"Processed {sent} invitations")
+
+
+if __name__ == "__main__":
+    main()
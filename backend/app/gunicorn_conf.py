@@ -0,0 +1,53 @@
+"""
+Production server settings, read from Settings:
+
+    gunicorn -c app/gunicorn_conf.py app.main:app
+
+The master imports the app and runs app.main.warm_up before forking, so
+workers start with warm caches and share the loaded code and data
+copy-on-write. `kill -HUP <master>` replaces the workers gracefully; as the
+app is preloaded, picking up new code needs a restart.
+"""
+
+import gc
+import os
+from typing import Any
+
+from app.core.config import settings
+
+bind = f"0.0.0.0:{settings.SERVER_PORT}"
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = settings.SERVER_WORKERS or os.cpu_count() or 1
+preload_app = settings.SERVER_PRELOAD
+max_requests = settings.SERVER_MAX_REQUESTS
+max_requests_jitter = settings.SERVER_MAX_REQUESTS_JITTER
+graceful_timeout = settings.SERVER_GRACEFUL_TIMEOUT_SECONDS
+timeout = settings.SERVER_TIMEOUT_SECONDS
+keepalive = settings.SERVER_KEEPALIVE_SECONDS
+accesslog = "-"
+
+
+def when_ready(_server: Any) -> None:
+    if not preload_app:
+        return
+    from app.core.cache import cache
+    from app.main import warm_up
+
+    # Keep the warmed entries current from the start, as workers forked
+    # later copy them
+    cache.listen()
+    cache.listening.wait(10)
+    warm_up()
+    # Leave everything loaded so far to the workers untouched: collections
+    # in a worker would otherwise write to, and so copy, the shared pages
+    gc.freeze()
+
+
+def post_fork(_server: Any, _worker: Any) -> None:
+    from app.core.cache import cache
+    from app.core.db import engine
+
+    # Drop pool state inherited from the master without closing its sockets
+    engine.dispose(close=False)
+    # Hear invalidations from the start, not from the first cache read
+    cache.listen()
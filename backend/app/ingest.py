@@ -0,0 +1,251 @@
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fields of one visit, in the order of the HL7-style flat file
+FIELDS = [
+    "external_appointment_id", "appointment_date", "appointment_type",
+    "chief_complaint", "visit_duration_minutes", "status", "patient_email",
+    "provider_email", "diagnosis_codes", "diagnosis_descriptions",
+]
+
+# Only the first few rejected records are logged in full
+MAX_LOGGED_ERRORS = 20
+
+STAGING_TABLE = """
+    CREATE TEMPORARY TABLE appointment_staging (
+        line integer NOT NULL,
+        organization_id uuid NOT NULL,
+        external_appointment_id varchar(255) NOT NULL,
+        appointment_date timestamp NOT NULL,
+        appointment_type varchar(100),
+        chief_complaint text,
+        visit_duration_minutes integer,
+        status varchar(100),
+        patient_id uuid NOT NULL,
+        provider_id uuid NOT NULL,
+        diagnosis_codes varchar[],
+        diagnosis_descriptions text[]
+    ) ON COMMIT DROP
+"""
+
+MERGED_COLUMNS = [
+    "appointment_date", "appointment_type", "chief_complaint",
+    "visit_duration_minutes", "status", "patient_id", "provider_id",
+    "diagnosis_codes", "diagnosis_descriptions",
+]
+
+# External ids are unique within an organization, the provider's. The last
+# line wins when a feed repeats an external id. Rows that did not change keep
+# their updated_at, which the trigger engine reads.
+MERGE = f"""
+    INSERT INTO appointment (
+        id, organization_id, external_appointment_id, {", ".join(MERGED_COLUMNS)},
+        created_at, updated_at
+    )
+    SELECT DISTINCT ON (organization_id, external_appointment_id)
+        gen_random_uuid(), organization_id, external_appointment_id,
+        {", ".join(MERGED_COLUMNS)}, %(now)s, %(now)s
+    FROM appointment_staging
+    ORDER BY organization_id, external_appointment_id, line DESC
+    ON CONFLICT (organization_id, external_appointment_id)
+        WHERE external_appointment_id IS NOT NULL
+    DO UPDATE SET {", ".join(f"{name} = EXCLUDED.{name}" for name in MERGED_COLUMNS)},
+        updated_at = EXCLUDED.updated_at
+    WHERE ({", ".join(f"appointment.{name}" for name in MERGED_COLUMNS)})
+        IS DISTINCT FROM ({", ".join(f"EXCLUDED.{name}" for name in MERGED_COLUMNS)})
+    RETURNING xmax = 0
+"""
+
+
+def _nonblank(lines: Iterable[str]) -> Iterator[str]:
+    return (line for line in lines if line.strip())
+
+
+def _segments(lines: Iterable[str]) -> Iterator[str]:
+    return (line.rstrip("\r\n") for line in lines if line.startswith("SCH|"))
+
+
+def parse_hl7(segment: str) -> dict[str, Any]:
+    """
+    One `SCH|...` segment of an HL7 v2-style flat file: FIELDS in order,
+    '|' between fields and '~' between repeated diagnoses, dates as
+    YYYYMMDDHHMM[SS]. Segments other than SCH, such as MSH, are skipped.
+    """
+    # Trailing fields may be left off, so short segments are expected
+    record: dict[str, Any] = dict(zip(FIELDS, segment.split("|")[1:], strict=False))
+    for name in ("diagnosis_codes", "diagnosis_descriptions"):
+        record[name] = record.get(name, "").split("~")
+    date = record.get("appointment_date", "")
+    record["appointment_date"] = datetime.strptime(
+        date, "%Y%m%d%H%M%S" if len(date) == 14 else "%Y%m%d%H%M"
+    )
+    return record
+
+
+# Per format: how to split the input into records, and how to parse one.
+# CSV has a header row naming FIELDS, NDJSON has one object per line; both
+# may give diagnoses as ';'-separated strings.
+FORMATS: dict[str, tuple[Callable[[Iterable[str]], Iterable[Any]], Callable[[Any], dict[str, Any]]]] = {
+    "csv": (csv.DictReader, dict),
+    "ndjson": (_nonblank, json.loads),
+    "hl7": (_segments, parse_hl7),
+}
+
+
+def _text(record: dict[str, Any], name: str) -> str | None:
+    value = record.get(name)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _list(record: dict[str, Any], name: str) -> list[str]:
+    value = record.get(name) or []
+    if isinstance(value, str):
+        value = value.split(";")
+    return [item.strip() for item in value if item and item.strip()]
+
+
+def _date(value: Any) -> datetime:
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).strip())
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def staging_row(
+    line: int,
+    record: dict[str, Any],
+    users: dict[str, tuple[uuid.UUID, uuid.UUID | None]],
+) -> tuple[Any, ...]:
+    """The staging row for one record. Raises ValueError if it cannot be imported."""
+    external_id = _text(record, "external_appointment_id")
+    if not external_id:
+        raise ValueError("missing external_appointment_id")
+    emails = {}
+    for name in ("patient_email", "provider_email"):
+        emails[name] = (_text(record, name) or "").lower()
+        if emails[name] not in users:
+            raise ValueError(f"unknown {name} {emails[name]!r}")
+    patient_id, _ = users[emails["patient_email"]]
+    # The external id belongs to the provider's organization
+    provider_id, organization_id = users[emails["provider_email"]]
+    if organization_id is None:
+        raise ValueError(f"provider_email {emails['provider_email']!r} has no organization")
+    if not record.get("appointment_date"):
+        raise ValueError("missing appointment_date")
+    minutes = _text(record, "visit_duration_minutes")
+    return (
+        line,
+        organization_id,
+        external_id,
+        _date(record["appointment_date"]),
+        _text(record, "appointment_type"),
+        _text(record, "chief_complaint"),
+        int(minutes) if minutes else None,
+        (_text(record, "status") or "").lower() or None,
+        patient_id,
+        provider_id,
+        _list(record, "diagnosis_codes"),
+        _list(record, "diagnosis_descriptions"),
+    )
+
+
+def load_users(
+    cursor: Any, organization_id: uuid.UUID | None
+) -> dict[str, tuple[uuid.UUID, uuid.UUID | None]]:
+    """
+    Lower-cased email -> (user id, organization id), limited to one
+    organization if given.
+    """
+    if organization_id is None:
+        cursor.execute("SELECT lower(email), id, organization_id FROM users")
+    else:
+        cursor.execute(
+            "SELECT lower(email), id, organization_id FROM users"
+            " WHERE organization_id = %(id)s",
+            {"id": organization_id},
+        )
+    return {email: (user_id, org_id) for email, user_id, org_id in cursor.fetchall()}
+
+
+def ingest(
+    lines: Iterable[str], format: str, organization_id: uuid.UUID | None = None
+) -> dict[str, int]:
+    """
+    Stream the records in `lines` into a COPY to a staging table, then merge
+    them into appointment on the provider's organization and
+    external_appointment_id in the same transaction.
+    """
+    totals = {"read": 0, "rejected": 0, "inserted": 0, "updated": 0, "unchanged": 0}
+    start = time.perf_counter()
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        users = load_users(cursor, organization_id)
+        cursor.execute(STAGING_TABLE)
+        split, parse = FORMATS[format]
+        staged: set[tuple[uuid.UUID, str]] = set()
+        with cursor.copy("COPY appointment_staging FROM STDIN") as copy:
+            for line, raw in enumerate(split(lines), 1):
+                totals["read"] += 1
+                try:
+                    row = staging_row(line, parse(raw), users)
+                except (AttributeError, KeyError, TypeError, ValueError) as e:
+                    totals["rejected"] += 1
+                    if totals["rejected"] <= MAX_LOGGED_ERRORS:
+                        logger.warning(f"Rejected record {line}: {e}")
+                    continue
+                copy.write_row(row)
+                staged.add((row[1], row[2]))
+        cursor.execute(MERGE, {"now": datetime.utcnow()})
+        for (inserted,) in cursor.fetchall():
+            totals["inserted" if inserted else "updated"] += 1
+        totals["unchanged"] = len(staged) - totals["inserted"] - totals["updated"]
+        connection.commit()
+    finally:
+        connection.close()
+    logger.info(
+        f"Imported {totals['read']} records in {time.perf_counter() - start:.1f}s: "
+        f"{totals['inserted']} new, {totals['updated']} updated, "
+        f"{totals['unchanged']} unchanged, {totals['rejected']} rejected"
+    )
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Import appointments from an EHR extract, upserting on external id."
+    )
+    parser.add_argument("path", help="file to import, or - for stdin")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+    parser.add_argument(
+        "--organization-id", type=uuid.UUID,
+        help="only resolve patients and providers within this organization",
+    )
+    args = parser.parse_args()
+
+    if args.path == "-":
+        ingest(sys.stdin, args.format, args.organization_id)
+        return
+    with open(args.path, newline="", encoding="utf-8") as file:
+        ingest(file, args.format, args.organization_id)
+
+
+if __name__ == "__main__":
+    main()
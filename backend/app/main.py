@@ -1,10 +1,25 @@
-import sentry_sdk
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
+from sqlalchemy.orm import configure_mappers
+from sqlmodel import Session, select
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
+from app.api.responses import ORJSONResponse
+from app.api.routes.analytics import feedback_events
+from app.api.routes.feedback_response_types import cached_active_response_types
+from app.api.routes.survey_templates import cached_survey_template
+from app.core.cache import cache
 from app.core.config import settings
+from app.core.db import engine
+from app.core.mail import mailer
+from app.core.metrics import QueryMetricsMiddleware
+from app.core.partitions import maintain_partitions
+from app.models import SurveyTemplate
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -12,12 +27,41 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 
 
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
+    # Imported only when enabled; it is among the slowest imports at boot
+    import sentry_sdk
+
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+
+@contextlib.asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # Keep future monthly partitions in place for long-running deployments
+    task = None
+    if settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS > 0:
+        task = asyncio.create_task(
+            maintain_partitions(
+                engine,
+                settings.PARTITION_MONTHS_AHEAD,
+                settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+            )
+        )
+    yield
+    # End live streams so they don't hold up the shutdown
+    await feedback_events.close()
+    # Send queued emails before the process exits
+    await asyncio.to_thread(mailer.close)
+    if task is not None:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -30,4 +74,48 @@ if settings.all_cors_origins:
         allow_headers=["*"],
     )
 
+# Per-route query counts and timings; echoed to clients outside production,
+# with the slowest statement's SQL only in local development
+app.add_middleware(
+    QueryMetricsMiddleware,
+    server_timing=settings.ENVIRONMENT != "production",
+    statement_preview=settings.ENVIRONMENT == "local",
+)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
+
+
+# Most recently edited active templates loaded by warm_up
+WARM_UP_TEMPLATES = 1000
+
+
+def warm_up() -> None:
+    """
+    Build what every worker would otherwise build on its first requests: the
+    mapper configuration, the OpenAPI schema, the response types, and the
+    active survey templates with their compiled invitations. A preforking
+    server calls this once in the master, before forking.
+
+    While invalidations are broadcast, the cached entries are kept for
+    CACHE_WARM_TTL_SECONDS, so workers forked later inherit them too;
+    otherwise they expire after the usual TTL and only help the first
+    requests.
+    """
+    from app.core.invitations import load_invitation_templates
+
+    ttl = settings.CACHE_WARM_TTL_SECONDS if cache.broadcasting else None
+    configure_mappers()
+    app.openapi()
+    with Session(engine) as session:
+        cached_active_response_types(session, skip=0, limit=100, ttl=ttl)
+        template_ids = session.exec(
+            select(SurveyTemplate.id)
+            .where(SurveyTemplate.active)
+            .order_by(SurveyTemplate.updated_at.desc())
+            .limit(WARM_UP_TEMPLATES)
+        ).all()
+        for template_id in template_ids:
+            cached_survey_template(session, template_id, ttl=ttl)
+        load_invitation_templates(session, template_ids)
+    # Forked workers must not share the master's connections
+    engine.dispose()
@@ -5,7 +5,8 @@ from enum import Enum
 
 from pydantic import EmailStr
 from sqlmodel import Field, Relationship, SQLModel, JSON, Column
-from sqlalchemy import ARRAY, String, Text, LargeBinary
+from sqlalchemy import ARRAY, BigInteger, DateTime, Index, String, Text, LargeBinary, text
+from sqlalchemy.dialects.postgresql import JSONB
 
 
 # Shared properties for Item
@@ -25,7 +26,9 @@ class ItemUpdate(SQLModel):
 
 class Item(ItemBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    owner_id: uuid.UUID = Field(foreign_key="users.id", nullable=False)
+    owner_id: uuid.UUID = Field(
+        foreign_key="users.id", ondelete="CASCADE", nullable=False, index=True
+    )
 
     # Relationship
     owner: "User" = Relationship(back_populates="items")
@@ -95,11 +98,17 @@ class Organization(OrganizationBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     settings: Optional[dict] = Field(default_factory=dict, sa_column=Column(JSON))
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
     
     # Relationships
-    users: List["User"] = Relationship(back_populates="organization", cascade_delete=True)
-    survey_templates: List["SurveyTemplate"] = Relationship(back_populates="organization", cascade_delete=True)
+    users: List["User"] = Relationship(
+        back_populates="organization", cascade_delete=True, passive_deletes=True
+    )
+    survey_templates: List["SurveyTemplate"] = Relationship(
+        back_populates="organization", cascade_delete=True, passive_deletes=True
+    )
 
 
 class OrganizationPublic(OrganizationBase):
@@ -120,6 +129,8 @@ class UserBase(SQLModel):
     full_name: Optional[str] = Field(max_length=255)
     role: Optional[str] = Field(default=None, max_length=50)
     active: bool = Field(default=True)
+    # Where SMS survey invitations go
+    phone_number: Optional[str] = Field(default=None, max_length=32)
 
 
 class UserCreate(UserBase):
@@ -140,6 +151,7 @@ class UserUpdate(SQLModel):
     organization_id: Optional[uuid.UUID] = Field(default=None)
     role: Optional[str] = Field(default=None, max_length=50)
     active: Optional[bool] = None
+    phone_number: Optional[str] = Field(default=None, max_length=32)
 
 
 class UserUpdateMe(SQLModel):
@@ -156,25 +168,37 @@ class User(UserBase, table=True):
     __tablename__ = "users"
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    organization_id: Optional[uuid.UUID] = Field(default=None, foreign_key="organization.id")
+    organization_id: Optional[uuid.UUID] = Field(
+        default=None, foreign_key="organization.id", ondelete="CASCADE", index=True
+    )
     hashed_password: str
     is_superuser: bool = Field(default=False)
     last_login: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
     
     # Relationships
     organization: Optional[Organization] = Relationship(back_populates="users")
     patient_appointments: List["Appointment"] = Relationship(
         back_populates="patient",
+        cascade_delete=True,
+        passive_deletes=True,
         sa_relationship_kwargs={"foreign_keys": "[Appointment.patient_id]"}
     )
     provider_appointments: List["Appointment"] = Relationship(
         back_populates="provider",
+        cascade_delete=True,
+        passive_deletes=True,
         sa_relationship_kwargs={"foreign_keys": "[Appointment.provider_id]"}
     )
-    created_survey_templates: List["SurveyTemplate"] = Relationship(back_populates="creator")
-    items: List["Item"] = Relationship(back_populates="owner", cascade_delete=True)
+    created_survey_templates: List["SurveyTemplate"] = Relationship(
+        back_populates="creator", passive_deletes=True
+    )
+    items: List["Item"] = Relationship(
+        back_populates="owner", cascade_delete=True, passive_deletes=True
+    )
 
 
 class UserPublic(UserBase):
@@ -220,13 +244,38 @@ class AppointmentUpdate(SQLModel):
 
 
 class Appointment(AppointmentBase, table=True):
+    __table_args__ = (
+        # EHR imports upsert on the external id within an organization (see
+        # app/ingest.py)
+        Index(
+            "ix_appointment_organization_id_external_appointment_id",
+            "organization_id",
+            "external_appointment_id",
+            unique=True,
+            postgresql_where=text("external_appointment_id IS NOT NULL"),
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    patient_id: uuid.UUID = Field(foreign_key="users.id", nullable=False)
-    provider_id: uuid.UUID = Field(foreign_key="users.id", nullable=False)
+    # The organization whose EHR the external id comes from, the provider's
+    organization_id: Optional[uuid.UUID] = Field(
+        default=None, foreign_key="organization.id", ondelete="CASCADE"
+    )
+    patient_id: uuid.UUID = Field(
+        foreign_key="users.id", ondelete="CASCADE", nullable=False, index=True
+    )
+    provider_id: uuid.UUID = Field(
+        foreign_key="users.id", ondelete="CASCADE", nullable=False, index=True
+    )
     diagnosis_codes: Optional[List[str]] = Field(default_factory=list, sa_column=Column(ARRAY(String)))
     diagnosis_descriptions: Optional[List[str]] = Field(default_factory=list, sa_column=Column(ARRAY(Text)))
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Indexed for the trigger engine, which picks up recently changed appointments
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        index=True,
+        sa_column_kwargs={"onupdate": datetime.utcnow},
+    )
     
     # Relationships
     patient: User = Relationship(
@@ -237,7 +286,9 @@ class Appointment(AppointmentBase, table=True):
         back_populates="provider_appointments",
         sa_relationship_kwargs={"foreign_keys": "[Appointment.provider_id]"}
     )
-    feedback_session: Optional["FeedbackSession"] = Relationship(back_populates="appointment")
+    feedback_session: Optional["FeedbackSession"] = Relationship(
+        back_populates="appointment", cascade_delete=True, passive_deletes=True
+    )
 
 
 class AppointmentPublic(AppointmentBase):
@@ -285,18 +336,27 @@ class SurveyTemplateUpdate(SQLModel):
 
 class SurveyTemplate(SurveyTemplateBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    organization_id: uuid.UUID = Field(foreign_key="organization.id", nullable=False)
+    organization_id: uuid.UUID = Field(
+        foreign_key="organization.id", ondelete="CASCADE", nullable=False, index=True
+    )
     questions: dict = Field(default_factory=dict, sa_column=Column(JSON))
     triggers: dict = Field(default_factory=dict, sa_column=Column(JSON))
     delivery_settings: dict = Field(default_factory=dict, sa_column=Column(JSON))
-    created_by: uuid.UUID = Field(foreign_key="users.id", nullable=False)
+    # Cleared when the creator is deleted; the template stays with its organization
+    created_by: Optional[uuid.UUID] = Field(
+        default=None, foreign_key="users.id", ondelete="SET NULL", index=True
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
     
     # Relationships
     organization: Organization = Relationship(back_populates="survey_templates")
-    creator: User = Relationship(back_populates="created_survey_templates")
-    feedback_sessions: List["FeedbackSession"] = Relationship(back_populates="survey_template")
+    creator: Optional[User] = Relationship(back_populates="created_survey_templates")
+    feedback_sessions: List["FeedbackSession"] = Relationship(
+        back_populates="survey_template", cascade_delete=True, passive_deletes=True
+    )
 
 
 class SurveyTemplatePublic(SurveyTemplateBase):
@@ -305,7 +365,7 @@ class SurveyTemplatePublic(SurveyTemplateBase):
     questions: dict
     triggers: dict
     delivery_settings: dict
-    created_by: uuid.UUID
+    created_by: Optional[uuid.UUID]
     created_at: datetime
     updated_at: datetime
 
@@ -315,6 +375,16 @@ class SurveyTemplatesPublic(SQLModel):
     count: int
 
 
+# Template as shown to respondents on the public survey page
+class SurveyTemplateRespondentPublic(SQLModel):
+    id: uuid.UUID
+    name: str
+    description: Optional[str]
+    version: int
+    questions: dict
+    updated_at: datetime
+
+
 # Feedback Response Type Models
 class FeedbackResponseTypeBase(SQLModel):
     type_name: str = Field(unique=True, max_length=100)
@@ -342,7 +412,9 @@ class FeedbackResponseType(FeedbackResponseTypeBase, table=True):
     validation_rules: dict = Field(default_factory=dict, sa_column=Column(JSON))
     display_options: dict = Field(default_factory=dict, sa_column=Column(JSON))
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
     
     # Relationships
     feedback_responses: List["FeedbackResponse"] = Relationship(back_populates="response_type")
@@ -388,25 +460,59 @@ class FeedbackSessionUpdate(SQLModel):
     completion_time_seconds: Optional[int] = None
 
 
+# Sessions and responses are range-partitioned by month on created_at (see
+# app/core/partitions.py). Postgres requires the partition key in every
+# primary key and unique constraint, so the table key is (id, created_at)
+# while the ORM still identifies rows by id alone, completion_token is only
+# indexed, and feedbackresponse.session_id is not a database foreign key; a
+# trigger deletes a session's responses along with it.
+SESSION_RESPONSES_JOIN = "FeedbackSession.id == foreign(FeedbackResponse.session_id)"
+
+
 class FeedbackSession(FeedbackSessionBase, table=True):
+    __table_args__ = (
+        # The delivery scheduler only ever scans sessions with something due
+        Index(
+            "ix_feedbacksession_next_delivery_at",
+            "next_delivery_at",
+            postgresql_where=text("next_delivery_at IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    appointment_id: uuid.UUID = Field(foreign_key="appointment.id", nullable=False)
-    survey_template_id: uuid.UUID = Field(foreign_key="surveytemplate.id", nullable=False)
-    completion_token: uuid.UUID = Field(default_factory=uuid.uuid4, unique=True)
+    appointment_id: uuid.UUID = Field(
+        foreign_key="appointment.id", ondelete="CASCADE", nullable=False, index=True
+    )
+    survey_template_id: uuid.UUID = Field(
+        foreign_key="surveytemplate.id", ondelete="CASCADE", nullable=False, index=True
+    )
+    completion_token: uuid.UUID = Field(default_factory=uuid.uuid4, index=True)
     initiated_at: datetime = Field(default_factory=datetime.utcnow)
     first_response_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     expired_at: Optional[datetime] = None
     last_delivery_attempt: Optional[datetime] = None
+    # When app/deliver.py should next send the invitation or a reminder;
+    # None once nothing is left to send, it gave up, or none was requested
+    next_delivery_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
+    reminders_sent: int = Field(default=0)
     ip_address: Optional[str] = Field(default=None, max_length=45)  # IPv6 compatible
     user_agent: Optional[str] = None
     completion_time_seconds: Optional[int] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, primary_key=True)
     
     # Relationships
     appointment: Optional["Appointment"] = Relationship(back_populates="feedback_session")
     survey_template: SurveyTemplate = Relationship(back_populates="feedback_sessions")
-    feedback_responses: List["FeedbackResponse"] = Relationship(back_populates="session", cascade_delete=True)
+    feedback_responses: List["FeedbackResponse"] = Relationship(
+        back_populates="session",
+        cascade_delete=True,
+        passive_deletes=True,
+        sa_relationship_kwargs={"primaryjoin": SESSION_RESPONSES_JOIN},
+    )
 
 
 class FeedbackSessionPublic(FeedbackSessionBase):
@@ -419,6 +525,8 @@ class FeedbackSessionPublic(FeedbackSessionBase):
     completed_at: Optional[datetime]
     expired_at: Optional[datetime]
     last_delivery_attempt: Optional[datetime]
+    delivered_at: Optional[datetime] = None
+    reminders_sent: int = 0
     completion_time_seconds: Optional[int]
     created_at: datetime
 
@@ -449,15 +557,51 @@ class FeedbackResponseUpdate(SQLModel):
 
 
 class FeedbackResponse(FeedbackResponseBase, table=True):
+    __table_args__ = (
+        # Per-question analytics filter on question_id and join on session_id
+        Index("ix_feedbackresponse_question_id_session_id", "question_id", "session_id"),
+        # Backs org/period sentiment aggregation over stored ai_analysis
+        Index(
+            "ix_feedbackresponse_created_at_sentiment",
+            "created_at",
+            "session_id",
+            text("(ai_analysis ->> 'sentiment')"),
+            postgresql_where=text("(ai_analysis ->> 'sentiment') IS NOT NULL"),
+        ),
+        # Newest-first scan of the last day's text responses, across all
+        # organizations, for the recent feedback widget
+        Index(
+            "ix_feedbackresponse_recent_text",
+            "created_at",
+            postgresql_where=text("response_text IS NOT NULL"),
+        ),
+        # Lets the incremental analysis refresh find unanalyzed text cheaply
+        Index(
+            "ix_feedbackresponse_pending_analysis",
+            "created_at",
+            postgresql_where=text(
+                "response_text IS NOT NULL "
+                "AND (ai_analysis IS NULL OR json_typeof(ai_analysis) = 'null')"
+            ),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    session_id: uuid.UUID = Field(foreign_key="feedbacksession.id", nullable=False)
+    session_id: uuid.UUID = Field(nullable=False, index=True)
     response_type_id: uuid.UUID = Field(foreign_key="feedbackresponsetype.id", nullable=False)
     response_value: dict = Field(default_factory=dict, sa_column=Column(JSON))
     ai_analysis: Optional[dict] = Field(default=None, sa_column=Column(JSON))
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=datetime.utcnow, primary_key=True)
+    # When an analysis refresh last claimed the response; see app.refresh_analysis
+    analysis_claimed_at: Optional[datetime] = None
     
     # Relationships
-    session: FeedbackSession = Relationship(back_populates="feedback_responses")
+    session: FeedbackSession = Relationship(
+        back_populates="feedback_responses",
+        sa_relationship_kwargs={"primaryjoin": SESSION_RESPONSES_JOIN},
+    )
     response_type: FeedbackResponseType = Relationship(back_populates="feedback_responses")
 
 
@@ -475,6 +619,77 @@ class FeedbackResponsesPublic(SQLModel):
     count: int
 
 
+# Wide-table (one row per session, one column per question) response export
+class FeedbackResponsePivotRow(SQLModel):
+    session_id: uuid.UUID
+    survey_template_id: uuid.UUID
+    status: FeedbackSessionStatus
+    completed_at: Optional[datetime]
+    answers: dict
+
+
+class FeedbackResponsesPivot(SQLModel):
+    question_ids: List[str]
+    data: List[FeedbackResponsePivotRow]
+    count: int
+
+
+# Shared cache storage for app.core.cache.PostgresCacheBackend
+class CacheEntry(SQLModel, table=True):
+    __tablename__ = "cacheentry"
+    __table_args__ = (
+        Index("ix_cacheentry_tags", "tags", postgresql_using="gin"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    key: str = Field(primary_key=True)
+    value: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    tags: List[str] = Field(
+        default_factory=list, sa_column=Column(ARRAY(String), nullable=False)
+    )
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
+
+
+# Completed and expired sessions moved out of the hot tables by app/archive.py.
+# The session row and its responses are kept as JSONB (TOAST-compressed), so
+# they can be rehydrated into feedbacksession/feedbackresponse unchanged.
+class FeedbackArchive(SQLModel, table=True):
+    __tablename__ = "feedbackarchive"
+
+    session_id: uuid.UUID = Field(primary_key=True)
+    organization_id: uuid.UUID = Field(index=True)
+    survey_template_id: uuid.UUID = Field(
+        foreign_key="surveytemplate.id", ondelete="CASCADE", index=True
+    )
+    created_at: datetime = Field(index=True)
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
+    session: dict = Field(sa_column=Column(JSONB, nullable=False))
+    responses: List[dict] = Field(
+        default_factory=list, sa_column=Column(JSONB, nullable=False)
+    )
+
+
+# Monthly per-template totals of archived sessions and responses, added to the
+# hot-table aggregates so all-time analytics do not change when data is archived
+class FeedbackRollup(SQLModel, table=True):
+    __tablename__ = "feedbackrollup"
+
+    survey_template_id: uuid.UUID = Field(
+        foreign_key="surveytemplate.id", ondelete="CASCADE", primary_key=True
+    )
+    month: datetime = Field(primary_key=True)
+    surveys_sent: int = 0
+    responses_received: int = 0
+    completed: int = 0
+    completion_seconds_sum: int = Field(default=0, sa_type=BigInteger)
+    completion_seconds_count: int = 0
+    responses: int = 0
+    rating_sum: float = 0.0
+    rating_count: int = 0
+
+
 # Auth Models (kept from original)
 class Message(SQLModel):
     message: str
@@ -0,0 +1,49 @@
+import argparse
+import logging
+from datetime import date
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.partitions import PARTITIONED_TABLES, detach_partition, ensure_partitions
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def init(months_ahead: int) -> list[str]:
+    with engine.begin() as connection:
+        return ensure_partitions(connection, months_ahead)
+
+
+def detach(table: str, month: date) -> str:
+    with engine.begin() as connection:
+        return detach_partition(connection, table, month)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Create upcoming monthly partitions, or detach an old one."
+    )
+    parser.add_argument(
+        "--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD
+    )
+    parser.add_argument(
+        "--detach", metavar="YYYY-MM",
+        help="detach this month's partition of --table instead",
+    )
+    parser.add_argument("--table", choices=PARTITIONED_TABLES)
+    args = parser.parse_args()
+
+    if args.detach:
+        if not args.table:
+            parser.error("--detach requires --table")
+        name = detach(args.table, date.fromisoformat(f"{args.detach}-01"))
+        logger.info(f"Detached {name}; it is now a standalone table")
+        return
+    logger.info("Creating monthly partitions")
+    created = init(args.months_ahead)
+    logger.info(f"Created {', '.join(created) or 'no new partitions'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import or_, tuple_, update
+from sqlmodel import Session, func, select
+
+from app.api.routes.analyze import analyze_with_llm
+from app.core.db import engine
+from app.models import FeedbackResponse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+batch_size = 200
+
+# Claimed responses are picked up again after this long if the refresh dies
+# or their analysis fails
+LEASE = timedelta(minutes=10)
+
+
+def pending_analysis_clause() -> Any:
+    """
+    Responses with free text whose ai_analysis has not been filled in yet.
+    Mirrors the predicate of the ix_feedbackresponse_pending_analysis index.
+    """
+    return FeedbackResponse.response_text.is_not(None) & or_(
+        FeedbackResponse.ai_analysis.is_(None),
+        func.json_typeof(FeedbackResponse.ai_analysis) == "null",
+    )
+
+
+def claim_batch(
+    session: Session, limit: int = batch_size, now: datetime | None = None
+) -> list[Any]:
+    """Lease up to `limit` pending responses to this process and commit."""
+    now = now or datetime.utcnow()
+    pending = (
+        select(FeedbackResponse.id, FeedbackResponse.created_at)
+        .where(
+            pending_analysis_clause(),
+            or_(
+                FeedbackResponse.analysis_claimed_at.is_(None),
+                FeedbackResponse.analysis_claimed_at <= now - LEASE,
+            ),
+        )
+        .order_by(FeedbackResponse.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = session.execute(
+        update(FeedbackResponse)
+        .where(tuple_(FeedbackResponse.id, FeedbackResponse.created_at).in_(pending))
+        .values(analysis_claimed_at=now)
+        .returning(
+            FeedbackResponse.id,
+            FeedbackResponse.created_at,
+            FeedbackResponse.response_text,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    session.commit()
+    return claimed
+
+
+def refresh_batch(session: Session, limit: int = batch_size) -> int:
+    """
+    Analyze one batch of not-yet-analyzed responses and store the result.
+
+    The batch is leased and committed before any analysis runs, so no row
+    stays locked during the slow LLM calls and several refresh processes can
+    run side by side without analyzing the same text twice. Each result is
+    written back on its own; a response whose analysis fails is logged and
+    retried once its lease runs out. Returns the number of responses claimed.
+    """
+    claimed = claim_batch(session, limit)
+    for response in claimed:
+        try:
+            analysis = analyze_with_llm(response.response_text or "")
+        except Exception:
+            logger.exception(f"Analysis of feedback response {response.id} failed")
+            continue
+        # Someone may have stored an analysis by hand in the meantime
+        session.execute(
+            update(FeedbackResponse)
+            .where(
+                FeedbackResponse.id == response.id,
+                FeedbackResponse.created_at == response.created_at,
+                pending_analysis_clause(),
+            )
+            .values(ai_analysis=analysis, analysis_claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+    return len(claimed)
+
+
+def init() -> int:
+    total = 0
+    with Session(engine) as session:
+        while processed := refresh_batch(session):
+            total += processed
+            logger.info(f"Analyzed {total} responses")
+    return total
+
+
+def main() -> None:
+    logger.info("Refreshing feedback response analysis")
+    total = init()
+    logger.info(f"Analysis refresh finished, {total} responses analyzed")
+
+
+if __name__ == "__main__":
+    main()
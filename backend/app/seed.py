@@ -0,0 +1,628 @@
+import argparse
+import itertools
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+from app.core.events import SKIP_EVENTS
+from app.core.partitions import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_partition,
+    month_start,
+)
+from app.core.security import get_password_hash
+from app.models import FeedbackResponseTypeCreate
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Password shared by every generated user, so seeded accounts can log in
+SEED_PASSWORD = "seedpassword"
+
+# Sessions are generated and committed in chunks of this size by default
+CHUNK_SIZE = 20_000
+
+
+@dataclass(frozen=True)
+class SeedPlan:
+    organizations: int
+    templates_per_organization: int
+    providers_per_organization: int
+    patients_per_organization: int
+    sessions: int
+    days: int = 365
+
+
+# Patient and session volume is spread over organizations by these weights,
+# so a few large health systems dominate and there is a long tail of clinics
+ORGANIZATION_SKEW = 0.8
+
+PLANS = {
+    "small": SeedPlan(2, 3, 5, 200, 2_000),
+    "medium": SeedPlan(5, 5, 20, 5_000, 100_000),
+    # 1M sessions; at the status mix below that is about 19M responses
+    "full": SeedPlan(20, 10, 50, 50_000, 1_000_000),
+    # About 60M rows in total; use --workers to spread generation over cores
+    "xl": SeedPlan(50, 10, 100, 60_000, 3_000_000, days=730),
+}
+
+# Questions of every generated template: (question_id, response type, question)
+QUESTIONS = [
+    *(
+        (f"rating_{n}", "rating", f"How would you rate aspect {n} of your visit?")
+        for n in range(1, 18)
+    ),
+    ("nps", "nps", "How likely are you to recommend us to a friend?"),
+    *(
+        (f"choice_{n}", "multiple_choice", f"Which option best describes {n}?")
+        for n in range(1, 6)
+    ),
+    ("wait_time", "multiple_choice", "How long did you wait?"),
+    ("comments", "text_input", "Anything else you would like to tell us?"),
+    ("improve", "text_input", "What could we improve?"),
+]
+
+CHOICES = ["Excellent", "Good", "Fair", "Poor"]
+
+PHRASES = {
+    "positive": [
+        "The nursing staff were kind and attentive",
+        "My doctor explained everything clearly",
+        "Great communication from the front desk",
+        "The clinic was clean and comfortable",
+    ],
+    "neutral": [
+        "The visit was fine overall",
+        "Parking was about what I expected",
+        "The doctor was on time",
+    ],
+    "negative": [
+        "The wait was far too long",
+        "Billing was confusing and I was charged twice",
+        "Nobody followed up about my results",
+        "The food was cold",
+    ],
+}
+
+TOPICS = ["nursing", "billing", "food", "wait", "cleanliness", "doctor", "communication"]
+
+# Share of sessions per status; only in-progress and completed ones have answers
+STATUS_WEIGHTS = {
+    "INITIATED": 12,
+    "IN_PROGRESS": 10,
+    "COMPLETED": 70,
+    "EXPIRED": 6,
+    "CANCELLED": 2,
+}
+
+# Sessions still open for answers belong to appointments from the last few days
+OPEN_STATUSES = ("INITIATED", "IN_PROGRESS")
+OPEN_DAYS = 6
+
+DELIVERY_METHOD_WEIGHTS = {"EMAIL": 45, "SMS": 40, "PHONE": 5, "IN_PERSON": 10}
+
+# Appointments that did not happen get no feedback session; scheduled ones
+# lie in the next few weeks
+APPOINTMENT_STATUS_WEIGHTS = {
+    "completed": 86,
+    "cancelled": 6,
+    "no_show": 4,
+    "scheduled": 4,
+}
+SCHEDULED_DAYS = 30
+
+# Clinic hours, busiest mid-morning and early afternoon
+APPOINTMENT_HOURS = list(range(8, 18))
+APPOINTMENT_HOUR_WEIGHTS = [6, 10, 12, 11, 7, 9, 11, 10, 8, 5]
+# Share of weekend appointments moved to a weekday of the same week
+WEEKEND_SHIFT = 0.85
+
+# (appointment type, chief complaint, ICD-10 code, description, minutes)
+VISITS = [
+    ("annual_physical", "Routine check-up", "Z00.00", "General adult medical examination", 30),
+    ("follow_up", "Blood pressure follow-up", "I10", "Essential hypertension", 15),
+    ("follow_up", "Diabetes management", "E11.9", "Type 2 diabetes mellitus", 20),
+    ("sick_visit", "Sore throat and fever", "J02.9", "Acute pharyngitis", 15),
+    ("sick_visit", "Cough for two weeks", "J20.9", "Acute bronchitis", 15),
+    ("sick_visit", "Lower back pain", "M54.5", "Low back pain", 20),
+    ("consultation", "Knee pain when climbing stairs", "M17.11", "Primary osteoarthritis, right knee", 30),
+    ("consultation", "Recurring headaches", "R51.9", "Headache", 30),
+    ("telehealth", "Medication refill", "Z76.0", "Issue of repeat prescription", 10),
+    ("telehealth", "Anxiety check-in", "F41.1", "Generalized anxiety disorder", 25),
+]
+VISIT_WEIGHTS = [14, 16, 10, 12, 8, 9, 6, 6, 11, 8]
+
+# Optional free-text questions are skipped by this share of respondents
+TEXT_SKIP_RATE = 0.35
+# Share of free-text answers that mention contact details
+PII_RATE = 0.03
+
+# Columns written by COPY, in the order the generators yield them
+COLUMNS = {
+    "organization": [
+        "id", "name", "type", "subscription_tier", "active", "settings",
+        "created_at", "updated_at",
+    ],
+    "users": [
+        "id", "email", "full_name", "role", "active", "organization_id",
+        "hashed_password", "is_superuser", "created_at", "updated_at",
+    ],
+    "surveytemplate": [
+        "id", "name", "description", "active", "version", "organization_id",
+        "questions", "triggers", "delivery_settings", "created_by",
+        "created_at", "updated_at",
+    ],
+    "appointment": [
+        "id", "organization_id", "external_appointment_id", "appointment_date",
+        "appointment_type", "chief_complaint", "visit_duration_minutes", "status",
+        "patient_id", "provider_id", "diagnosis_codes", "diagnosis_descriptions",
+        "created_at", "updated_at",
+    ],
+    "feedbacksession": [
+        "id", "appointment_id", "survey_template_id", "completion_token",
+        "status", "delivery_method", "delivery_attempts", "initiated_at",
+        "first_response_at", "completed_at", "expired_at",
+        "completion_time_seconds", "created_at",
+    ],
+    "feedbackresponse": [
+        "id", "session_id", "response_type_id", "question_id", "response_text",
+        "response_value", "ai_analysis", "response_time_seconds", "created_at",
+    ],
+}
+
+
+def zipf_weights(count: int, skew: float) -> list[float]:
+    """Cumulative weights giving item n a share proportional to 1 / n**skew."""
+    return list(itertools.accumulate(1 / (n + 1) ** skew for n in range(count)))
+
+
+def copy_rows(cursor: Any, table: str, rows: Iterable[tuple[Any, ...]]) -> int:
+    count = 0
+    columns = ", ".join(COLUMNS[table])
+    with cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+            count += 1
+    return count
+
+
+def ensure_response_types(session: Session) -> dict[str, uuid.UUID]:
+    type_ids = {}
+    for type_name in {question[1] for question in QUESTIONS}:
+        response_type = crud.get_feedback_response_type_by_name(
+            session=session, type_name=type_name
+        )
+        if not response_type:
+            response_type = crud.create_feedback_response_type(
+                session=session,
+                response_type_create=FeedbackResponseTypeCreate(
+                    type_name=type_name, type_category="seed"
+                ),
+            )
+        type_ids[type_name] = response_type.id
+    return type_ids
+
+
+class Seeder:
+    """
+    Bulk synthetic data generator. Rows are streamed to Postgres with COPY in
+    chunks, which is orders of magnitude faster than inserting through the ORM.
+
+    Organizations, users and templates are written first from this process;
+    sessions (with their appointments and responses) are then split over
+    `workers` processes, each streaming to its own connection.
+    """
+
+    def __init__(
+        self, plan: SeedPlan, seed: int | None = None, chunk_size: int = CHUNK_SIZE
+    ) -> None:
+        self.plan = plan
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.random = random.Random(seed)
+        self.now = datetime.utcnow()
+        self.hashed_password = get_password_hash(SEED_PASSWORD)
+        self.organizations: list[uuid.UUID] = []
+        self.organization_weights: list[float] = []
+        self.providers: dict[uuid.UUID, list[uuid.UUID]] = {}
+        self.provider_weights: dict[uuid.UUID, list[float]] = {}
+        self.patients: dict[uuid.UUID, list[uuid.UUID]] = {}
+        self.templates: dict[uuid.UUID, list[uuid.UUID]] = {}
+        self.response_types: dict[str, uuid.UUID] = {}
+
+    def run(self, workers: int = 1) -> dict[str, int]:
+        with Session(engine) as session:
+            self.response_types = ensure_response_types(session)
+        self.create_partitions()
+        totals = {"organizations": 0, "users": 0, "templates": 0}
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SET synchronous_commit = off")
+            totals["organizations"] = copy_rows(
+                cursor, "organization", self._organizations()
+            )
+            totals["users"] = copy_rows(cursor, "users", self._users())
+            totals["templates"] = copy_rows(cursor, "surveytemplate", self._templates())
+            connection.commit()
+        finally:
+            connection.close()
+        logger.info(f"Seeded {totals['users']} users in {totals['organizations']} organizations")
+
+        shares = [
+            self.plan.sessions // workers + (n < self.plan.sessions % workers)
+            for n in range(workers)
+        ]
+        if workers == 1:
+            totals.update(self.seed_sessions(self.plan.sessions))
+            return totals
+        # The engine's pooled connections must not be shared with the children
+        engine.dispose()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_seed_sessions, itertools.repeat(self), range(workers), shares)
+            for result in results:
+                for name, count in result.items():
+                    totals[name] = totals.get(name, 0) + count
+        return totals
+
+    def create_partitions(self) -> None:
+        """Monthly partitions for the whole generated history, not just recent months."""
+        month = month_start(self.now - timedelta(days=self.plan.days + 1))
+        with engine.begin() as connection:
+            while month <= self.now.date():
+                for table in PARTITIONED_TABLES:
+                    create_partition(connection, table, month)
+                month = add_months(month, 1)
+
+    def fork(self, worker: int) -> None:
+        """Give worker `worker` its own random stream, derived from the seed."""
+        self.random = random.Random(None if self.seed is None else f"{self.seed}:{worker}")
+
+    def seed_sessions(self, sessions: int, label: str = "") -> dict[str, int]:
+        totals = {"appointments": 0, "sessions": 0, "responses": 0}
+        start = time.perf_counter()
+        connection = engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            # Losing the last chunks on a crash is fine for synthetic data
+            cursor.execute("SET synchronous_commit = off")
+            remaining = sessions
+            while remaining:
+                size = min(self.chunk_size, remaining)
+                remaining -= size
+                appointments: list[tuple[Any, ...]] = []
+                session_rows: list[tuple[Any, ...]] = []
+                responses: list[tuple[Any, ...]] = []
+                self._chunk(size, appointments, session_rows, responses)
+                cursor.execute(SKIP_EVENTS)
+                totals["appointments"] += copy_rows(cursor, "appointment", appointments)
+                totals["sessions"] += copy_rows(cursor, "feedbacksession", session_rows)
+                totals["responses"] += copy_rows(cursor, "feedbackresponse", responses)
+                connection.commit()
+                rows = sum(totals.values())
+                logger.info(
+                    f"{label}Seeded {totals['sessions']}/{sessions} sessions, "
+                    f"{totals['responses']} responses "
+                    f"({rows / (time.perf_counter() - start):,.0f} rows/s)"
+                )
+        finally:
+            connection.close()
+        return totals
+
+    def _uuid(self) -> uuid.UUID:
+        # Drawn from the seeded generator so a given --seed reproduces the data
+        return uuid.UUID(int=self.random.getrandbits(128), version=4)
+
+    def _organizations(self) -> Iterator[tuple[Any, ...]]:
+        self.organization_weights = zipf_weights(
+            self.plan.organizations, ORGANIZATION_SKEW
+        )
+        for n in range(self.plan.organizations):
+            organization_id = self._uuid()
+            self.organizations.append(organization_id)
+            created_at = self.now - timedelta(days=self.plan.days + 30)
+            tier = self.random.choices(["basic", "professional", "enterprise"], (50, 35, 15))[0]
+            yield (
+                organization_id, f"Seed Clinic {n + 1}", "healthcare", tier,
+                True, "{}", created_at, created_at,
+            )
+
+    def _users(self) -> Iterator[tuple[Any, ...]]:
+        # Patient counts follow the organization weights, averaging the plan's
+        total_weight = self.organization_weights[-1] if self.organizations else 1.0
+        previous = 0.0
+        for organization_id, weight in zip(
+            self.organizations, self.organization_weights, strict=True
+        ):
+            share = (weight - previous) / total_weight
+            previous = weight
+            patients = max(
+                1,
+                round(share * self.plan.patients_per_organization * self.plan.organizations),
+            )
+            for role, count, bucket in (
+                ("admin", 2, {}),
+                ("provider", self.plan.providers_per_organization, self.providers),
+                ("patient", patients, self.patients),
+            ):
+                ids = bucket.setdefault(organization_id, [])
+                for n in range(count):
+                    user_id = self._uuid()
+                    ids.append(user_id)
+                    created_at = self.now - timedelta(
+                        days=self.random.randint(0, self.plan.days)
+                    )
+                    # A few patients have closed their account since
+                    active = role != "patient" or self.random.random() >= 0.05
+                    yield (
+                        user_id, f"{role}-{user_id.hex[:12]}@seed.example.com",
+                        f"Seed {role.title()} {n + 1}", role, active, organization_id,
+                        self.hashed_password, False, created_at, created_at,
+                    )
+            # Some providers see far more patients than others
+            self.provider_weights[organization_id] = list(itertools.accumulate(
+                self.random.lognormvariate(0, 0.6) for _ in self.providers[organization_id]
+            ))
+
+    def _templates(self) -> Iterator[tuple[Any, ...]]:
+        questions = json.dumps({
+            question_id: {"type": type_name, "question": text}
+            for question_id, type_name, text in QUESTIONS
+        })
+        for organization_id in self.organizations:
+            ids = self.templates.setdefault(organization_id, [])
+            for n in range(self.plan.templates_per_organization):
+                template_id = self._uuid()
+                ids.append(template_id)
+                created_at = self.now - timedelta(days=self.plan.days + 1)
+                yield (
+                    template_id, f"Seed Survey {n + 1}", "Generated survey", True, 1,
+                    organization_id, questions, "{}", "{}",
+                    self.providers[organization_id][0], created_at, created_at,
+                )
+
+    def _chunk(
+        self,
+        size: int,
+        appointments: list[tuple[Any, ...]],
+        sessions: list[tuple[Any, ...]],
+        responses: list[tuple[Any, ...]],
+    ) -> None:
+        """Generate `size` sessions plus the appointments that go with them."""
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(STATUS_WEIGHTS.values())
+        appointment_statuses = list(APPOINTMENT_STATUS_WEIGHTS)
+        appointment_weights = list(APPOINTMENT_STATUS_WEIGHTS.values())
+        while len(sessions) < size:
+            organization_id = self.random.choices(
+                self.organizations, cum_weights=self.organization_weights
+            )[0]
+            appointment_status = self.random.choices(
+                appointment_statuses, appointment_weights
+            )[0]
+            status = self.random.choices(statuses, weights)[0]
+            if appointment_status == "scheduled":
+                appointment_date = self._appointment_date(-SCHEDULED_DAYS)
+            else:
+                days = OPEN_DAYS if status in OPEN_STATUSES else self.plan.days
+                appointment_date = self._appointment_date(days)
+            appointment_id = self._uuid()
+            appointments.append(self._appointment(
+                appointment_id, organization_id, appointment_date, appointment_status
+            ))
+            if appointment_status == "completed":
+                sessions.append(self._session(
+                    appointment_id, organization_id, appointment_date, status, responses,
+                ))
+
+    def _appointment_date(self, days: int) -> datetime:
+        """
+        A time during clinic hours within the last `days` days, or within the
+        next `-days` days when negative. Most weekend visits move to a weekday.
+        """
+        offset = self.random.randint(min(days, 0), max(days, 0))
+        day = self.now - timedelta(days=offset)
+        if day.weekday() >= 5 and self.random.random() < WEEKEND_SHIFT:
+            day -= timedelta(days=day.weekday() - self.random.randint(0, 4))
+        hour = self.random.choices(APPOINTMENT_HOURS, APPOINTMENT_HOUR_WEIGHTS)[0]
+        date = day.replace(
+            hour=hour, minute=self.random.choice((0, 15, 30, 45)), second=0, microsecond=0
+        )
+        if days >= 0 and date > self.now:
+            date -= timedelta(days=1)
+        return date
+
+    def _appointment(
+        self,
+        appointment_id: uuid.UUID,
+        organization_id: uuid.UUID,
+        appointment_date: datetime,
+        status: str,
+    ) -> tuple[Any, ...]:
+        appointment_type, complaint, code, description, minutes = self.random.choices(
+            VISITS, VISIT_WEIGHTS
+        )[0]
+        provider_id = self.random.choices(
+            self.providers[organization_id],
+            cum_weights=self.provider_weights[organization_id],
+        )[0]
+        created_at = min(
+            appointment_date - timedelta(days=self.random.randint(1, 30)), self.now
+        )
+        return (
+            appointment_id, organization_id, f"EHR-{appointment_id.hex[:10].upper()}",
+            appointment_date, appointment_type, complaint,
+            max(5, minutes + self.random.randint(-5, 10)) if status == "completed" else None,
+            status, self.random.choice(self.patients[organization_id]), provider_id,
+            [code], [description], created_at, max(created_at, min(appointment_date, self.now)),
+        )
+
+    def _session(
+        self,
+        appointment_id: uuid.UUID,
+        organization_id: uuid.UUID,
+        appointment_date: datetime,
+        status: str,
+        responses: list[tuple[Any, ...]],
+    ) -> tuple[Any, ...]:
+        session_id = self._uuid()
+        initiated_at = min(
+            appointment_date + timedelta(hours=self.random.randint(1, 24)), self.now
+        )
+        expired_at = initiated_at + timedelta(days=7)
+        first_response_at = completed_at = completion_time = None
+        if status in ("IN_PROGRESS", "COMPLETED"):
+            # Most people answer within hours, a long tail days later
+            delay = min(self.random.expovariate(1 / 180), 6 * 1440)
+            first_response_at = min(
+                initiated_at + timedelta(minutes=1 + delay), self.now
+            )
+            answered = QUESTIONS
+            if status == "IN_PROGRESS":
+                answered = QUESTIONS[: self.random.randint(1, len(QUESTIONS) - 1)]
+            elapsed = 0
+            for question_id, type_name, _ in answered:
+                if type_name == "text_input" and self.random.random() < TEXT_SKIP_RATE:
+                    continue
+                # Free text takes much longer to answer than a click
+                if type_name == "text_input":
+                    response_time = self.random.randint(20, 240)
+                else:
+                    response_time = self.random.randint(2, 30)
+                elapsed += response_time
+                responses.append(self._response(
+                    session_id, question_id, type_name, response_time,
+                    first_response_at + timedelta(seconds=elapsed),
+                ))
+            if status == "COMPLETED":
+                completed_at = first_response_at + timedelta(seconds=elapsed)
+                completion_time = elapsed
+        return (
+            session_id, appointment_id,
+            self.random.choice(self.templates[organization_id]), self._uuid(),
+            status,
+            self.random.choices(
+                list(DELIVERY_METHOD_WEIGHTS), list(DELIVERY_METHOD_WEIGHTS.values())
+            )[0],
+            self.random.choices((1, 2, 3), (80, 15, 5))[0], initiated_at,
+            first_response_at, completed_at, expired_at, completion_time, initiated_at,
+        )
+
+    def _feedback_text(self, sentiment: str) -> tuple[str, bool]:
+        """Free text of one to three sentences, mostly in `sentiment`."""
+        sentences = self.random.sample(PHRASES[sentiment], self.random.randint(1, 2))
+        if self.random.random() < 0.3:
+            # Mixed feedback, e.g. kind staff but a long wait
+            other = self.random.choice([name for name in PHRASES if name != sentiment])
+            sentences.append(self.random.choice(PHRASES[other]))
+        pii = self.random.random() < PII_RATE
+        if pii:
+            sentences.append(
+                f"Call me at 555-{self.random.randint(100, 999)}-"
+                f"{self.random.randint(1000, 9999)}"
+            )
+        return ". ".join(sentences) + ".", pii
+
+    def _response(
+        self,
+        session_id: uuid.UUID,
+        question_id: str,
+        type_name: str,
+        response_time: int,
+        created_at: datetime,
+    ) -> tuple[Any, ...]:
+        response_text = ai_analysis = None
+        if type_name == "rating":
+            value = {"rating": self.random.choices(range(1, 6), (5, 7, 15, 35, 38))[0]}
+        elif type_name == "nps":
+            weights = (2, 1, 1, 2, 2, 5, 6, 10, 20, 25, 26)
+            value = {"score": self.random.choices(range(11), weights)[0]}
+        elif type_name == "multiple_choice":
+            value = {"choice": self.random.choices(CHOICES, (40, 35, 15, 10))[0]}
+        else:
+            value = {}
+            sentiment = self.random.choices(list(PHRASES), (55, 25, 20))[0]
+            response_text, pii = self._feedback_text(sentiment)
+            # Recent answers may not have been through the analyzer yet
+            if self.random.random() < 0.8:
+                topics = [topic for topic in TOPICS if topic in response_text.lower()]
+                ai_analysis = json.dumps({
+                    "summary": response_text.split(".")[0],
+                    "sentiment": sentiment,
+                    "topics": ",".join(topics) or None,
+                    "pii_detected": pii,
+                })
+        return (
+            self._uuid(), session_id, self.response_types[type_name], question_id,
+            response_text, json.dumps(value), ai_analysis, response_time, created_at,
+        )
+
+
+def _seed_sessions(seeder: Seeder, worker: int, sessions: int) -> dict[str, int]:
+    # Runs in a worker process
+    seeder.fork(worker)
+    return seeder.seed_sessions(sessions, label=f"[worker {worker}] ")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Bulk-load synthetic survey data with COPY."
+    )
+    parser.add_argument("--plan", choices=sorted(PLANS), default="small")
+    parser.add_argument(
+        "--sessions", type=int, help="override the plan's session count"
+    )
+    parser.add_argument(
+        "--organizations", type=int, help="override the plan's organization count"
+    )
+    parser.add_argument(
+        "--days", type=int, help="override how many days of history to generate"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="processes generating sessions in parallel (default: CPU count)",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE,
+        help="sessions generated and committed per COPY batch",
+    )
+    parser.add_argument(
+        "--seed", type=int,
+        help="random seed; the same seed and worker count reproduce the same rows",
+    )
+    args = parser.parse_args()
+
+    overrides = {
+        name: getattr(args, name)
+        for name in ("sessions", "organizations", "days")
+        if getattr(args, name) is not None
+    }
+    plan = replace(PLANS[args.plan], **overrides)
+    workers = max(1, min(args.workers, plan.sessions))
+    logger.info(f"Seeding synthetic data with plan {args.plan} and {workers} workers: {plan}")
+    start = time.perf_counter()
+    totals = Seeder(plan, seed=args.seed, chunk_size=args.chunk_size).run(
+        workers=workers
+    )
+    elapsed = time.perf_counter() - start
+    rows = sum(totals.values())
+    logger.info(
+        f"Seeded {rows:,} rows {totals} in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.api.routes.analytics import RECENT_FEEDBACK_WINDOW, _load_recent_feedback
+from app.core.config import settings
+from app.models import (
+    FeedbackResponseUpdate,
+    FeedbackSessionStatus,
+    FeedbackSessionUpdate,
+    OrganizationCreate,
+)
+from app.tests.utils.feedback import (
+    create_random_feedback_response,
+    create_random_feedback_session,
+    create_random_survey_template,
+    get_or_create_response_type,
+)
+from app.tests.utils.utils import random_lower_string
+
+
+def test_get_survey_performance(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    template = create_random_survey_template(db)
+    completed = create_random_feedback_session(db, survey_template=template)
+    create_random_feedback_session(db, survey_template=template)
+    crud.update_feedback_session(
+        session=db,
+        db_session=completed,
+        session_in=FeedbackSessionUpdate(
+            status=FeedbackSessionStatus.COMPLETED, completion_time_seconds=120
+        ),
+    )
+    create_random_feedback_response(
+        db, completed, question_id="q1", response_value={"rating": 4}
+    )
+    create_random_feedback_response(
+        db, completed, question_id="q2", response_value={"rating": 5}
+    )
+    create_random_feedback_response(
+        db, completed, question_id="q3", response_text="Friendly staff"
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/survey-performance",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    performance = {
+        p["template_id"]: p for p in content["survey_performance"]
+    }
+    metrics = performance[str(template.id)]
+    assert metrics["surveys_sent"] == 2
+    assert metrics["completion_rate"] == 50.0
+    assert metrics["avg_completion_time"] == 2.0
+    assert metrics["avg_rating"] == 4.5
+
+
+def test_get_sentiment_analysis(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    before = client.get(
+        f"{settings.API_V1_STR}/analytics/sentiment-analysis",
+        headers=superuser_token_headers,
+    ).json()
+
+    feedback_session = create_random_feedback_session(db)
+    for sentiment, topics in [
+        ("positive", "nursing,communication"),
+        ("negative", "wait"),
+        ("positive", "nursing"),
+    ]:
+        feedback_response = create_random_feedback_response(
+            db, feedback_session, response_text="Some feedback"
+        )
+        crud.update_feedback_response(
+            session=db,
+            db_response=feedback_response,
+            response_in=FeedbackResponseUpdate(
+                ai_analysis={"sentiment": sentiment, "topics": topics}
+            ),
+        )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/sentiment-analysis",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    distribution = content["sentiment_distribution"]
+    assert distribution["positive"] - before["sentiment_distribution"]["positive"] == 2
+    assert distribution["negative"] - before["sentiment_distribution"]["negative"] == 1
+    assert content["total_analyzed"] - before["total_analyzed"] == 3
+    topics = {t["topic"]: t for t in content["top_topics"]}
+    assert "nursing" in topics
+
+
+def test_get_recent_feedback_invalidated_on_new_response(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    template = create_random_survey_template(db)
+    feedback_session = create_random_feedback_session(db, survey_template=template)
+    client.get(
+        f"{settings.API_V1_STR}/analytics/recent-feedback",
+        headers=superuser_token_headers,
+    )
+
+    response_type = get_or_create_response_type(db)
+    r = client.post(
+        f"{settings.API_V1_STR}/feedback-responses/",
+        json={
+            "session_id": str(feedback_session.id),
+            "response_type_id": str(response_type.id),
+            "question_id": "q1",
+            "response_text": "Very kind nurses",
+            "response_value": {"rating": 5},
+        },
+    )
+    assert r.status_code == 200
+
+    response = client.get(
+        f"{settings.API_V1_STR}/analytics/recent-feedback",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    latest = response.json()["recent_feedback"][0]
+    assert latest["id"] == r.json()["id"]
+    assert latest["survey_name"] == template.name
+    assert latest["rating"] == 5
+
+
+def test_recent_feedback_reaches_past_the_window(db: Session) -> None:
+    organization = crud.create_organization(
+        session=db,
+        organization_create=OrganizationCreate(name=f"Org {random_lower_string()}"),
+    )
+    template = create_random_survey_template(db, organization_id=organization.id)
+    feedback_session = create_random_feedback_session(db, survey_template=template)
+    before_window = datetime.utcnow() - RECENT_FEEDBACK_WINDOW * 2
+    feedback_session.created_at = before_window
+    db.add(feedback_session)
+    db.commit()
+    older = create_random_feedback_response(
+        db, feedback_session, response_text="Parking was hard"
+    )
+    older.created_at = before_window + timedelta(hours=1)
+    db.add(older)
+    db.commit()
+    create_random_feedback_response(db, feedback_session, response_text="Kind staff")
+
+    def summaries(limit: int, since: datetime | None = None) -> list[str]:
+        feedback = _load_recent_feedback(db, organization.id, limit, since=since)
+        return [item["summary"] for item in feedback["recent_feedback"]]
+
+    assert summaries(10) == ["Kind staff", "Parking was hard"]
+    assert summaries(1) == ["Kind staff"]
+    assert summaries(10, since=before_window) == ["Kind staff", "Parking was hard"]
+    assert summaries(10, since=older.created_at + timedelta(seconds=1)) == [
+        "Kind staff"
+    ]
@@ -11,6 +11,11 @@ from app.models import (
     FeedbackSessionCreate,
     FeedbackResponseCreate
 )
+from app.tests.utils.feedback import (
+    create_random_feedback_response,
+    create_random_feedback_session,
+    create_random_survey_template,
+)
 from app.tests.utils.utils import random_lower_string
 
 
@@ -370,3 +375,124 @@ def test_get_question_analytics(
     assert "total_responses" in content
     assert "response_distribution" in content
 
+
+def test_read_feedback_responses_pivot(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    template = create_random_survey_template(db)
+    feedback_session = create_random_feedback_session(db, survey_template=template)
+    create_random_feedback_response(
+        db, feedback_session, question_id="q1", response_text="Great experience!"
+    )
+    create_random_feedback_response(
+        db, feedback_session, question_id="q2", response_value={"rating": 5}
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/feedback-responses/pivot",
+        headers=superuser_token_headers,
+        params={"survey_template_id": str(template.id)},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 1
+    assert content["question_ids"] == ["q1", "q2"]
+    row = content["data"][0]
+    assert row["session_id"] == str(feedback_session.id)
+    assert row["answers"] == {"q1": "Great experience!", "q2": {"rating": 5}}
+
+
+def test_export_feedback_responses_pivot_csv(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    template = create_random_survey_template(db)
+    feedback_session = create_random_feedback_session(db, survey_template=template)
+    create_random_feedback_response(
+        db, feedback_session, question_id="q1", response_text="Great experience!"
+    )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/feedback-responses/pivot/export",
+        headers=superuser_token_headers,
+        params={"survey_template_id": str(template.id), "format": "csv"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    lines = response.text.strip().splitlines()
+    assert lines[0] == "session_id,survey_template_id,status,completed_at,q1"
+    assert lines[1].startswith(str(feedback_session.id))
+    assert lines[1].endswith("Great experience!")
+
+
+def test_get_question_analytics_numeric_statistics(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    question_id = f"nps-{random_lower_string()}"
+    template = create_random_survey_template(
+        db, questions={question_id: {"type": "nps", "question": "Recommend us?"}}
+    )
+    feedback_session = create_random_feedback_session(db, template)
+    for score in [10, 9, 9, 7, 3]:
+        create_random_feedback_response(
+            db, feedback_session, question_id=question_id, response_value={"score": score}
+        )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/feedback-responses/analytics/question/{question_id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["total_responses"] == 5
+    numeric = content["numeric"]
+    assert numeric["count"] == 5
+    assert numeric["mean"] == 7.6
+    assert numeric["median"] == 9
+    # 3 promoters, 1 detractor out of 5
+    assert numeric["nps"] == 40.0
+    histogram = {bucket["value"]: bucket["count"] for bucket in numeric["histogram"]}
+    assert histogram == {3: 1, 7: 1, 9: 2, 10: 1}
+
+
+def test_get_question_analytics_scale_comes_from_the_template(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    # Only detractors, all within 1-5: still an NPS question
+    question_id = f"nps-{random_lower_string()}"
+    template = create_random_survey_template(
+        db, questions={question_id: {"type": "nps", "question": "Recommend us?"}}
+    )
+    feedback_session = create_random_feedback_session(db, template)
+    for score in [1, 2, 4]:
+        create_random_feedback_response(
+            db, feedback_session, question_id=question_id, response_value={"score": score}
+        )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/feedback-responses/analytics/question/{question_id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    numeric = response.json()["numeric"]
+    assert numeric["nps"] == -100.0
+    assert "csat" not in numeric
+
+
+def test_get_question_analytics_single_fractional_value(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    question_id = f"wait-{random_lower_string()}"
+    feedback_session = create_random_feedback_session(db)
+    for _ in range(3):
+        create_random_feedback_response(
+            db, feedback_session, question_id=question_id, response_value={"score": 7.5}
+        )
+
+    response = client.get(
+        f"{settings.API_V1_STR}/feedback-responses/analytics/question/{question_id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+    numeric = response.json()["numeric"]
+    assert numeric["histogram"] == [{"range": [7.5, 7.5], "count": 3}]
+    assert "nps" not in numeric and "csat" not in numeric
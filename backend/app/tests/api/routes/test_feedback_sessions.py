@@ -11,6 +11,7 @@ from app.models import (
     FeedbackSessionCreate,
     UserCreate
 )
+from app.tests.utils.feedback import create_random_feedback_session
 from app.tests.utils.user import create_user_create
 from app.tests.utils.utils import random_lower_string
 
@@ -342,3 +343,25 @@ def test_get_organization_feedback_stats(
     assert "completion_rate" in content
     assert "avg_completion_time_hours" in content
 
+
+
+def test_read_survey_template_by_token_not_modified(
+    client: TestClient, db: Session
+) -> None:
+    feedback_session = create_random_feedback_session(db)
+    url = (
+        f"{settings.API_V1_STR}/feedback-sessions/by-token/"
+        f"{feedback_session.completion_token}/survey-template"
+    )
+    response = client.get(url)
+    assert response.status_code == 200
+    content = response.json()
+    assert content["id"] == str(feedback_session.survey_template_id)
+    assert "created_by" not in content
+    assert "public" in response.headers["cache-control"]
+    etag = response.headers["etag"]
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
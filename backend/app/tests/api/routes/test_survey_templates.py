@@ -1,10 +1,21 @@
 import uuid
 from fastapi.testclient import TestClient
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from app import crud
 from app.core.config import settings
-from app.models import OrganizationCreate, SurveyTemplateCreate, UserCreate
+from app.models import (
+    FeedbackResponse,
+    FeedbackSession,
+    OrganizationCreate,
+    SurveyTemplateCreate,
+    UserCreate,
+)
+from app.tests.utils.feedback import (
+    create_random_feedback_response,
+    create_random_feedback_session,
+    create_random_survey_template,
+)
 from app.tests.utils.user import create_user_create
 from app.tests.utils.utils import random_lower_string
 
@@ -216,6 +227,27 @@ def test_delete_survey_template(
     assert response.status_code == 404
 
 
+def test_delete_survey_template_cascades_to_feedback(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    template = create_random_survey_template(db)
+    feedback_session = create_random_feedback_session(db, survey_template=template)
+    create_random_feedback_response(db, feedback_session, response_text="Great")
+    session_id = feedback_session.id
+
+    response = client.delete(
+        f"{settings.API_V1_STR}/survey-templates/{template.id}",
+        headers=superuser_token_headers,
+    )
+    assert response.status_code == 200
+
+    db.expire_all()
+    assert db.get(FeedbackSession, session_id) is None
+    assert not db.exec(
+        select(FeedbackResponse).where(FeedbackResponse.session_id == session_id)
+    ).all()
+
+
 def test_duplicate_survey_template(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -7,7 +7,11 @@ from sqlmodel import Session, select
 from app import crud
 from app.core.config import settings
 from app.core.security import verify_password
-from app.models import User, UserCreate
+from app.models import Appointment, FeedbackSession, SurveyTemplate, User, UserCreate
+from app.tests.utils.feedback import (
+    create_random_feedback_session,
+    create_random_survey_template,
+)
 from app.tests.utils.utils import random_email, random_lower_string
 from app.tests.utils.user import create_user_create
 
@@ -445,6 +449,43 @@ def test_delete_user_super_user(
     assert result is None
 
 
+def test_delete_user_cascades_to_appointments(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    feedback_session = create_random_feedback_session(db)
+    appointment = db.get(Appointment, feedback_session.appointment_id)
+    assert appointment
+    appointment_id, patient_id = appointment.id, appointment.patient_id
+    session_id = feedback_session.id
+
+    r = client.delete(
+        f"{settings.API_V1_STR}/users/{patient_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    db.expire_all()
+    assert db.get(Appointment, appointment_id) is None
+    assert db.get(FeedbackSession, session_id) is None
+
+
+def test_delete_user_keeps_created_survey_templates(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    template = create_random_survey_template(db)
+    template_id, creator_id = template.id, template.created_by
+
+    r = client.delete(
+        f"{settings.API_V1_STR}/users/{creator_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    db.expire_all()
+    assert db.get(User, creator_id) is None
+    template = db.get(SurveyTemplate, template_id)
+    assert template
+    assert template.created_by is None
+
+
 def test_delete_user_not_found(
     client: TestClient, superuser_token_headers: dict[str, str]
 ) -> None:
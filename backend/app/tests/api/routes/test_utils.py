@@ -0,0 +1,16 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_metrics_requires_login(client: TestClient) -> None:
+    response = client.get(f"{settings.API_V1_STR}/utils/metrics")
+    assert response.status_code == 401
+
+
+def test_metrics(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/utils/metrics", headers=superuser_token_headers
+    )
+    assert response.status_code == 200
+    assert "# TYPE http_requests_total counter" in response.text
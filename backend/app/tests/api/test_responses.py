@@ -0,0 +1,61 @@
+import uuid
+from datetime import datetime
+
+import orjson
+from fastapi import Request
+
+from app.api.responses import (
+    dump_rows,
+    etag_matches,
+    list_response,
+    make_etag,
+    not_modified,
+)
+from app.models import FeedbackSession, FeedbackSessionPublic, FeedbackSessionStatus
+
+
+def test_list_response_matches_public_model() -> None:
+    feedback_session = FeedbackSession(
+        appointment_id=uuid.uuid4(),
+        survey_template_id=uuid.uuid4(),
+        status=FeedbackSessionStatus.COMPLETED,
+        completed_at=datetime(2025, 1, 2, 3, 4, 5),
+        ip_address="127.0.0.1",
+    )
+    response = list_response(FeedbackSessionPublic, [feedback_session], 1)
+    content = orjson.loads(response.body)
+    assert content["count"] == 1
+    row = content["data"][0]
+    assert set(row) == set(FeedbackSessionPublic.model_fields)
+    assert "ip_address" not in row
+    assert row["status"] == "completed"
+    assert row["completed_at"] == "2025-01-02T03:04:05"
+    expected = FeedbackSessionPublic.model_validate(feedback_session)
+    assert row == orjson.loads(expected.model_dump_json())
+
+
+def test_dump_rows_empty() -> None:
+    assert dump_rows(FeedbackSessionPublic, []) == []
+
+
+def test_etag_matches_weak_and_lists() -> None:
+    etag = make_etag("template", 1)
+    assert etag.startswith('W/"')
+    assert etag != make_etag("template", 2)
+
+    def request(if_none_match: str) -> Request:
+        headers = [(b"if-none-match", if_none_match.encode())]
+        return Request({"type": "http", "headers": headers})
+
+    assert etag_matches(request(etag), etag)
+    assert etag_matches(request(etag.removeprefix("W/")), etag)
+    assert etag_matches(request(f'"other", {etag}'), etag)
+    assert etag_matches(request("*"), etag)
+    assert not etag_matches(request('"other"'), etag)
+
+    response = not_modified(request(etag), etag)
+    assert response is not None
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+    assert not_modified(request('"other"'), etag) is None
@@ -0,0 +1,60 @@
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from sqlmodel import Session
+
+from app.core.cache import LRUCacheBackend, cache
+from app.core.config import settings
+from app.main import warm_up
+from app.tests.utils.feedback import create_random_survey_template
+
+# Generous enough for a slow CI runner; the API imports in about 1.5s locally
+IMPORT_BUDGET_SECONDS = 3.0
+
+# Loaded on first use only, never while a worker boots
+LAZY_MODULES = {"openai", "sentry_sdk", "emails", "jinja2"}
+
+
+def import_times(module: str) -> dict[str, float]:
+    """Cumulative import time in seconds of every module `module` imports."""
+    env = {**os.environ, "SENTRY_DSN": ""}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=Path(__file__).parents[3],
+        check=True,
+    )
+    times = {}
+    for match in re.finditer(
+        r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$", result.stderr, re.M
+    ):
+        times[match.group(2)] = int(match.group(1)) / 1_000_000
+    return times
+
+
+def test_api_imports_within_budget() -> None:
+    times = import_times("app.main")
+    assert not LAZY_MODULES & {name.split(".")[0] for name in times}
+    assert times["app.main"] < IMPORT_BUDGET_SECONDS
+
+
+def test_warm_up_fills_caches(db: Session) -> None:
+    survey_template = create_random_survey_template(db)
+    cache.clear()
+
+    warm_up()
+
+    assert cache.get(f"survey-template:{survey_template.id}")["id"] == str(
+        survey_template.id
+    )
+    assert cache.get("feedback-response-types:active:0:100") is not None
+    if cache.broadcasting and isinstance(cache.backend, LRUCacheBackend):
+        key = f"survey-template:{survey_template.id}"
+        expires_at, _, _ = cache.backend._entries[key]
+        assert expires_at - time.monotonic() > settings.CACHE_DEFAULT_TTL_SECONDS
@@ -0,0 +1,169 @@
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+
+import orjson
+
+from app.core.cache import (
+    MAX_PAYLOAD_BYTES,
+    Cache,
+    LRUCacheBackend,
+    _chunks,
+    org_tag,
+    template_tag,
+)
+from app.models import Organization
+
+
+def test_get_or_set_round_trips_as_json() -> None:
+    cache = Cache(LRUCacheBackend())
+    organization = Organization(
+        id=uuid.uuid4(),
+        name="Clinic",
+        type="healthcare",
+        created_at=datetime(2025, 1, 2, 3, 4, 5),
+    )
+    value = cache.get_or_set("org", lambda: organization)
+    assert value["id"] == str(organization.id)
+    assert value["created_at"] == "2025-01-02T03:04:05"
+    assert cache.get_or_set("org", lambda: None) == value
+
+
+def test_none_is_not_cached() -> None:
+    cache = Cache(LRUCacheBackend())
+    assert cache.get_or_set("missing", lambda: None) is None
+    assert cache.get_or_set("missing", lambda: 1) == 1
+
+
+def test_ttl_expires_entries() -> None:
+    cache = Cache(LRUCacheBackend())
+    cache.set("key", "value", ttl=0.01)
+    assert cache.get("key") == "value"
+    time.sleep(0.02)
+    assert cache.get("key") is None
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    cache = Cache(LRUCacheBackend(max_entries=2), default_ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_invalidate_by_tag() -> None:
+    cache = Cache(LRUCacheBackend(), default_ttl=60)
+    org_id, template_id = uuid.uuid4(), uuid.uuid4()
+    cache.set("org", 1, tags=[org_tag(org_id)])
+    cache.set("template", 2, tags=[org_tag(org_id), template_tag(template_id)])
+    cache.set("other", 3, tags=[org_tag(uuid.uuid4())])
+
+    cache.invalidate(template_tag(template_id))
+    assert cache.get("template") is None
+    assert cache.get("org") == 1
+
+    cache.invalidate(org_tag(org_id))
+    assert cache.get("org") is None
+    assert cache.get("other") == 3
+
+
+def test_single_flight_loads_once() -> None:
+    cache = Cache(LRUCacheBackend(), default_ttl=60)
+    calls = []
+
+    def loader() -> int:
+        calls.append(1)
+        time.sleep(0.05)
+        return 42
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_set("k", loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [42] * 8
+    assert len(calls) == 1
+
+
+def test_load_racing_invalidation_is_not_stored() -> None:
+    cache = Cache(LRUCacheBackend(), default_ttl=60)
+
+    def loader() -> int:
+        cache.invalidate("tag")
+        return 1
+
+    assert cache.get_or_set("k", loader, tags=["tag"]) == 1
+    assert cache.get("k") is None
+
+
+def test_unrelated_invalidation_does_not_block_storing() -> None:
+    cache = Cache(LRUCacheBackend(), default_ttl=60)
+
+    def loader() -> int:
+        cache.invalidate("other")
+        cache.delete("other-key")
+        return 1
+
+    assert cache.get_or_set("k", loader, tags=["tag"]) == 1
+    assert cache.get("k") == 1
+
+
+def test_load_racing_delete_is_not_stored() -> None:
+    cache = Cache(LRUCacheBackend(), default_ttl=60)
+
+    def loader() -> int:
+        cache.delete("k")
+        return 1
+
+    assert cache.get_or_set("k", loader) == 1
+    assert cache.get("k") is None
+
+
+def test_broadcast_payloads_are_split() -> None:
+    tags = [org_tag(uuid.uuid4()) for _ in range(1000)]
+    chunks = list(_chunks(tags))
+    assert len(chunks) > 1
+    assert [tag for chunk in chunks for tag in chunk] == tags
+    assert all(len(orjson.dumps(chunk)) <= MAX_PAYLOAD_BYTES for chunk in chunks)
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_invalidations_reach_other_processes() -> None:
+    # Two caches stand in for two workers, each with its own LISTEN thread
+    worker, other = (Cache(LRUCacheBackend(), 60, broadcast=True) for _ in range(2))
+    for cache in worker, other:
+        cache.listen()
+        assert cache.listening.wait(10)
+    tag = org_tag(uuid.uuid4())
+    for cache in worker, other:
+        cache.set("org", 1, tags=[tag])
+        cache.set("template", 2)
+        cache.set("other", 3)
+
+    worker.invalidate(tag)
+    assert worker.get("org") is None
+    assert wait_for(lambda: other.get("org") is None)
+
+    worker.delete("template")
+    assert wait_for(lambda: other.get("template") is None)
+    assert other.get("other") == 3
+
+    worker.clear()
+    assert wait_for(lambda: other.get("other") is None)
@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.delivery import (
+    Channel,
+    DeliveryError,
+    DeliveryScheduler,
+    FakeChannel,
+    Invitation,
+    RateLimiter,
+    TokenBucket,
+    retry_delay,
+)
+from app.models import DeliveryMethod, FeedbackSession
+from app.tests.utils.feedback import create_random_feedback_session
+
+
+class FailingChannel(Channel):
+    method = DeliveryMethod.EMAIL
+
+    async def send(self, invitation: Invitation) -> None:
+        raise DeliveryError("mailbox unavailable")
+
+
+def test_token_bucket_spaces_out_bursts() -> None:
+    bucket = TokenBucket(rate=10, burst=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.09 < waits[2] < 0.11
+    assert 0.19 < waits[3] < 0.21
+
+
+def test_retry_delay_backs_off_to_the_maximum() -> None:
+    base = settings.DELIVERY_RETRY_BASE_SECONDS
+    assert retry_delay(1) == timedelta(seconds=base)
+    assert retry_delay(3) == timedelta(seconds=base * 4)
+    assert retry_delay(100) == timedelta(seconds=settings.DELIVERY_RETRY_MAX_SECONDS)
+
+
+def due_session(db: Session) -> FeedbackSession:
+    feedback_session = create_random_feedback_session(db)
+    feedback_session.delivery_method = DeliveryMethod.EMAIL
+    feedback_session.next_delivery_at = datetime.utcnow() - timedelta(days=365)
+    db.add(feedback_session)
+    db.commit()
+    return feedback_session
+
+
+def scheduler(channel: Channel) -> DeliveryScheduler:
+    return DeliveryScheduler(
+        {DeliveryMethod.EMAIL: channel},
+        limiter=RateLimiter({}, organization_rate=1000),
+        batch_size=10_000,
+    )
+
+
+def test_scheduler_delivers_due_sessions(db: Session) -> None:
+    feedback_session = due_session(db)
+    channel = FakeChannel(DeliveryMethod.EMAIL)
+
+    asyncio.run(scheduler(channel).run_once(db))
+
+    sent = [i for i in channel.sent if i.session_id == feedback_session.id]
+    assert len(sent) == 1
+    assert sent[0].link.endswith(str(feedback_session.completion_token))
+    assert sent[0].link in sent[0].body
+    db.refresh(feedback_session)
+    assert feedback_session.delivered_at is not None
+    assert feedback_session.next_delivery_at is None
+    assert feedback_session.delivery_attempts == 1
+
+
+def test_scheduler_retries_failed_sends(db: Session) -> None:
+    feedback_session = due_session(db)
+
+    asyncio.run(scheduler(FailingChannel()).run_once(db))
+
+    db.refresh(feedback_session)
+    assert feedback_session.delivered_at is None
+    assert feedback_session.delivery_attempts == 1
+    assert feedback_session.next_delivery_at > datetime.utcnow()
+
+
+def test_scheduler_sends_reminders(db: Session) -> None:
+    feedback_session = due_session(db)
+    template = feedback_session.survey_template
+    template.delivery_settings = {"reminders": {"after_hours": [24]}}
+    db.add(template)
+    db.commit()
+    channel = FakeChannel(DeliveryMethod.EMAIL)
+
+    asyncio.run(scheduler(channel).run_once(db))
+    db.refresh(feedback_session)
+    assert feedback_session.next_delivery_at > datetime.utcnow() + timedelta(hours=23)
+
+    # A day later, the reminder is due
+    feedback_session.delivered_at -= timedelta(hours=25)
+    feedback_session.next_delivery_at -= timedelta(hours=25)
+    db.add(feedback_session)
+    db.commit()
+    asyncio.run(scheduler(channel).run_once(db))
+
+    sent = [i for i in channel.sent if i.session_id == feedback_session.id]
+    assert [invitation.reminder for invitation in sent] == [False, True]
+    assert sent[1].subject.startswith("Reminder")
+    db.refresh(feedback_session)
+    assert feedback_session.reminders_sent == 1
+    assert feedback_session.delivery_attempts == 2
+    assert feedback_session.next_delivery_at is None
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+from sqlmodel import Session
+
+from app.api.routes.analytics import _load_new_feedback
+from app.core.events import RESYNC, FeedbackEvent, FeedbackEventBroker
+from app.models import FeedbackSessionStatus
+from app.tests.utils.feedback import (
+    create_random_feedback_response,
+    create_random_feedback_session,
+)
+
+
+def notification(organization_id: uuid.UUID, event: str, **data: Any) -> str:
+    return json.dumps({"event": event, "organization_id": str(organization_id), **data})
+
+
+def test_event_encodes_as_server_sent_event() -> None:
+    event = FeedbackEvent("responses", {"count": 2})
+    assert event.encode() == 'event: responses\ndata: {"count": 2}\n\n'
+
+
+def test_broker_publishes_to_the_organization_only() -> None:
+    loaded = []
+
+    def load_feedback(organization_id: uuid.UUID, since: datetime) -> dict[str, Any]:
+        loaded.append((organization_id, since))
+        return {"recent_feedback": [{"id": "r1"}]}
+
+    broker = FeedbackEventBroker(load_feedback=load_feedback)
+    watched, other = uuid.uuid4(), uuid.uuid4()
+
+    async def watch() -> list[FeedbackEvent | None]:
+        async with broker.subscribe(watched) as queue:
+            await broker.dispatch(
+                notification(other, "responses", count=1, since="2026-10-18T10:00:00.000000")
+            )
+            await broker.dispatch(
+                notification(watched, "responses", count=1, since="2026-10-18T10:00:00.000000")
+            )
+            await broker.dispatch(notification(watched, "session_completed", session_id="s1"))
+            await broker.close()
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    events = asyncio.run(watch())
+
+    assert loaded == [(watched, datetime(2026, 10, 18, 10))]
+    assert events == [
+        FeedbackEvent(
+            "responses",
+            {
+                "count": 1,
+                "since": "2026-10-18T10:00:00.000000",
+                "recent_feedback": [{"id": "r1"}],
+            },
+        ),
+        FeedbackEvent("session_completed", {"session_id": "s1"}),
+        None,
+    ]
+    assert not broker.subscribers
+
+
+def test_slow_subscribers_are_told_to_resync() -> None:
+    broker = FeedbackEventBroker(queue_size=2)
+    organization_id = uuid.uuid4()
+
+    async def watch() -> list[FeedbackEvent | None]:
+        async with broker.subscribe(organization_id) as queue:
+            for number in range(3):
+                await broker.dispatch(
+                    notification(organization_id, "session_completed", session_id=number)
+                )
+            await broker.close()
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert asyncio.run(watch()) == [RESYNC, None]
+
+
+def test_triggers_notify_subscribers(db: Session) -> None:
+    feedback_session = create_random_feedback_session(db)
+    organization_id = feedback_session.survey_template.organization_id
+    broker = FeedbackEventBroker(load_feedback=_load_new_feedback)
+
+    def complete() -> None:
+        feedback_session.status = FeedbackSessionStatus.COMPLETED
+        feedback_session.completed_at = datetime.utcnow()
+        db.add(feedback_session)
+        db.commit()
+
+    async def watch() -> list[FeedbackEvent | None]:
+        async with broker.subscribe(organization_id) as queue:
+            assert broker.listening is not None
+            await asyncio.wait_for(broker.listening.wait(), 10)
+            await asyncio.to_thread(
+                create_random_feedback_response,
+                db,
+                feedback_session,
+                response_text="The nurse was lovely",
+            )
+            responses = await asyncio.wait_for(queue.get(), 10)
+            await asyncio.to_thread(complete)
+            completed = await asyncio.wait_for(queue.get(), 10)
+        await broker.close()
+        return [responses, completed]
+
+    responses, completed = asyncio.run(watch())
+
+    assert responses is not None and responses.event == "responses"
+    assert responses.data["count"] == 1
+    assert [feedback["summary"] for feedback in responses.data["recent_feedback"]] == [
+        "The nurse was lovely"
+    ]
+    assert completed is not None and completed.event == "session_completed"
+    assert completed.data["session_id"] == str(feedback_session.id)
@@ -0,0 +1,100 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from jinja2.sandbox import SecurityError
+
+from app.core.invitations import (
+    DEFAULT_COLOR,
+    InvitationTemplateCache,
+    ReminderCadence,
+    compile_invitation,
+    recipient,
+)
+
+LINK = "https://example.com/feedback/token"
+
+
+def test_invitation_uses_branding_and_overrides() -> None:
+    template = compile_invitation(
+        "Riverside Clinic",
+        {"primary_color": "#0b5394", "signature": "The <Riverside> team"},
+        {
+            "email_subject": "How was your visit, {{ patient_name }}?",
+            "sms_message": "{{ organization_name }} survey:",
+        },
+    )
+    recipients = [recipient(LINK, "Ann", datetime(2026, 10, 25))]
+
+    [(subject, html)] = template.render_emails(recipients)
+    assert subject == "How was your visit, Ann?"
+    assert LINK in html
+    assert "#0b5394" in html
+    assert "The &lt;Riverside&gt; team" in html
+    assert "October 25, 2026" in html
+    assert template.render_sms(recipients) == [f"Riverside Clinic survey: {LINK}"]
+
+
+def test_invitation_ignores_unsafe_branding() -> None:
+    template = compile_invitation(
+        "Riverside Clinic",
+        {"primary_color": "red;background:url(x)", "logo_url": "http://x/logo.png"},
+        {"email_message": "{% if %}"},
+    )
+    assert template.context["primary_color"] == DEFAULT_COLOR
+    assert template.context["logo_url"] is None
+    [(_, html)] = template.render_emails([recipient(LINK, None, None)])
+    assert "Thank you for visiting Riverside Clinic" in html
+
+
+def test_overrides_are_sandboxed() -> None:
+    template = compile_invitation(
+        "Riverside Clinic",
+        None,
+        {"email_subject": "{{ patient_name.__class__.__mro__[1].__subclasses__() }}"},
+    )
+    with pytest.raises(SecurityError):
+        template.render_emails([recipient(LINK, "Ann", None)])
+
+
+def test_cache_compiles_once_per_version() -> None:
+    cache = InvitationTemplateCache(max_entries=1)
+    key = (uuid.uuid4(), uuid.uuid4(), (1,))
+    first = cache.get(key, "Riverside Clinic", {}, {})
+    assert cache.get(key, "Renamed", {}, {}) is first
+    assert cache.get((*key[:2], (2,)), "Renamed", {}, {}) is not first
+    assert len(cache.entries) == 1
+
+
+def test_reminder_cadence() -> None:
+    cadence = ReminderCadence.from_settings(
+        {"after_hours": [72, 24, 150], "final_hours_before_expiry": 24}
+    )
+    delivered = datetime(2026, 10, 1)
+    expires = delivered + timedelta(days=7)
+    final = expires - timedelta(hours=24)
+
+    assert cadence.next_at(delivered, expires, delivered) == delivered + timedelta(hours=24)
+    assert cadence.next_at(delivered, expires, delivered + timedelta(hours=30)) == (
+        delivered + timedelta(hours=72)
+    )
+    # The 150h reminder would land after the final notice, so it is dropped
+    assert cadence.next_at(delivered, expires, delivered + timedelta(hours=80)) == final
+    assert cadence.next_at(delivered, expires, final) is None
+    assert cadence.is_final(expires, final)
+    assert cadence.next_at(delivered, None, delivered + timedelta(hours=80)) == (
+        delivered + timedelta(hours=150)
+    )
+    assert ReminderCadence.from_settings(None).next_at(delivered, expires, delivered) is None
+    with pytest.raises(ValueError):
+        ReminderCadence.from_settings({"after_hours": ["soon"]})
+
+
+def test_reminders_use_reminder_wording() -> None:
+    template = compile_invitation("Riverside Clinic", {}, {})
+    [(subject, _)] = template.render_emails(
+        [recipient(LINK, "Ann", datetime(2026, 10, 25), reminder=True, final=True)]
+    )
+    assert subject == "Last chance: tell us about your visit to Riverside Clinic"
+    [text] = template.render_sms([recipient(LINK, "Ann", None, reminder=True)])
+    assert text == f"Riverside Clinic: a reminder to tell us about your visit: {LINK}"
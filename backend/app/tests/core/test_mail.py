@@ -0,0 +1,71 @@
+import socket
+from collections.abc import Iterator
+from typing import Any
+
+import emails  # type: ignore
+import pytest
+from aiosmtpd.controller import Controller
+
+from app.core.mail import Mailer
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self.received: list[tuple[int, str]] = []
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:
+        self.received.append((id(session), envelope.rcpt_tos[0]))
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server() -> Iterator[tuple[Controller, Recorder]]:
+    recorder = Recorder()
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    controller = Controller(recorder, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield controller, recorder
+    controller.stop()
+
+
+def test_mailer_reuses_connections(smtp_server: tuple[Controller, Recorder]) -> None:
+    controller, recorder = smtp_server
+    mailer = Mailer(
+        {"host": controller.hostname, "port": controller.port},
+        workers=2,
+        idle_timeout=5,
+    )
+    futures = [
+        mailer.submit(
+            emails.Message(subject="Hi", html="<p>Hi</p>", mail_from="app@example.com"),
+            f"patient{number}@example.com",
+        )
+        for number in range(20)
+    ]
+    mailer.close()
+
+    assert all(future.result().success for future in futures)
+    assert sorted(to for _, to in recorder.received) == sorted(
+        f"patient{number}@example.com" for number in range(20)
+    )
+    # One SMTP session per worker, not one per message
+    assert len({session for session, _ in recorder.received}) <= 2
+
+
+class BrokenMessage:
+    def send(self, to: str, smtp: Any) -> Any:
+        raise RuntimeError("connection reset")
+
+
+def test_mailer_logs_failed_sends(
+    smtp_server: tuple[Controller, Recorder], caplog: pytest.LogCaptureFixture
+) -> None:
+    controller, _ = smtp_server
+    mailer = Mailer({"host": controller.hostname, "port": controller.port}, workers=1)
+    future = mailer.submit(BrokenMessage(), "patient@example.com")
+    mailer.close()
+
+    assert isinstance(future.exception(), RuntimeError)
+    assert "Failed to send email to patient@example.com" in caplog.text
@@ -0,0 +1,59 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.api.responses import ORJSONResponse
+from app.core.metrics import QueryMetricsMiddleware, instrument_engine, registry
+
+
+def _app(server_timing: bool, statement_preview: bool = False) -> FastAPI:
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.add_middleware(
+        QueryMetricsMiddleware,
+        server_timing=server_timing,
+        statement_preview=statement_preview,
+    )
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int) -> dict[str, int]:
+        with engine.connect() as connection:
+            for _ in range(3):
+                connection.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    return app
+
+
+def test_server_timing_header_reports_statements() -> None:
+    client = TestClient(_app(server_timing=True, statement_preview=True))
+    response = client.get("/items/1")
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert 'desc="3 statements"' in timing
+    assert "db-slowest;" in timing
+    assert "SELECT 1" in timing
+    assert "serialize;dur=" in timing
+
+
+def test_server_timing_header_hides_statements_by_default() -> None:
+    client = TestClient(_app(server_timing=True))
+    timing = client.get("/items/1").headers["server-timing"]
+    assert "db-slowest;dur=" in timing
+    assert "SELECT" not in timing
+
+
+def test_metrics_recorded_per_route_template() -> None:
+    registry.reset()
+    client = TestClient(_app(server_timing=False))
+    client.get("/items/1")
+    client.get("/items/2")
+    response = client.get("/items/3")
+    assert "server-timing" not in response.headers
+
+    rendered = registry.render()
+    labels = 'method="GET",route="/items/{item_id}"'
+    assert f"http_requests_total{{{labels}}} 3" in rendered
+    assert f"db_statements_total{{{labels}}} 9" in rendered
+    assert "# TYPE db_slowest_statement_seconds gauge" in rendered
@@ -0,0 +1,57 @@
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.partitions import (
+    add_months,
+    create_partition,
+    default_partition_name,
+    detach_partition,
+    ensure_partitions,
+    list_partitions,
+    month_start,
+    partition_name,
+)
+from app.tests.utils.feedback import create_random_feedback_session
+
+
+def test_month_arithmetic() -> None:
+    assert month_start(date(2026, 10, 18)) == date(2026, 10, 1)
+    assert add_months(date(2026, 11, 1), 1) == date(2026, 12, 1)
+    assert add_months(date(2026, 12, 1), 1) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name("feedbackresponse", date(2027, 1, 1)) == "feedbackresponse_2027_01"
+
+
+def test_ensure_partitions_is_idempotent(db: Session) -> None:
+    connection = db.connection()
+    ensure_partitions(connection, months_ahead=2)
+    assert ensure_partitions(connection, months_ahead=2) == []
+    partitions = list_partitions(connection, "feedbacksession")
+    current = month_start(datetime.utcnow().date())
+    for offset in range(3):
+        assert partition_name("feedbacksession", add_months(current, offset)) in partitions
+    assert default_partition_name("feedbacksession") in partitions
+    db.commit()
+
+
+def test_new_partition_takes_rows_from_default(db: Session) -> None:
+    month = date(2099, 1, 1)
+    feedback_session = create_random_feedback_session(db)
+    feedback_session.created_at = datetime(2099, 1, 15)
+    db.add(feedback_session)
+    db.commit()
+
+    connection = db.connection()
+    assert create_partition(connection, "feedbacksession", month)
+    name = partition_name("feedbacksession", month)
+    moved = connection.execute(
+        text(f"SELECT count(*) FROM {name} WHERE id = :id"), {"id": feedback_session.id}
+    ).scalar_one()
+    assert moved == 1
+
+    detach_partition(connection, "feedbacksession", month)
+    assert name not in list_partitions(connection, "feedbacksession")
+    connection.execute(text(f"DROP TABLE {name}"))
+    db.commit()
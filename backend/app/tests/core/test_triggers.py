@@ -0,0 +1,175 @@
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from app import crud
+from app.core.db import engine
+from app.core.triggers import (
+    TriggerIndex,
+    TriggerRule,
+    load_trigger_indexes,
+    lock_organizations,
+    run_triggers,
+    trigger_batch,
+)
+from app.models import (
+    Appointment,
+    DeliveryMethod,
+    FeedbackSession,
+    FeedbackSessionStatus,
+    OrganizationCreate,
+    SurveyTemplateCreate,
+)
+from app.tests.utils.user import create_user_create
+from app.tests.utils.utils import random_lower_string
+
+ORGANIZATION_ID = uuid.UUID(int=1)
+
+
+def rule(triggers: dict, template_id: uuid.UUID | None = None) -> TriggerRule:
+    parsed = TriggerRule.from_template(
+        template_id or uuid.uuid4(), ORGANIZATION_ID, triggers
+    )
+    assert parsed is not None
+    return parsed
+
+
+def test_rule_from_template() -> None:
+    assert TriggerRule.from_template(uuid.uuid4(), ORGANIZATION_ID, {}) is None
+    parsed = TriggerRule.from_template(
+        uuid.uuid4(),
+        ORGANIZATION_ID,
+        {"appointment_types": ["Follow-up"], "diagnosis_codes": ["e11"]},
+        {"method": "SMS"},
+    )
+    assert parsed is not None
+    assert parsed.appointment_types == {"follow-up"}
+    assert parsed.diagnosis_prefixes == ("E11",)
+    assert parsed.statuses == {"completed"}
+    assert parsed.delivery_method == DeliveryMethod.SMS
+    with pytest.raises(ValueError):
+        TriggerRule.from_template(
+            uuid.uuid4(), ORGANIZATION_ID, {"provider_ids": ["not-a-uuid"]}
+        )
+
+
+def test_index_picks_best_matching_rule() -> None:
+    provider_id = uuid.uuid4()
+    catch_all = rule({"statuses": ["completed"]})
+    diabetes = rule({"appointment_types": ["Follow-up"], "diagnosis_codes": ["E11"]})
+    provider = rule({"provider_ids": [str(provider_id)], "priority": 5})
+    index = TriggerIndex([catch_all, diabetes, provider])
+
+    assert index.match("Follow-up", ["E11.9"], uuid.uuid4(), "Completed") == diabetes
+    assert index.match("Follow-up", ["I10"], uuid.uuid4(), "completed") == catch_all
+    assert index.match("Follow-up", ["E11.9"], provider_id, "completed") == provider
+    assert index.match("Follow-up", ["E11.9"], provider_id, "cancelled") is None
+    assert index.statuses == {"completed"}
+
+
+def test_run_triggers_creates_sessions_once(db: Session) -> None:
+    organization = crud.create_organization(
+        session=db,
+        organization_create=OrganizationCreate(name=f"Org {random_lower_string()}"),
+    )
+    provider = crud.create_user(
+        session=db,
+        user_create=create_user_create(organization_id=organization.id),
+    )
+    template = crud.create_survey_template(
+        session=db,
+        survey_template_create=SurveyTemplateCreate(
+            name=f"Template {random_lower_string()}",
+            organization_id=organization.id,
+            created_by=provider.id,
+            triggers={"appointment_types": ["Follow-up"], "expires_in_days": 3},
+        ),
+    )
+    appointments = [
+        Appointment(
+            appointment_date=datetime.utcnow(),
+            appointment_type=appointment_type,
+            status="completed",
+            patient_id=provider.id,
+            provider_id=provider.id,
+        )
+        for appointment_type in ("Follow-up", "Annual physical")
+    ]
+    db.add_all(appointments)
+    db.commit()
+    since = datetime.utcnow() - timedelta(hours=1)
+
+    assert run_triggers(db, since, organization.id) == (2, 1)
+    assert run_triggers(db, since, organization.id) == (1, 0)
+
+    created = db.exec(
+        select(FeedbackSession).where(FeedbackSession.survey_template_id == template.id)
+    ).all()
+    assert [session.appointment_id for session in created] == [appointments[0].id]
+    assert created[0].expired_at - created[0].initiated_at == timedelta(days=3)
+
+
+def test_overlapping_runs_create_sessions_once(db: Session) -> None:
+    organization = crud.create_organization(
+        session=db,
+        organization_create=OrganizationCreate(name=f"Org {random_lower_string()}"),
+    )
+    provider = crud.create_user(
+        session=db,
+        user_create=create_user_create(organization_id=organization.id),
+    )
+    template = crud.create_survey_template(
+        session=db,
+        survey_template_create=SurveyTemplateCreate(
+            name=f"Template {random_lower_string()}",
+            organization_id=organization.id,
+            created_by=provider.id,
+            triggers={"appointment_types": ["Follow-up"]},
+        ),
+    )
+    appointment = Appointment(
+        appointment_date=datetime.utcnow(),
+        appointment_type="Follow-up",
+        status="completed",
+        patient_id=provider.id,
+        provider_id=provider.id,
+    )
+    db.add(appointment)
+    db.commit()
+    since = datetime.utcnow() - timedelta(hours=1)
+    indexes = load_trigger_indexes(db, organization.id)
+
+    # Another run is between creating its session and committing
+    with Session(engine) as other:
+        lock_organizations(other, [organization.id])
+        now = datetime.utcnow()
+        other.add(
+            FeedbackSession(
+                appointment_id=appointment.id,
+                survey_template_id=template.id,
+                status=FeedbackSessionStatus.INITIATED,
+                initiated_at=now,
+                expired_at=now + timedelta(days=7),
+            )
+        )
+        other.flush()
+        results = []
+        run = threading.Thread(
+            target=lambda: results.append(trigger_batch(db, indexes, since))
+        )
+        run.start()
+        time.sleep(0.2)
+        # Waiting for the other run, not skipping past its claim
+        assert run.is_alive()
+        other.commit()
+        run.join()
+
+    assert results == [(0, 0, None)]
+    created = db.exec(
+        select(FeedbackSession).where(FeedbackSession.appointment_id == appointment.id)
+    ).all()
+    assert len(created) == 1
@@ -0,0 +1,33 @@
+from sqlmodel import Session
+
+from app import crud
+from app.core.cache import cache, org_feedback_tag, template_tag
+from app.models import SurveyTemplateUpdate
+from app.tests.utils.feedback import (
+    DEFAULT_ORGANIZATION_ID,
+    create_random_feedback_response,
+    create_random_feedback_session,
+    create_random_survey_template,
+)
+
+
+def test_update_survey_template_invalidates_tag(db: Session) -> None:
+    template = create_random_survey_template(db)
+    key = f"test:template:{template.id}"
+    cache.set(key, "cached", tags=[template_tag(template.id)])
+
+    crud.update_survey_template(
+        session=db,
+        db_template=template,
+        template_in=SurveyTemplateUpdate(name="Renamed"),
+    )
+    assert cache.get(key) is None
+
+
+def test_new_feedback_response_invalidates_org_feedback(db: Session) -> None:
+    feedback_session = create_random_feedback_session(db)
+    key = "test:recent-feedback"
+    cache.set(key, "cached", tags=[org_feedback_tag(DEFAULT_ORGANIZATION_ID)])
+
+    create_random_feedback_response(db, feedback_session, response_text="Great")
+    assert cache.get(key) is None
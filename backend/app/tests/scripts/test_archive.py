@@ -0,0 +1,150 @@
+from datetime import date, datetime, timedelta
+
+import psycopg
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from app.archive import archive_batch, archive_cutoff, rehydrate_batch
+from app.core.db import psycopg_conninfo
+from app.core.events import CHANNEL
+from app.core.partitions import PARTITIONED_TABLES, drop_empty_partitions
+from app.models import (
+    FeedbackArchive,
+    FeedbackResponse,
+    FeedbackRollup,
+    FeedbackSession,
+    FeedbackSessionStatus,
+)
+from app.tests.utils.feedback import (
+    create_random_feedback_response,
+    create_random_feedback_session,
+)
+
+
+def test_archive_cutoff_is_a_month_boundary() -> None:
+    assert archive_cutoff(24, today=date(2026, 10, 18)) == datetime(2024, 10, 1)
+    assert archive_cutoff(1, today=date(2026, 1, 31)) == datetime(2025, 12, 1)
+
+
+def test_archive_and_rehydrate_session(db: Session) -> None:
+    created_at = datetime(2020, 3, 10, 9, 30)
+    feedback_session = create_random_feedback_session(db)
+    feedback_session.created_at = created_at
+    feedback_session.status = FeedbackSessionStatus.COMPLETED
+    feedback_session.completion_time_seconds = 120
+    db.add(feedback_session)
+    db.commit()
+    feedback_response = create_random_feedback_response(
+        db, feedback_session, response_value={"rating": 4}
+    )
+    feedback_response.created_at = created_at + timedelta(hours=1)
+    db.add(feedback_response)
+    db.commit()
+    session_id, template_id = feedback_session.id, feedback_session.survey_template_id
+
+    while archive_batch(db, cutoff=datetime(2021, 1, 1)):
+        pass
+
+    db.expire_all()
+    assert db.get(FeedbackSession, session_id) is None
+    assert not db.exec(
+        select(FeedbackResponse).where(FeedbackResponse.session_id == session_id)
+    ).all()
+    archived = db.get(FeedbackArchive, session_id)
+    assert archived is not None
+    assert len(archived.responses) == 1
+    rollup = db.get(FeedbackRollup, (template_id, datetime(2020, 3, 1)))
+    assert rollup is not None
+    assert (rollup.surveys_sent, rollup.completed, rollup.responses) == (1, 1, 1)
+    assert rollup.rating_sum == 4
+    assert rollup.completion_seconds_sum == 120
+
+    assert rehydrate_batch(db, session_ids=[session_id]) == 1
+
+    db.expire_all()
+    restored = db.get(FeedbackSession, session_id)
+    assert restored is not None
+    assert restored.status == FeedbackSessionStatus.COMPLETED
+    assert restored.created_at == created_at
+    assert [response.response_value for response in restored.feedback_responses] == [
+        {"rating": 4}
+    ]
+    assert db.get(FeedbackArchive, session_id) is None
+    assert db.get(FeedbackRollup, (template_id, datetime(2020, 3, 1))) is None
+
+    db.delete(restored)
+    db.commit()
+    connection = db.connection()
+    for table in PARTITIONED_TABLES:
+        drop_empty_partitions(connection, table, date(2020, 5, 1))
+    db.commit()
+
+
+def test_rehydrate_session_archived_before_reminders(db: Session) -> None:
+    created_at = datetime(2020, 4, 10, 9, 30)
+    feedback_session = create_random_feedback_session(db)
+    feedback_session.created_at = created_at
+    feedback_session.status = FeedbackSessionStatus.COMPLETED
+    db.add(feedback_session)
+    db.commit()
+    session_id = feedback_session.id
+
+    while archive_batch(db, cutoff=datetime(2021, 1, 1)):
+        pass
+    # As archived before feedbacksession.reminders_sent existed
+    db.execute(
+        text(
+            "UPDATE feedbackarchive SET session = session - 'reminders_sent'"
+            " WHERE session_id = :id"
+        ),
+        {"id": session_id},
+    )
+    db.commit()
+
+    assert rehydrate_batch(db, session_ids=[session_id]) == 1
+
+    db.expire_all()
+    restored = db.get(FeedbackSession, session_id)
+    assert restored is not None
+    assert restored.reminders_sent == 0
+
+    db.delete(restored)
+    db.commit()
+    connection = db.connection()
+    for table in PARTITIONED_TABLES:
+        drop_empty_partitions(connection, table, date(2020, 5, 1))
+    db.commit()
+
+
+def test_rehydrate_does_not_publish_feedback_events(db: Session) -> None:
+    created_at = datetime(2020, 6, 10, 9, 30)
+    feedback_session = create_random_feedback_session(db)
+    feedback_session.created_at = created_at
+    feedback_session.status = FeedbackSessionStatus.COMPLETED
+    db.add(feedback_session)
+    db.commit()
+    feedback_response = create_random_feedback_response(db, feedback_session)
+    feedback_response.created_at = created_at + timedelta(hours=1)
+    db.add(feedback_response)
+    db.commit()
+    session_id = feedback_session.id
+    while archive_batch(db, cutoff=datetime(2021, 1, 1)):
+        pass
+
+    with psycopg.connect(psycopg_conninfo(), autocommit=True) as listener:
+        listener.execute(f"LISTEN {CHANNEL}")
+        assert rehydrate_batch(db, session_ids=[session_id]) == 1
+        assert not list(listener.notifies(timeout=1))
+
+        # New feedback in the same session is still published
+        restored = db.get(FeedbackSession, session_id)
+        assert restored is not None
+        create_random_feedback_response(db, restored)
+        assert list(listener.notifies(timeout=5, stop_after=1))
+
+    db.delete(restored)
+    db.commit()
+    connection = db.connection()
+    for table in PARTITIONED_TABLES:
+        drop_empty_partitions(connection, table, date(2020, 7, 1))
+    db.commit()
@@ -0,0 +1,143 @@
+import io
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlmodel import Session, select
+
+from app import crud
+from app.ingest import FORMATS, ingest, staging_row
+from app.models import Appointment, OrganizationCreate
+from app.tests.utils.user import create_random_user, create_user_create
+from app.tests.utils.utils import random_lower_string
+
+ORGANIZATION_ID = uuid.UUID(int=10)
+USERS = {
+    "patient@example.com": (uuid.UUID(int=1), ORGANIZATION_ID),
+    "doctor@example.com": (uuid.UUID(int=2), ORGANIZATION_ID),
+}
+
+CSV = (
+    "external_appointment_id,appointment_date,appointment_type,status,"
+    "patient_email,provider_email,diagnosis_codes\n"
+    "EHR-1,2026-10-18T09:30:00,Follow-up,Completed,"
+    "Patient@example.com,doctor@example.com,E11.9;I10\n"
+)
+NDJSON = json.dumps({
+    "external_appointment_id": "EHR-1",
+    "appointment_date": "2026-10-18T11:30:00+02:00",
+    "appointment_type": "Follow-up",
+    "status": "completed",
+    "patient_email": "patient@example.com",
+    "provider_email": "doctor@example.com",
+    "diagnosis_codes": ["E11.9", "I10"],
+}) + "\n\n"
+HL7 = (
+    "MSH|^~\\&|EHR|CLINIC\n"
+    "SCH|EHR-1|202610180930|Follow-up|||completed|patient@example.com|"
+    "doctor@example.com|E11.9~I10|\n"
+)
+
+
+def parse(format: str, text: str) -> list[tuple]:
+    split, parse_record = FORMATS[format]
+    return [
+        staging_row(line, parse_record(raw), USERS)
+        for line, raw in enumerate(split(io.StringIO(text)), 1)
+    ]
+
+
+@pytest.mark.parametrize("format,text", [("csv", CSV), ("ndjson", NDJSON), ("hl7", HL7)])
+def test_formats_stage_the_same_row(format: str, text: str) -> None:
+    assert parse(format, text) == [(
+        1, ORGANIZATION_ID, "EHR-1", datetime(2026, 10, 18, 9, 30), "Follow-up", None,
+        None, "completed", uuid.UUID(int=1), uuid.UUID(int=2), ["E11.9", "I10"], [],
+    )]
+
+
+def test_staging_row_rejects_unknown_users() -> None:
+    record = {
+        "external_appointment_id": "EHR-1",
+        "appointment_date": "2026-10-18",
+        "patient_email": "stranger@example.com",
+        "provider_email": "doctor@example.com",
+    }
+    with pytest.raises(ValueError, match="patient_email"):
+        staging_row(1, record, USERS)
+
+
+def test_staging_row_rejects_providers_without_organization() -> None:
+    record = {
+        "external_appointment_id": "EHR-1",
+        "appointment_date": "2026-10-18",
+        "patient_email": "patient@example.com",
+        "provider_email": "doctor@example.com",
+    }
+    users = {**USERS, "doctor@example.com": (uuid.UUID(int=2), None)}
+    with pytest.raises(ValueError, match="no organization"):
+        staging_row(1, record, users)
+
+
+def test_ingest_upserts_on_external_id(db: Session) -> None:
+    patient = create_random_user(db)
+    provider = create_random_user(db)
+    external_id = f"EHR-{uuid.uuid4().hex}"
+
+    def feed(status: str) -> list[str]:
+        record = {
+            "external_appointment_id": external_id,
+            "appointment_date": "2026-10-18T09:30:00",
+            "status": status,
+            "patient_email": patient.email,
+            "provider_email": provider.email,
+        }
+        return [json.dumps(record), json.dumps({"external_appointment_id": "EHR-bad"})]
+
+    totals = ingest(feed("scheduled"), "ndjson")
+    assert (totals["inserted"], totals["rejected"]) == (1, 1)
+    assert ingest(feed("scheduled"), "ndjson")["unchanged"] == 1
+    assert ingest(feed("completed"), "ndjson")["updated"] == 1
+
+    db.expire_all()
+    appointment = db.exec(
+        select(Appointment).where(Appointment.external_appointment_id == external_id)
+    ).one()
+    assert appointment.status == "completed"
+    assert appointment.patient_id == patient.id
+
+
+def test_ingest_keeps_external_ids_per_organization(db: Session) -> None:
+    external_id = f"EHR-{uuid.uuid4().hex}"
+    feeds = {}
+    for status in ("scheduled", "completed"):
+        organization = crud.create_organization(
+            session=db,
+            organization_create=OrganizationCreate(name=f"Clinic {random_lower_string()}"),
+        )
+        patient, provider = (
+            crud.create_user(
+                session=db,
+                user_create=create_user_create(organization_id=organization.id),
+            )
+            for _ in range(2)
+        )
+        record = {
+            "external_appointment_id": external_id,
+            "appointment_date": "2026-10-18T09:30:00",
+            "status": status,
+            "patient_email": patient.email,
+            "provider_email": provider.email,
+        }
+        feeds[organization.id] = [json.dumps(record)]
+
+    for organization_id, feed in feeds.items():
+        assert ingest(feed, "ndjson", organization_id)["inserted"] == 1
+
+    db.expire_all()
+    appointments = db.exec(
+        select(Appointment).where(Appointment.external_appointment_id == external_id)
+    ).all()
+    assert {
+        (appointment.organization_id, appointment.status) for appointment in appointments
+    } == set(zip(feeds, ("scheduled", "completed"), strict=True))
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Any
+from unittest.mock import patch
+
+from sqlmodel import Session
+
+from app.api.routes.analyze import analyze_with_llm
+from app.refresh_analysis import LEASE, claim_batch, refresh_batch
+from app.tests.utils.feedback import (
+    create_random_feedback_response,
+    create_random_feedback_session,
+)
+
+
+def test_refresh_batch_analyzes_pending_responses(db: Session) -> None:
+    feedback_session = create_random_feedback_session(db)
+    feedback_response = create_random_feedback_response(
+        db, feedback_session, response_text="The nursing staff were great"
+    )
+
+    while refresh_batch(db):
+        pass
+
+    db.refresh(feedback_response)
+    assert feedback_response.ai_analysis
+    assert feedback_response.ai_analysis["sentiment"] == "positive"
+    assert feedback_response.analysis_claimed_at is None
+    assert refresh_batch(db) == 0
+
+
+def test_refresh_batch_skips_failed_analysis(db: Session) -> None:
+    feedback_session = create_random_feedback_session(db)
+    failing = create_random_feedback_response(
+        db, feedback_session, response_text="This one breaks the model"
+    )
+    succeeding = create_random_feedback_response(
+        db, feedback_session, response_text="The doctor was great"
+    )
+
+    def analyze(text: str) -> dict[str, Any]:
+        if text == "This one breaks the model":
+            raise RuntimeError("model unavailable")
+        return analyze_with_llm(text)
+
+    with patch("app.refresh_analysis.analyze_with_llm", side_effect=analyze):
+        while refresh_batch(db):
+            pass
+
+    db.refresh(failing)
+    db.refresh(succeeding)
+    assert succeeding.ai_analysis
+    assert failing.ai_analysis is None
+    assert failing.analysis_claimed_at
+    # The failed response is retried once its lease runs out
+    claimed = claim_batch(db, now=datetime.utcnow() + LEASE)
+    assert failing.id in {response.id for response in claimed}
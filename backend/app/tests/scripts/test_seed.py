@@ -0,0 +1,67 @@
+import uuid
+
+from app.seed import APPOINTMENT_HOURS, PLANS, QUESTIONS, Seeder
+
+
+def _seeder(seed: int) -> Seeder:
+    seeder = Seeder(PLANS["small"], seed=seed)
+    seeder.response_types = {
+        type_name: uuid.uuid4() for type_name in {question[1] for question in QUESTIONS}
+    }
+    # Generate the reference rows in memory, without a database
+    for rows in (seeder._organizations(), seeder._users(), seeder._templates()):
+        for _ in rows:
+            pass
+    return seeder
+
+
+def test_completed_session_answers_every_question() -> None:
+    seeder = _seeder(seed=1)
+    responses: list[tuple] = []
+    row = seeder._session(
+        seeder._uuid(), seeder.organizations[0], seeder.now, "COMPLETED", responses
+    )
+    answered = {response[3] for response in responses}
+    # Every rating and choice question is answered, free text is optional
+    assert answered >= {question[0] for question in QUESTIONS if question[1] != "text_input"}
+    assert row[4] == "COMPLETED"
+    # completed_at is set and never before the first response
+    assert row[9] is not None and row[9] >= row[8]
+
+
+def test_initiated_session_has_no_answers() -> None:
+    seeder = _seeder(seed=1)
+    responses: list[tuple] = []
+    row = seeder._session(
+        seeder._uuid(), seeder.organizations[0], seeder.now, "INITIATED", responses
+    )
+    assert responses == []
+    assert row[8] is None and row[9] is None
+
+
+def test_only_completed_appointments_get_sessions() -> None:
+    seeder = _seeder(seed=3)
+    appointments: list[tuple] = []
+    sessions: list[tuple] = []
+    responses: list[tuple] = []
+    seeder._chunk(500, appointments, sessions, responses)
+    assert len(sessions) == 500
+    completed = {row[0] for row in appointments if row[7] == "completed"}
+    assert {row[1] for row in sessions} == completed
+    assert len(appointments) > len(sessions)
+    assert any(response[4] for response in responses)
+    for row in appointments:
+        assert row[1] in seeder.organizations
+        assert row[3].hour in APPOINTMENT_HOURS
+        if row[7] != "scheduled":
+            assert row[3] <= seeder.now
+
+
+def test_same_seed_reproduces_rows() -> None:
+    first, second = _seeder(seed=7), _seeder(seed=7)
+    assert first.organizations == second.organizations
+    first.fork(1)
+    second.fork(1)
+    assert first._uuid() == second._uuid()
+    second.fork(2)
+    assert first._uuid() != second._uuid()
@@ -0,0 +1,94 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app import crud
+from app.models import (
+    Appointment,
+    FeedbackResponse,
+    FeedbackResponseCreate,
+    FeedbackResponseType,
+    FeedbackResponseTypeCreate,
+    FeedbackSession,
+    FeedbackSessionCreate,
+    SurveyTemplate,
+    SurveyTemplateCreate,
+)
+from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import random_lower_string
+
+DEFAULT_ORGANIZATION_ID = uuid.UUID("00000000-0000-0000-0000-000000000000")
+
+
+def create_random_survey_template(
+    db: Session,
+    organization_id: uuid.UUID = DEFAULT_ORGANIZATION_ID,
+    questions: dict | None = None,
+) -> SurveyTemplate:
+    creator = create_random_user(db)
+    template_in = SurveyTemplateCreate(
+        name=f"Test Template {random_lower_string()}",
+        organization_id=organization_id,
+        created_by=creator.id,
+        questions=questions or {"q1": {"type": "text", "question": "Test question"}},
+    )
+    return crud.create_survey_template(session=db, survey_template_create=template_in)
+
+
+def get_or_create_response_type(
+    db: Session, type_name: str = "text_input"
+) -> FeedbackResponseType:
+    response_type = crud.get_feedback_response_type_by_name(
+        session=db, type_name=type_name
+    )
+    if response_type:
+        return response_type
+    type_in = FeedbackResponseTypeCreate(type_name=type_name, type_category="test")
+    return crud.create_feedback_response_type(session=db, response_type_create=type_in)
+
+
+def create_random_feedback_session(
+    db: Session, survey_template: SurveyTemplate | None = None
+) -> FeedbackSession:
+    if survey_template is None:
+        survey_template = create_random_survey_template(db)
+    patient = create_random_user(db)
+    provider = create_random_user(db)
+    appointment = Appointment(
+        appointment_date=datetime.utcnow(),
+        patient_id=patient.id,
+        provider_id=provider.id,
+        status="completed",
+    )
+    db.add(appointment)
+    db.commit()
+    db.refresh(appointment)
+    session_in = FeedbackSessionCreate(
+        appointment_id=appointment.id,
+        survey_template_id=survey_template.id,
+        expired_at=datetime.utcnow() + timedelta(days=7),
+    )
+    return crud.create_feedback_session(
+        session=db, feedback_session_create=session_in
+    )
+
+
+def create_random_feedback_response(
+    db: Session,
+    feedback_session: FeedbackSession,
+    question_id: str = "q1",
+    response_text: str | None = None,
+    response_value: dict | None = None,
+) -> FeedbackResponse:
+    response_type = get_or_create_response_type(db)
+    response_in = FeedbackResponseCreate(
+        session_id=feedback_session.id,
+        response_type_id=response_type.id,
+        question_id=question_id,
+        response_text=response_text,
+        response_value=response_value or {},
+    )
+    return crud.create_feedback_response(
+        session=db, feedback_response_create=response_in
+    )
@@ -0,0 +1,40 @@
+import argparse
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.core.triggers import run_triggers
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+batch_size = 5000
+
+
+def init(since: datetime, organization_id: uuid.UUID | None = None) -> tuple[int, int]:
+    with Session(engine) as session:
+        return run_triggers(session, since, organization_id, batch_size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Create feedback sessions for appointments matching template triggers."
+    )
+    parser.add_argument(
+        "--hours", type=float, default=24,
+        help="look at appointments updated within this many hours",
+    )
+    parser.add_argument("--organization-id", type=uuid.UUID)
+    args = parser.parse_args()
+
+    since = datetime.utcnow() - timedelta(hours=args.hours)
+    logger.info(f"Matching appointments updated since {since:%Y-%m-%d %H:%M}")
+    scanned, created = init(since, args.organization_id)
+    logger.info(f"Created {created} feedback sessions from {scanned} appointments")
+
+
+if __name__ == "__main__":
+    main()
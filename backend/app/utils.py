@@ -1,16 +1,21 @@
 import logging
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
+from functools import cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import emails  # type: ignore
 import jwt
-from jinja2 import Template
 from jwt.exceptions import InvalidTokenError
 
 from app.core import security
 from app.core.config import settings
+from app.core.mail import mailer
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,12 +27,33 @@ class EmailData:
     subject: str
 
 
+@cache
+def get_email_templates() -> "Environment":
+    """
+    The shared template environment, created on first use so processes that
+    send no email never import Jinja. Templates are parsed once per process
+    and kept compiled in memory; the bytecode cache lets new worker
+    processes skip compiling them again.
+    """
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    return Environment(
+        loader=FileSystemLoader(Path(__file__).parent / "email-templates" / "build"),
+        bytecode_cache=FileSystemBytecodeCache(),
+        auto_reload=False,
+    )
+
+
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-        Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
-    return html_content
+    return get_email_templates().get_template(template_name).render(context)
+
+
+def render_email_templates(
+    *, template_name: str, contexts: Iterable[dict[str, Any]]
+) -> Iterator[str]:
+    """Render one template for many recipients, e.g. a bulk invitation send."""
+    template = get_email_templates().get_template(template_name)
+    return (template.render(context) for context in contexts)
 
 
 def send_email(
@@ -35,24 +61,21 @@ def send_email(
     email_to: str,
     subject: str = "",
     html_content: str = "",
-) -> None:
+) -> Future[Any]:
+    """
+    Queue an email for the background mailer and return at once. The Future
+    resolves to the SMTP response for callers that need to know the outcome.
+    """
     assert settings.emails_enabled, "no provided configuration for email variables"
+    # Loaded on first send; it pulls in DKIM, DNS and HTML tooling
+    import emails  # type: ignore
+
     message = emails.Message(
         subject=subject,
         html=html_content,
         mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
     )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    elif settings.SMTP_SSL:
-        smtp_options["ssl"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
-    logger.info(f"send email result: {response}")
+    return mailer.submit(message, email_to)
 
 
 def generate_test_email(email_to: str) -> EmailData:
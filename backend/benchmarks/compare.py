@@ -0,0 +1,100 @@
+"""
+Compare two benchmark reports and flag regressions.
+
+Works on both `benchmarks.micro` reports (median time per call) and
+`benchmarks.load` reports (p95 latency per scenario and endpoint):
+
+    python -m benchmarks.compare benchmarks/baselines/micro.json micro.json
+    python -m benchmarks.compare before.json after.json --threshold 15
+
+Exits with status 1 when any measurement got slower than the threshold.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any
+
+
+def micro_measurements(report: dict[str, Any]) -> dict[str, float]:
+    return {
+        name: stats["median_us"] for name, stats in report["benchmarks"].items()
+    }
+
+
+def load_measurements(report: dict[str, Any]) -> dict[str, float]:
+    measurements = {}
+    for scenario, result in report["scenarios"].items():
+        measurements[f"{scenario}:flow"] = result["latency_ms"]["p95"]
+        for endpoint, summary in result["endpoints"].items():
+            measurements[f"{scenario}:{endpoint}"] = summary["latency_ms"]["p95"]
+    return measurements
+
+
+def measurements(report: dict[str, Any]) -> tuple[str, dict[str, float]]:
+    """The unit and the comparable values of a report."""
+    if "benchmarks" in report:
+        return "median us", micro_measurements(report)
+    if "scenarios" in report:
+        return "p95 ms", load_measurements(report)
+    raise SystemExit("Unrecognized report: expected a micro or load benchmark report")
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> tuple[list[str], list[str]]:
+    """Return the table lines and the names that regressed past `threshold` %."""
+    unit, before = measurements(baseline)
+    current_unit, after = measurements(current)
+    if unit != current_unit:
+        raise SystemExit("Cannot compare a micro benchmark report with a load report")
+
+    width = max((len(name) for name in before.keys() | after.keys()), default=4)
+    lines = [f"{'name':<{width}}  {'baseline':>12}  {'current':>12}  {'change':>8}  ({unit})"]
+    regressions = []
+    for name in sorted(before.keys() | after.keys()):
+        old, new = before.get(name), after.get(name)
+        if old is None or new is None:
+            lines.append(
+                f"{name:<{width}}  {_format(old):>12}  {_format(new):>12}  {'n/a':>8}"
+            )
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(
+            f"{name:<{width}}  {old:>12.2f}  {new:>12.2f}  {change:>+7.1f}%{flag}"
+        )
+    return lines, regressions
+
+
+def _format(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument(
+        "--threshold", type=float, default=10.0,
+        help="percent slowdown counted as a regression (default: 10)",
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    lines, regressions = compare(baseline, current, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:g}%")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Concurrent load test for the survey submission and dashboard flows.
+
+Run from `backend/` against a running API whose database was filled with
+`python app/seed.py`:
+
+    python -m benchmarks.load --base-url http://localhost:8000 \
+        --concurrency 32 --duration 60 --output load.json
+
+Every scenario reports p50/p95/p99 latency per endpoint and per flow, plus
+throughput, as JSON so runs can be compared across commits.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import httpx
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db import engine
+from app.seed import SEED_PASSWORD
+from benchmarks.report import current_commit, write_report
+
+DASHBOARD_ENDPOINTS = [
+    "/analytics/overview",
+    "/analytics/response-trends",
+    "/analytics/sentiment-analysis",
+    "/analytics/survey-performance",
+    "/analytics/recent-feedback",
+    "/survey-templates/active",
+    "/feedback-sessions/?limit=100",
+    "/feedback-responses/?limit=100",
+]
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "throughput_per_second": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ordered, 0.50), 2),
+            "p95": round(percentile(ordered, 0.95), 2),
+            "p99": round(percentile(ordered, 0.99), 2),
+            "mean": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+            "max": round(ordered[-1], 2) if ordered else 0.0,
+        },
+    }
+
+
+@dataclass
+class Recorder:
+    """Latencies (ms) and error counts per endpoint and per whole flow."""
+
+    endpoints: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    endpoint_errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    flows: list[float] = field(default_factory=list)
+    flow_errors: int = 0
+
+    async def request(
+        self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.endpoints[name].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self.endpoint_errors[name] += 1
+            response.raise_for_status()
+        return response
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        return {
+            **summarize(self.flows, self.flow_errors, elapsed),
+            "endpoints": {
+                name: summarize(latencies, self.endpoint_errors[name], elapsed)
+                for name, latencies in sorted(self.endpoints.items())
+            },
+        }
+
+
+@dataclass
+class OpenSession:
+    session_id: uuid.UUID
+    token: uuid.UUID
+    questions: dict[str, Any]
+
+
+def load_open_sessions(limit: int) -> list[OpenSession]:
+    """Unexpired, not yet answered sessions to drive the public flow with."""
+    statement = text(
+        """
+        SELECT s.id, s.completion_token, t.questions
+        FROM feedbacksession s
+        JOIN surveytemplate t ON t.id = s.survey_template_id
+        WHERE s.status = 'INITIATED' AND s.expired_at > now()
+        LIMIT :limit
+        """
+    )
+    with engine.connect() as connection:
+        rows = connection.execute(statement, {"limit": limit}).all()
+    return [OpenSession(*row) for row in rows]
+
+
+def load_response_types() -> dict[str, uuid.UUID]:
+    with engine.connect() as connection:
+        rows = connection.execute(
+            text("SELECT type_name, id FROM feedbackresponsetype WHERE active")
+        ).all()
+    return dict(rows)
+
+
+def load_dashboard_user() -> str:
+    with engine.connect() as connection:
+        email = connection.execute(
+            text("SELECT email FROM users WHERE role = 'provider' AND active LIMIT 1")
+        ).scalar()
+    if email is None:
+        raise SystemExit("No provider user found; seed the database first")
+    return str(email)
+
+
+def answers_for(
+    open_session: OpenSession, response_types: dict[str, uuid.UUID], rng: random.Random
+) -> list[dict[str, Any]]:
+    answers = []
+    for question_id, question in open_session.questions.items():
+        type_name = question.get("type", "text_input")
+        answer: dict[str, Any] = {
+            "session_id": str(open_session.session_id),
+            "response_type_id": str(response_types[type_name]),
+            "question_id": question_id,
+            "response_time_seconds": rng.randint(2, 60),
+            "response_value": {},
+        }
+        if type_name == "rating":
+            answer["response_value"] = {"rating": rng.randint(1, 5)}
+        elif type_name == "nps":
+            answer["response_value"] = {"score": rng.randint(0, 10)}
+        elif type_name == "multiple_choice":
+            answer["response_value"] = {"choice": rng.choice(["Excellent", "Good", "Fair"])}
+        else:
+            answer["response_text"] = "The nursing staff were kind. The wait was long."
+        answers.append(answer)
+    return answers
+
+
+async def run_scenario(
+    concurrency: int,
+    duration: float,
+    flow: Callable[[Recorder], Awaitable[bool]],
+) -> dict[str, Any]:
+    """
+    Run `flow` in `concurrency` workers until `duration` elapses or a flow
+    reports there is no more work.
+    """
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    start = time.perf_counter()
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            flow_start = time.perf_counter()
+            try:
+                if not await flow(recorder):
+                    return
+            except httpx.HTTPError:
+                recorder.flow_errors += 1
+                continue
+            recorder.flows.append((time.perf_counter() - flow_start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return recorder.summary(time.perf_counter() - start)
+
+
+async def public_flow_scenario(
+    client: httpx.AsyncClient, concurrency: int, duration: float
+) -> dict[str, Any]:
+    """by-token read -> template read -> batch submit -> complete, one session each."""
+    response_types = load_response_types()
+    sessions = load_open_sessions(limit=max(concurrency * 200, 10_000))
+    if not sessions:
+        raise SystemExit("No open feedback sessions found; seed the database first")
+    rng = random.Random(0)
+    api = settings.API_V1_STR
+
+    async def flow(recorder: Recorder) -> bool:
+        if not sessions:
+            return False
+        open_session = sessions.pop()
+        by_token = f"{api}/feedback-sessions/by-token/{open_session.token}"
+        await recorder.request(client, "by_token", "GET", by_token)
+        await recorder.request(
+            client, "survey_template", "GET", f"{by_token}/survey-template"
+        )
+        await recorder.request(
+            client, "batch_submit", "POST", f"{api}/feedback-responses/batch",
+            json=answers_for(open_session, response_types, rng),
+        )
+        await recorder.request(client, "complete", "PATCH", f"{by_token}/complete")
+        return True
+
+    result = await run_scenario(concurrency, duration, flow)
+    result["sessions_left"] = len(sessions)
+    return result
+
+
+async def dashboard_scenario(
+    client: httpx.AsyncClient, concurrency: int, duration: float
+) -> dict[str, Any]:
+    """A provider loading every analytics widget and list on the dashboard."""
+    login = await client.post(
+        f"{settings.API_V1_STR}/login/access-token",
+        data={"username": load_dashboard_user(), "password": SEED_PASSWORD},
+    )
+    login.raise_for_status()
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    async def flow(recorder: Recorder) -> bool:
+        for path in DASHBOARD_ENDPOINTS:
+            name = path.split("?")[0].strip("/").replace("/", "_")
+            await recorder.request(
+                client, name, "GET", f"{settings.API_V1_STR}{path}", headers=headers
+            )
+        return True
+
+    return await run_scenario(concurrency, duration, flow)
+
+
+SCENARIOS = {
+    "public": public_flow_scenario,
+    "dashboard": dashboard_scenario,
+}
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        results = {}
+        for name in args.scenario:
+            results[name] = await SCENARIOS[name](client, args.concurrency, args.duration)
+    return {
+        "commit": current_commit(),
+        "started_at": datetime.utcnow().isoformat(),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_seconds": args.duration,
+        "scenarios": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per scenario")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout")
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS),
+        help="scenario to run, repeatable (default: all)",
+    )
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+    args.scenario = args.scenario or list(SCENARIOS)
+
+    write_report(asyncio.run(run(args)), args.output)
+
+
+if __name__ == "__main__":
+    main()
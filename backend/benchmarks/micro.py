@@ -0,0 +1,177 @@
+"""
+Micro-benchmarks for hot pure-Python paths.
+
+Benchmarks are written pytest-benchmark style: each `bench_*` function gets a
+`benchmark` callable and passes it the code under test. Run from `backend/`:
+
+    python -m benchmarks.micro --output micro.json
+    python -m benchmarks.compare benchmarks/baselines/micro.json micro.json
+
+Refresh the committed baseline with `--output benchmarks/baselines/micro.json`
+after an intentional change, on the machine the baseline was recorded on.
+"""
+
+import argparse
+import platform
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from app.api.deps import decode_access_token
+from app.api.routes.analyze import _heuristic_analysis
+from app.core.security import create_access_token
+from app.models import FeedbackResponseCreate
+from app.utils import generate_password_reset_token, render_email_template
+from benchmarks.report import current_commit, write_report
+
+FEEDBACK_TEXT = (
+    "The nursing staff were kind and the doctor explained everything clearly. "
+    "Billing was confusing though, and the wait was far too long! "
+    "Call me at 555-123-4567 if you need more details."
+)
+
+# One submitted survey as the batch endpoint receives it
+RESPONSE_BATCH = [
+    {
+        "session_id": str(uuid.UUID(int=1)),
+        "response_type_id": str(uuid.UUID(int=2)),
+        "question_id": f"rating_{n}",
+        "response_value": {"rating": n % 5 + 1},
+        "response_time_seconds": 12,
+    }
+    for n in range(24)
+] + [
+    {
+        "session_id": str(uuid.UUID(int=1)),
+        "response_type_id": str(uuid.UUID(int=3)),
+        "question_id": "comments",
+        "response_text": FEEDBACK_TEXT,
+    }
+]
+
+
+class Benchmark:
+    """
+    Times a callable: calibrates how many calls make up a round of at least
+    `min_round_time`, then records the per-call time of `rounds` rounds.
+    """
+
+    def __init__(self, rounds: int = 20, min_round_time: float = 0.02) -> None:
+        self.rounds = rounds
+        self.min_round_time = min_round_time
+        self.stats: dict[str, Any] | None = None
+
+    def __call__(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        result = func(*args, **kwargs)
+        iterations = 1
+        while True:
+            elapsed = self._time(func, args, kwargs, iterations)
+            if elapsed >= self.min_round_time:
+                break
+            iterations *= 2
+        per_call = [
+            self._time(func, args, kwargs, iterations) / iterations
+            for _ in range(self.rounds)
+        ]
+        self.stats = {
+            "iterations": iterations,
+            "rounds": self.rounds,
+            "min_us": round(min(per_call) * 1e6, 3),
+            "median_us": round(statistics.median(per_call) * 1e6, 3),
+            "mean_us": round(statistics.fmean(per_call) * 1e6, 3),
+            "stddev_us": round(statistics.pstdev(per_call) * 1e6, 3),
+        }
+        return result
+
+    @staticmethod
+    def _time(
+        func: Callable[..., Any], args: Any, kwargs: Any, iterations: int
+    ) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(*args, **kwargs)
+        return time.perf_counter() - start
+
+
+def bench_heuristic_analysis(benchmark: Benchmark) -> None:
+    benchmark(_heuristic_analysis, FEEDBACK_TEXT)
+
+
+def bench_render_email_template(benchmark: Benchmark) -> None:
+    context = {
+        "project_name": "Survey Collection",
+        "username": "patient@example.com",
+        "email": "patient@example.com",
+        "valid_hours": 48,
+        "link": "http://localhost:5173/reset-password?token=abc",
+    }
+    benchmark(
+        render_email_template, template_name="reset_password.html", context=context
+    )
+
+
+def bench_create_access_token(benchmark: Benchmark) -> None:
+    benchmark(create_access_token, uuid.UUID(int=1), timedelta(minutes=30))
+
+
+def bench_decode_access_token(benchmark: Benchmark) -> None:
+    token = create_access_token(uuid.UUID(int=1), timedelta(minutes=30))
+    benchmark(decode_access_token, token)
+
+
+def bench_generate_password_reset_token(benchmark: Benchmark) -> None:
+    benchmark(generate_password_reset_token, "patient@example.com")
+
+
+def bench_validate_response_batch(benchmark: Benchmark) -> None:
+    def validate() -> list[FeedbackResponseCreate]:
+        return [FeedbackResponseCreate.model_validate(item) for item in RESPONSE_BATCH]
+
+    benchmark(validate)
+
+
+BENCHMARKS = {
+    name.removeprefix("bench_"): func
+    for name, func in sorted(globals().items())
+    if name.startswith("bench_") and callable(func)
+}
+
+
+def run(names: list[str], rounds: int) -> dict[str, Any]:
+    results = {}
+    for name in names:
+        benchmark = Benchmark(rounds=rounds)
+        BENCHMARKS[name](benchmark)
+        results[name] = benchmark.stats
+    return {
+        "commit": current_commit(),
+        "recorded_at": datetime.utcnow().isoformat(),
+        "machine": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.machine(),
+        },
+        "benchmarks": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "-k", dest="names", action="append", choices=sorted(BENCHMARKS),
+        help="benchmark to run, repeatable (default: all)",
+    )
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    write_report(run(args.names or list(BENCHMARKS), args.rounds), args.output)
+
+
+if __name__ == "__main__":
+    main()
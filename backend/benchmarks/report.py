@@ -0,0 +1,22 @@
+import json
+import subprocess
+from typing import Any
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(report: dict[str, Any], output: str | None) -> None:
+    """Write a JSON report to `output`, or to stdout when no path is given."""
+    content = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w") as f:
+            f.write(content + "\n")
+    else:
+        print(content)
@@ -9,5 +9,8 @@ python app/backend_pre_start.py
 # Run migrations
 alembic upgrade head
 
+# Create upcoming monthly partitions
+python app/partitions.py
+
 # Create initial data in DB
 python app/initial_data.py